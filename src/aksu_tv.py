@@ -1,9 +1,7 @@
 
 import asyncio
 from typing import Tuple
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
@@ -26,48 +24,46 @@ class AksuTvParser(TvParser):
     ]
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            
-            http_urls = self.__day_urls
-            
-            current_day = get_monday_datetime(self.__response_time_zone)
-            
-            for url in http_urls: 
-                if (self.in_config_time_interval(current_day)):
-                    tasks.append(
-                        self.parse_day_async(session, url, current_day)
-                    )
+        tasks = []
         
-                current_day += timedelta(days=1)
-
-            parsed_days_result = await asyncio.gather(*tasks)
-            sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
-            
-            result = [ 
-                program 
-                for day in sorted_by_dates 
-                    for program in day[1]
-            ]            
+        http_urls = self.__day_urls
         
-            fill_finish_date_by_next_start_date(result)
-            
-            return list(filter(lambda x: x.title != None, result))
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        
+        for url in http_urls: 
+            if (self.in_config_time_interval(current_day)):
+                tasks.append(
+                    self.parse_day_async(url, current_day)
+                )
+    
+            current_day += timedelta(days=1)
+
+        parsed_days_result = await asyncio.gather(*tasks)
+        sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
+        
+        result = [ 
+            program 
+            for day in sorted_by_dates 
+                for program in day[1]
+        ]            
+    
+        fill_finish_date_by_next_start_date(result)
+        
+        return list(filter(lambda x: x.title != None, result))
 
     async def parse_day_async(
         self, 
-        session, 
         http_url, 
         current_day
     ) -> Tuple[datetime, list[TvProgramData]]:
-        async with session.get(http_url) as resp: 
-            return (
-                current_day, 
-                self.parse_day_html(await resp.text(), current_day)
-            )
+        html_text = await self.fetch_text_async(http_url)
+        return (
+            current_day, 
+            await self.parse_cached_async(http_url, html_text, self.parse_day_html, current_day)
+        )
 
     def parse_day_html(self, html_text:str, current_day:datetime):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         parsed_programs = []
 
         container = html.body.find("div", {"class":"container"}, recursive=False)
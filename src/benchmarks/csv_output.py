@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from shared.models import TvProgramData
+from shared.options import SaveOptions
+from shared.output import out_to_csv_async
+
+#Бенчмарк выгрузки в csv на объединенном выводе всех каналов за несколько недель.
+#Запуск из src: python -m benchmarks.csv_output -n 100000
+#Прежняя реализация (await aiofile.write на каждую строку) воспроизводится для сравнения и проверки
+#побайтного совпадения, если установлен aiofile
+
+def create_programs(count: int) -> list[TvProgramData]:
+    random.seed(count)
+    time_zone = timezone(timedelta(hours=3))
+    start = datetime(2024, 1, 1, 6, tzinfo=time_zone)
+    programs = []
+    for i in range(count):
+        finish = start + timedelta(minutes=random.randint(5, 120))
+        programs.append(TvProgramData(
+            start,
+            finish if i % 50 != 0 else None,
+            f" Channel {i % 24}\n",
+            f"\tProgram \"{i}\" title ",
+            "https://example.com/logo.png" if i % 3 == 0 else None,
+            f" Description of program {i}, with \"quotes\"\r\n" if i % 2 == 0 else None,
+            i % 4 == 0
+        ))
+        start = finish
+    return programs
+
+def __legacy_to_csv_line(data: TvProgramData, separator: str):
+    def escape(input):
+        if (input is None):
+            return "\"\""
+        return "\"" + input.replace("\"", "\"\"") + "\""
+
+    def format_date(date):
+        return "" if date is None else date.isoformat("T", "seconds")
+
+    def replace_spaces(string):
+        return string.strip(" \t\n\r")
+
+    data.channel = replace_spaces(data.channel)
+    data.title = replace_spaces(data.title)
+    if (data.description != None):
+        data.description = replace_spaces(data.description)
+
+    return (f"{escape(format_date(data.datetime_start))}"
+    + f"{separator}{escape(format_date(data.datetime_finish))}"
+    + f"{separator}{escape(data.channel)}"
+    + f"{separator}{escape(data.title)}"
+    + f"{separator}{escape(data.channel_logo_url)}"
+    + f"{separator}{escape(data.description)}"
+    + f"{separator}{str(int(data.available_archive))}"
+    + "\n")
+
+async def __legacy_out_to_csv_async(programs: list[TvProgramData], options: SaveOptions):
+    from aiofile import async_open
+
+    async with async_open(options.output_path, "w+") as stream:
+        await stream.write(
+            "\"datetime_start\""
+            +f"{options.separator}\"datetime_finish\""
+            +f"{options.separator}\"channel\""
+            +f"{options.separator}\"title\""
+            +f"{options.separator}\"channel_logo_url\""
+            +f"{options.separator}\"description\""
+            +f"{options.separator}\"available_archive\""
+            +"\n")
+        for program in programs:
+            await stream.write(__legacy_to_csv_line(program, options.separator))
+
+def __measure(write_async, programs: list[TvProgramData], options: SaveOptions) -> float:
+    started = time.perf_counter()
+    asyncio.run(write_async(programs, options))
+    return time.perf_counter() - started
+
+def __read_bytes(path: str) -> bytes:
+    with open(path, "rb") as stream:
+        return stream.read()
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-n", "--rows", type=int, default=100000)
+    args_parser.add_argument("-r", "--repeat", type=int, default=3)
+    args_parser.add_argument("-sep", "--separator", type=str, default="\t")
+    args = args_parser.parse_args()
+
+    try:
+        import aiofile
+        has_legacy = True
+    except ImportError:
+        has_legacy = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        options = SaveOptions(os.path.join(directory, "batched.csv"), args.separator)
+        legacy_options = SaveOptions(os.path.join(directory, "legacy.csv"), args.separator)
+
+        programs = create_programs(args.rows)
+        batched = min(__measure(out_to_csv_async, programs, options) for _ in range(args.repeat))
+        print(f"batched\t{args.rows} rows\t{batched:.3f} s\t{args.rows / batched:,.0f} rows/s")
+
+        if (not has_legacy):
+            print("legacy\tskipped, aiofile is not installed")
+            return
+
+        #прежняя реализация изменяет программы, поэтому каждый прогон на свежих данных
+        legacy = min(
+            __measure(__legacy_out_to_csv_async, create_programs(args.rows), legacy_options)
+            for _ in range(args.repeat)
+        )
+        print(f"legacy\t{args.rows} rows\t{legacy:.3f} s\t{args.rows / legacy:,.0f} rows/s")
+        print(f"speedup\t{legacy / batched:.1f}x")
+
+        identical = __read_bytes(options.output_path) == __read_bytes(legacy_options.output_path)
+        print(f"identical\t{identical}")
+        if (not identical):
+            raise SystemExit(1)
+
+if (__name__ == "__main__"):
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import random
+import time
+from typing import Callable
+
+from shared.html import parse_html
+from shared.streaming import StreamNode
+from shared.text import get_node_text
+
+#Микро-бенчмарк извлечения текста из узла (shared.text.get_node_text) на глубоких и широких узлах.
+#Запуск из src: python -m benchmarks.node_text
+#Для сравнения и проверки совпадения результата воспроизводится прежняя реализация
+
+def __legacy_is_none_or_empty(string):
+    if (string is None):
+        return True
+    return string == "" or string == " " or string == "\t" or string == "\n" or string == "\r"
+
+def __legacy_get_node_text(node):
+    if (isinstance(node, str)):
+        return node
+
+    stack = [*node.children]
+    result = ""
+
+    while(len(stack) > 0):
+        node = stack.pop(0)
+
+        if (isinstance(node, str)):
+            if (__legacy_is_none_or_empty(node)):
+                continue
+            result += node
+        else:
+            if (node.name == "p" and len(result) > 0):
+                result += "\n"
+            for index, child in enumerate(node.children):
+                stack.insert(index, child)
+
+    return result
+
+#Описание из width абзацев <p> с текстом, пробелами и <br>
+def create_wide_html(width: int) -> str:
+    random.seed(width)
+    paragraphs = []
+    for i in range(width):
+        paragraphs.append(f"<p>Paragraph {i} <b>bold</b> <br/>{' ' * random.randint(0, 2)}tail</p>\n")
+    return f"<div class=\"description\">{''.join(paragraphs)}</div>"
+
+#Цепочка из depth вложенных узлов; строится без html парсера, чтобы не упираться в его рекурсию
+def create_deep_node(depth: int) -> StreamNode:
+    root = StreamNode("div", {})
+    node = root
+    for i in range(depth):
+        child = StreamNode("p" if i % 3 == 0 else "span", {})
+        node.contents.extend([f"text {i}", " ", child])
+        node = child
+    node.contents.append("end")
+    return root
+
+def __measure(get_text: Callable, node, repeat: int) -> tuple[float, str]:
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = get_text(node)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, result)
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-w", "--width", type=int, default=20000)
+    args_parser.add_argument("-d", "--depth", type=int, default=20000)
+    args_parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = args_parser.parse_args()
+
+    cases = {
+        "wide (bs4)": parse_html(create_wide_html(args.width)).div,
+        "deep (StreamNode)": create_deep_node(args.depth),
+    }
+
+    different = False
+    for name, node in cases.items():
+        elapsed, result = __measure(get_node_text, node, args.repeat)
+        legacy_elapsed, legacy_result = __measure(__legacy_get_node_text, node, args.repeat)
+        identical = result == legacy_result
+        different = different or not identical
+        print(
+            f"{name}\tnew {elapsed * 1000:.1f} ms"
+            + f"\tlegacy {legacy_elapsed * 1000:.1f} ms"
+            + f"\tspeedup {legacy_elapsed / elapsed:.1f}x"
+            + f"\tidentical {identical}"
+        )
+
+    if (different):
+        raise SystemExit(1)
+
+if (__name__ == "__main__"):
+    main()
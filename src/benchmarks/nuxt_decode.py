@@ -0,0 +1,131 @@
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from shared.js_pool import JsContextPool
+from shared.nuxt import decode_nuxt
+
+#Разбор состояния Nuxt страницы TRT Çocuk: декодер на python (shared.nuxt) и исполнение скрипта в V8.
+#Запуск из src: python -m benchmarks.nuxt_decode
+#Скрипт генерируется в том же виде, что отдает Nuxt: IIFE, повторяющиеся значения вынесены в параметры.
+#"v8 cold start" - импорт py_mini_racer и первый контекст в новом процессе, его платит каждый запуск парсера без пула
+
+def __get_param_name(index: int) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    name = ""
+    index += 1
+    while (index > 0):
+        index, rest = divmod(index - 1, len(letters))
+        name = letters[rest] + name
+    return name
+
+def create_nuxt_script(days: int, programs_per_day: int) -> str:
+    random.seed(days * programs_per_day)
+    time_zone = timezone(timedelta(hours=3))
+    titles = [f"Çizgi Film \"{i}\"" for i in range(40)]
+    params = [*titles, None, True, False, ""]
+    title_names = [__get_param_name(i) for i in range(len(titles))]
+    null_name, true_name, false_name, empty_name = [__get_param_name(i) for i in range(len(titles), len(params))]
+
+    week = []
+    start = datetime(2024, 11, 18, 6, tzinfo=time_zone)
+    for day in range(days):
+        epg = []
+        for _ in range(programs_per_day):
+            finish = start + timedelta(minutes=random.randint(10, 40))
+            epg.append(
+                "{"
+                + f"id:{random.randint(1, 10 ** 6)},"
+                + f"title:{random.choice(title_names)},"
+                + f"startTime:\"{start.isoformat()}\","
+                + f"endTime:\"{finish.isoformat()}\","
+                + f"image:{null_name},live:{false_name},description:{empty_name},"
+                + f"tags:[{true_name},{random.randint(0, 9)}]"
+                + "}"
+            )
+            start = finish
+        week.append(f"{{day:{day},epg:[{','.join(epg)}]}}")
+
+    body = f"{{layout:\"default\",data:[{{data:{{week:[{','.join(week)}]}}}}],fetch:{{}},error:{null_name}}}"
+    args = ",".join(json.dumps(value, ensure_ascii=False) for value in params)
+    names = ",".join(__get_param_name(i) for i in range(len(params)))
+    return f"window.__NUXT__=(function({names}){{return {body}}}({args}));"
+
+def __wrap_for_v8(script: str) -> str:
+    return "(function(){var window={};" + script + ";return JSON.stringify(window.__NUXT__)})()"
+
+#Прежний путь парсера: новый контекст V8 на каждый разбор и обход результата через прокси-объекты
+def __legacy_decode(script: str) -> list[tuple[str, str, str]]:
+    from py_mini_racer import MiniRacer
+
+    js_interop = MiniRacer()
+    obj = js_interop.eval(script.replace("window.__NUXT__=", "result=") + " result")
+    result = [
+        (program["title"], program["startTime"], program["endTime"])
+        for day in obj["data"][0]["data"]["week"]
+            for program in day["epg"]
+    ]
+    js_interop.close()
+    return result
+
+def __get_programs(state: Any) -> list[tuple[str, str, str]]:
+    return [
+        (program["title"], program["startTime"], program["endTime"])
+        for day in state["data"][0]["data"]["week"]
+            for program in day["epg"]
+    ]
+
+def __measure(decode: Callable[[str], Any], script: str, repeat: int) -> tuple[float, Any]:
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = decode(script)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, result)
+
+def __measure_v8_cold_start() -> float:
+    code = (
+        "import time\n"
+        + "started = time.perf_counter()\n"
+        + "from py_mini_racer import MiniRacer\n"
+        + "MiniRacer().eval('1')\n"
+        + "print(time.perf_counter() - started)"
+    )
+    return float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-d", "--days", type=int, default=7)
+    args_parser.add_argument("-p", "--programs", type=int, default=60)
+    args_parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = args_parser.parse_args()
+
+    script = create_nuxt_script(args.days, args.programs)
+    pool = JsContextPool()
+    pool.warm()
+
+    python_elapsed, python_state = __measure(decode_nuxt, script, args.repeat)
+    pool_elapsed, pool_state = __measure(lambda script: pool.eval_json(__wrap_for_v8(script)), script, args.repeat)
+    legacy_elapsed, legacy_programs = __measure(__legacy_decode, script, args.repeat)
+    pool.close()
+
+    identical = python_state == pool_state and __get_programs(python_state) == legacy_programs
+    print(f"script\t{len(script) / 1024:.0f} KB\t{len(legacy_programs)} programs")
+    print(f"python\t{python_elapsed * 1000:.2f} ms")
+    print(f"v8 pooled\t{pool_elapsed * 1000:.2f} ms")
+    print(f"v8 new context\t{legacy_elapsed * 1000:.2f} ms")
+    print(f"v8 cold start\t{__measure_v8_cold_start() * 1000:.2f} ms")
+    print(f"identical\t{identical}")
+
+    if (not identical):
+        raise SystemExit(1)
+
+if (__name__ == "__main__"):
+    main()
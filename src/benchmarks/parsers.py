@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Union
+
+from shared.fixtures import FixtureHttpClient, FixtureStore
+from shared.http import HttpClient
+from shared.options import ParserOptions
+from shared.registry import ParserInfo, select_parsers
+
+#Бенчмарк стадии разбора всех парсеров на записанных ответах источников, без сети.
+#Запись корпуса (нужен доступ к сайтам): python -m benchmarks.parsers --record
+#Замер (из src): python -m benchmarks.parsers -o results.json
+#Корпус лежит в benchmarks/fixtures/<канал>, см. shared/fixtures.py. В репозитории - синтетический корпус нескольких каналов
+#(страницы в разметке источников, без сети), --record перезаписывает его ответами сайтов.
+#Замеряется parse_async целиком поверх клиента, отдающего ответы из памяти, т.е. parse_day_html,
+#__parse_html, __parse_json и т.п. вместе с обвязкой парсера. "Текущее время" парсеров (ParserOptions.now) -
+#момент записи, чтобы URL дней совпадали с записанными
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+#now - момент записи корпуса, None - текущее время
+def __create_parser_options(now: Union[datetime, None] = None) -> ParserOptions:
+    return ParserOptions(None, None, now=now)
+
+async def __record_channel_async(info: ParserInfo, store: FixtureStore, http_client: HttpClient):
+    parser = info.create_parser(__create_parser_options(), FixtureHttpClient(store, http_client))
+    await parser.parse_async()
+
+async def __record_async(infos: list[ParserInfo], fixtures_dir: str) -> dict[str, Any]:
+    results = {}
+    async with HttpClient() as http_client:
+        for info in infos:
+            directory = os.path.join(fixtures_dir, info.key)
+            shutil.rmtree(directory, ignore_errors=True)
+            store = FixtureStore(directory)
+            store.recorded_at = datetime.now(timezone.utc)
+            try:
+                await __record_channel_async(info, store, http_client)
+            except Exception as ex:
+                results[info.key] = {"error": repr(ex)}
+                continue
+
+            store.save()
+            results[info.key] = {"requests": len(store.fixtures)}
+    return results
+
+async def __measure_channel_async(info: ParserInfo, store: FixtureStore, repeat: int) -> dict[str, Any]:
+    parser = info.create_parser(__create_parser_options(store.recorded_at), FixtureHttpClient(store))
+
+    #прогрев: импорты, ленивые инициализации, кеши регулярных выражений
+    programs = await parser.parse_async()
+
+    elapsed = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await parser.parse_async()
+        elapsed += time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await parser.parse_async()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocated_blocks = sum(
+        max(stat.count_diff, 0)
+        for stat in after.compare_to(before, "lineno")
+    )
+
+    return {
+        "programs": len(programs),
+        "requests": len(store.fixtures),
+        "ops_per_sec": repeat / elapsed if elapsed > 0 else None,
+        "mean_ms": elapsed / repeat * 1000,
+        "peak_bytes": peak,
+        "allocated_blocks": allocated_blocks
+    }
+
+def __measure(infos: list[ParserInfo], fixtures_dir: str, repeat: int) -> dict[str, Any]:
+    results = {}
+    for info in infos:
+        store = FixtureStore(os.path.join(fixtures_dir, info.key))
+        if (not store.exists()):
+            results[info.key] = {"error": "no fixtures"}
+            continue
+
+        try:
+            results[info.key] = asyncio.run(__measure_channel_async(info, store, repeat))
+        except Exception as ex:
+            results[info.key] = {"error": repr(ex)}
+    return results
+
+def format_results(results: dict[str, Any]) -> str:
+    channel_width = max([len("channel")] + [len(channel) for channel in results])
+    lines = [f"{'channel'.ljust(channel_width)}\tops/sec\tmean ms\tpeak KiB\tblocks"]
+    for channel, result in results.items():
+        if ("error" in result):
+            lines.append(f"{channel.ljust(channel_width)}\t{result['error']}")
+            continue
+        lines.append(
+            f"{channel.ljust(channel_width)}"
+            + f"\t{result['ops_per_sec']:.1f}"
+            + f"\t{result['mean_ms']:.2f}"
+            + f"\t{result['peak_bytes'] / 1024:.0f}"
+            + f"\t{result['allocated_blocks']}"
+        )
+    return "\n".join(lines)
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-c", "--channels", type=str, nargs="*", default=[])
+    args_parser.add_argument("-f", "--fixtures", type=str, default=DEFAULT_FIXTURES_DIR)
+    args_parser.add_argument("-r", "--repeat", type=int, default=20)
+    args_parser.add_argument("-o", "--output", type=str, default=None)
+    args_parser.add_argument("--record", action="store_true")
+    args = args_parser.parse_args()
+
+    try:
+        infos = select_parsers(args.channels)
+    except KeyError as ex:
+        args_parser.error(str(ex))
+
+    if (args.record):
+        results = asyncio.run(__record_async(infos, args.fixtures))
+        for channel, result in results.items():
+            print(f"{channel}\t{result.get('error', result.get('requests'))}")
+        return
+
+    results = __measure(infos, args.fixtures, args.repeat)
+    print(format_results(results))
+
+    if (args.output is not None):
+        with open(args.output, "w", encoding="utf-8") as output_stream:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "repeat": args.repeat,
+                "results": results
+            }, output_stream, indent=2)
+
+if (__name__ == "__main__"):
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from shared.models import TvProgramData, TvProgramList
+
+#Память, занимаемая программами нескольких каналов за несколько недель в одном процессе.
+#Запуск из src: python -m benchmarks.program_memory -c 24 -w 4
+#Названия передач создаются заново для каждой строки, как при разборе html
+
+#Прежнее представление программы - обычный класс с __dict__
+class DictTvProgramData:
+    def __init__(self, datetime_start, datetime_finish, channel, title, channel_logo_url, description, available_archive):
+        self.datetime_start = datetime_start
+        self.datetime_finish = datetime_finish
+        self.channel = channel
+        self.title = title
+        self.channel_logo_url = channel_logo_url
+        self.description = description
+        self.available_archive = available_archive
+
+def generate_rows(channels: int, weeks: int):
+    random.seed(channels * weeks)
+    time_zone = timezone(timedelta(hours=3))
+    titles = [f"Program title number {i}" for i in range(300)]
+    for channel_index in range(channels):
+        channel = "".join(["Channel ", str(channel_index)])
+        start = datetime(2024, 1, 1, 6, tzinfo=time_zone)
+        finish_date = start + timedelta(weeks=weeks)
+        while (start < finish_date):
+            finish = start + timedelta(minutes=random.randint(10, 90))
+            title = "".join([random.choice(titles), ""])
+            description = None
+            if (random.random() < 0.3):
+                description = "".join(["Description of ", title])
+            yield (start, finish, channel, title, None, description, False)
+            start = finish
+
+def __measure(build: Callable[[], object]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (len(result), current)
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-c", "--channels", type=int, default=24)
+    args_parser.add_argument("-w", "--weeks", type=int, default=4)
+    args = args_parser.parse_args()
+
+    variants = {
+        "dict": lambda: [DictTvProgramData(*row) for row in generate_rows(args.channels, args.weeks)],
+        "slots": lambda: [TvProgramData(*row) for row in generate_rows(args.channels, args.weeks)],
+        "list": lambda: TvProgramList(TvProgramData(*row) for row in generate_rows(args.channels, args.weeks)),
+    }
+
+    baseline = None
+    for name, build in variants.items():
+        count, size = __measure(build)
+        if (baseline is None):
+            baseline = size
+        print(f"{name}\t{count} programs\t{size / 1024 / 1024:.1f} MiB\t{size / count:.0f} B/program\t{size / baseline:.2f}x")
+
+if (__name__ == "__main__"):
+    main()
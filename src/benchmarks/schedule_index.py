@@ -0,0 +1,87 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from shared.models import TvProgramData
+from shared.schedule_index import ScheduleIndex
+
+#Запросы "что идет сейчас и что дальше" по всем каналам: линейный проход по списку программ и ScheduleIndex.
+#Запуск из src: python -m benchmarks.schedule_index -c 24 -w 4
+#У части каналов последняя программа без datetime_finish, как у парсеров без remove_last
+
+def generate_programs(channels: int, weeks: int) -> list[TvProgramData]:
+    random.seed(channels * weeks)
+    time_zone = timezone(timedelta(hours=3))
+    programs = []
+    for channel_index in range(channels):
+        channel = f"Channel {channel_index}"
+        start = datetime(2024, 1, 1, 6, tzinfo=time_zone)
+        finish_date = start + timedelta(weeks=weeks)
+        while (start < finish_date):
+            finish = start + timedelta(minutes=random.randint(10, 90))
+            programs.append(TvProgramData(start, finish, channel, "Title", None, None, False))
+            start = finish
+        if (channel_index % 2 == 0):
+            programs[-1].datetime_finish = None
+    random.shuffle(programs)
+    return programs
+
+#Прежний способ: проход по всем программам на каждый запрос
+def scan_now_next(programs: list[TvProgramData], moment: datetime) -> dict:
+    result = {}
+    for program in programs:
+        now, next_program = result.get(program.channel, (None, None))
+        finish = program.datetime_finish
+        if (program.datetime_start <= moment and (finish is None or moment < finish)):
+            if (now is None or now.datetime_start < program.datetime_start):
+                now = program
+        elif (moment < program.datetime_start):
+            if (next_program is None or program.datetime_start < next_program.datetime_start):
+                next_program = program
+        result[program.channel] = (now, next_program)
+    return result
+
+def __measure(query: Callable[[datetime], dict], moments: list[datetime]) -> tuple[float, list[dict]]:
+    started = time.perf_counter()
+    results = [query(moment) for moment in moments]
+    return (time.perf_counter() - started, results)
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("-c", "--channels", type=int, default=24)
+    args_parser.add_argument("-w", "--weeks", type=int, default=4)
+    args_parser.add_argument("-q", "--queries", type=int, default=200)
+    args = args_parser.parse_args()
+
+    programs = generate_programs(args.channels, args.weeks)
+    first = min(program.datetime_start for program in programs)
+    moments = [first + timedelta(minutes=random.randint(0, args.weeks * 7 * 24 * 60)) for _ in range(args.queries)]
+
+    #ключи каналов совпадают с названиями в программах
+    by_channel = {}
+    for program in programs:
+        by_channel.setdefault(program.channel, []).append(program)
+
+    started = time.perf_counter()
+    index = ScheduleIndex(by_channel)
+    build_elapsed = time.perf_counter() - started
+
+    index_elapsed, index_results = __measure(index.get_now_next, moments)
+    scan_elapsed, scan_results = __measure(lambda moment: scan_now_next(programs, moment), moments)
+    identical = index_results == scan_results
+
+    print(f"programs\t{len(programs)}\tbuild {build_elapsed * 1000:.1f} ms")
+    print(
+        f"now/next x{args.queries}\tindex {index_elapsed * 1000:.1f} ms"
+        + f"\tscan {scan_elapsed * 1000:.1f} ms"
+        + f"\tspeedup {scan_elapsed / index_elapsed:.1f}x"
+        + f"\tidentical {identical}"
+    )
+
+    if (not identical):
+        raise SystemExit(1)
+
+if (__name__ == "__main__"):
+    main()
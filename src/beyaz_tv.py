@@ -1,9 +1,7 @@
 
 import asyncio
 from typing import Tuple
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
@@ -27,43 +25,66 @@ class BeyazTvParser(TvParser):
     ]
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            
-            http_urls = self.__day_urls
-            
-            current_day = get_monday_datetime(self.__response_time_zone)
-            for url in http_urls: 
-                tasks.append(
-                    self.parse_day_async(session, url, current_day)
-                )
-                current_day += timedelta(days=1)
+        tasks = []
+        
+        http_urls = self.__day_urls
+        
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        for url in http_urls: 
+            tasks.append(
+                self.parse_day_async(url, current_day)
+            )
+            current_day += timedelta(days=1)
 
-            parsed_days_result = await asyncio.gather(*tasks)
-            sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
-            
-            result = [ 
-                program 
-                for day in sorted_by_dates 
-                    for program in day[1]
-            ]            
+        parsed_days_result = await asyncio.gather(*tasks)
+        sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
         
-            fill_finish_date_by_next_start_date(result, self.__remove_last)
-            
-            return result
+        result = [ 
+            program 
+            for day in sorted_by_dates 
+                for program in day[1]
+        ]            
+    
+        fill_finish_date_by_next_start_date(result, self.__remove_last)
+        
+        return result
 
-    async def parse_day_async(self, session, http_url, current_day) -> Tuple[datetime, list[TvProgramData]]:
-        async with session.get(http_url) as resp: 
-            return (current_day, self.parse_day_html(await resp.text(), current_day))
+    async def parse_day_async(self, http_url, current_day) -> Tuple[datetime, list[TvProgramData]]:
+        if (self.options.stream_html):
+            return (current_day, await self.stream_day_async(http_url, current_day))
 
-    def parse_day_html(self, html_text:str, current_day:datetime):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html_text = await self.fetch_text_async(http_url)
+        return (current_day, await self.parse_cached_async(http_url, html_text, self.parse_day_html, current_day))
+
+    #Потоковый вариант parse_day_html: строки tbody разбираются по мере загрузки,
+    #страница после таблицы не загружается
+    async def stream_day_async(self, http_url, current_day:datetime) -> list[TvProgramData]:
+        parse_row = self.__create_row_parser(current_day)
         parsed_programs = []
 
+        await self.stream_rows_async(
+            http_url,
+            lambda program, _: parsed_programs.append(parse_row(program)),
+            "tbody"
+        )
+
+        return parsed_programs
+
+    def parse_day_html(self, html_text:str, current_day:datetime):
+        html = self.parse_html(html_text)
+        parse_row = self.__create_row_parser(current_day)
+
         programs = html.find("tbody").find_all("tr")
+
+        return [parse_row(program) for program in programs]
+
+    #Строки разбираются по порядку, если часы уменьшились - наступил следующий день
+    def __create_row_parser(self, current_day:datetime):
         last_hour = 0
 
-        for program in programs:
+        def parse_row(program) -> TvProgramData:
+            nonlocal current_day, last_hour
+
             data = program.find_all("td", recursive=False)
             time = data[0].next.split(":")
 
@@ -83,7 +104,7 @@ class BeyazTvParser(TvParser):
                 tzinfo=self.__response_time_zone
             )
             
-            parsed_programs.append(TvProgramData(
+            return TvProgramData(
                 datetime_start,
                 None,
                 self.__channel_name,
@@ -91,13 +112,13 @@ class BeyazTvParser(TvParser):
                 self.__channel_logo_url,
                 None,
                 False
-            ))
+            )
 
-        return parsed_programs
+        return parse_row
 
     
     def get_day_urls(self, html_text) -> list[str]:
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         days_list = html.find("ul", {"class": "days-list"})
         a_tags = days_list.find_all("a")
 
@@ -1,5 +1,4 @@
 import asyncio
-import aiohttp
 import json
 from datetime import datetime, UTC, timedelta, timezone
 from bs4 import BeautifulSoup
@@ -21,19 +20,15 @@ class CatoonNetworkParser(TvParser):
     __channel_name = "Cartoon Network"
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
-
+    source_headers = {
+        "Accept":"application/json, text/javascript, */*; q=0.01",
+        "Origin":"https://www.tvyayinakisi.com",
+        "Referer":"https://www.tvyayinakisi.com/"
+    }
 
     async def parse_async(self) -> list[TvProgramData]:
-        headers = {
-            "Accept":"application/json, text/javascript, */*; q=0.01",
-            "Origin":"https://www.tvyayinakisi.com",
-            "Referer":"https://www.tvyayinakisi.com/"
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url, headers=headers) as resp:
-                json = await resp.json()
-                return self.__parse_json(json)
+        json = await self.fetch_json_async(self.__source_url)
+        return self.__parse_json(json)
 
     def __parse_json(self, input: str):
         parsed_programs = []
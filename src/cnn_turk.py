@@ -1,7 +1,5 @@
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
@@ -16,19 +14,18 @@ class CnnTurkParser(TvParser):
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                result = self.__parse_html(await resp.text())    
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        result = self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
 
-            fill_finish_date_by_next_start_date(result, self.__remove_last)
-            return result
+        fill_finish_date_by_next_start_date(result, self.__remove_last)
+        return result
 
-    def __parse_html(self, html_text:str):
-        html = BeautifulSoup(html_text, 'html.parser')
+    def __parse_html(self, html_text: str, current_day: datetime):
+        html = self.parse_html(html_text)
         parsed_programs = []
 
         program_days = html.find("div", {"class":"tab-content"})
-        current_day = get_monday_datetime(self.__response_time_zone)
 
         for day_programs in program_days.find_all("div", {"class":"tab-item"}):
             parsed_programs.extend(
@@ -1,13 +1,12 @@
 import asyncio
-import aiohttp
 from typing import Tuple, Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
 from shared.output import run_parser_out_to_csv
-from shared.utils import fill_finish_date_by_next_start_date, get_monday_datetime, get_node_text, is_none_or_empty, replace_spaces
+from shared.fanout import fan_out_days_async, get_option_days
+from shared.utils import get_monday_datetime, get_node_text, is_none_or_empty, replace_spaces
 
 class EkolTvParser(TvParser):
     __source_url = "https://www.ekoltv.com.tr/yayin-akisi"
@@ -17,34 +16,28 @@ class EkolTvParser(TvParser):
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            http_urls = self.get_day_urls()    
-
-            parsed_days_result = await asyncio.gather(*[
-                self.parse_day_async(session, url) for url in http_urls 
-            ])
-
-            sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
-            
-            result = [ 
-                program 
-                for day in sorted_by_dates 
-                    for program in day[1]
-            ]            
-        
-            fill_finish_date_by_next_start_date(result, self.__remove_last)
-            
-            return result
-
-    async def parse_day_async(self, session, http_url) -> Tuple[datetime, list[TvProgramData]]:
-        date_from_url = http_url.split("=")[-1]
-        current_day = datetime.strptime(date_from_url, "%d.%m.%Y").replace(tzinfo=self.__response_time_zone)
-
-        async with session.get(http_url) as resp: 
-            return self.parse_day_html(await resp.text(), current_day)
+        #с полуночи: иначе при одной --finish-date последний день (полночь UTC) раньше понедельника + текущее время
+        monday = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+        return await fan_out_days_async(
+            self.options,
+            get_option_days(self.options, monday, 6),
+            self.parse_day_async,
+            self.__remove_last
+        )
+
+    async def parse_day_async(self, day: datetime) -> list[TvProgramData]:
+        http_url = self.get_day_url(day)
+        current_day = datetime(day.year, day.month, day.day, tzinfo=self.__response_time_zone)
+
+        html_text = await self.fetch_text_async(http_url)
+        _, programs = await self.parse_cached_async(http_url, html_text, self.parse_day_html, current_day)
+        return programs
         
     def parse_day_html(self, html_text:str, current_day:datetime):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         parsed_programs = []
 
         programs = html.find("div", {"class":"tl-list"}).find_all("div", recursive=False)
@@ -85,16 +78,15 @@ class EkolTvParser(TvParser):
     
     
     def get_day_urls(self) -> list[str]:
-        monday = get_monday_datetime(self.__response_time_zone)
-        day_urls = []
+        monday = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
 
-        for day_index in range(0, 7):
-            day = monday + timedelta(days=day_index)
-            day_urls.append(
-                self.__source_url + f"?date={day.day}.{day.month}.{day.year}"
-            )
+        return [
+            self.get_day_url(monday + timedelta(days=day_index))
+            for day_index in range(0, 7)
+        ]
 
-        return day_urls
+    def get_day_url(self, day: datetime) -> str:
+        return self.__source_url + f"?date={day.day}.{day.month}.{day.year}"
     
     def parse_time(self, time_str: str) -> datetime:
         return datetime.fromisoformat(time_str)
@@ -1,8 +1,6 @@
 import asyncio
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
@@ -14,19 +12,19 @@ class ErTVParser(TvParser):
     __channel_name = "er tv"
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
+    #страница не обновляется годами, перепроверять ее чаще раза в сутки незачем
+    cache_ttl = timedelta(days=1)
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
 
-    def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
+    def __parse_html(self, html_input: str, current_day: datetime):
+        html = self.parse_html(html_input)
         program_days = html.find("div", {"id": "newstext"})
         parsed_programs = []
 
-        current_day = get_monday_datetime(self.__response_time_zone)
         for current_day_programs in program_days.find_all("p", recursive=False):
             if (is_none_or_empty(current_day_programs.text)):
                 continue
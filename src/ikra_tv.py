@@ -1,9 +1,8 @@
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
+from shared.http import HttpClient
 from shared.options import ParserOptions, SaveOptions, read_command_line_options
 from shared.output import run_parser_out_to_csv
 from shared.utils import fill_finish_date_by_next_start_date, get_monday_datetime
@@ -24,11 +23,11 @@ class IkraTvParser(TvParser):
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
 
-    def __init__(self, options: ParserOptions) -> None:
-        super().__init__(options)
+    def __init__(self, options: ParserOptions, http_client: HttpClient = None) -> None:
+        super().__init__(options, http_client)
 
     def __parse_html(self, html_input: str, current_day: datetime):
-        html = BeautifulSoup(html_input, 'html.parser')
+        html = self.parse_html(html_input)
         programs = html.find("div", {"class": "streaming"})
         parsed_programs = []
 
@@ -57,24 +56,32 @@ class IkraTvParser(TvParser):
         return parsed_programs
     
     async def parse_async(self) -> list[TvProgramData]:
-        programs = []
+        tasks = []
 
-        current_day = get_monday_datetime(self.__response_time_zone)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
 
-        async with aiohttp.ClientSession() as session:
-            for url in self.__day_urls:  
-                async with session.get(url) as resp:
-                    html = await resp.text()
-                    programs.extend(
-                        self.__parse_html(html, current_day)
-                    )
+        for url in self.__day_urls:  
+            tasks.append(
+                self.parse_day_async(url, current_day)
+            )
+
+            current_day += timedelta(days=1)
 
-                current_day += timedelta(days=1)
+        #gather сохраняет порядок дней
+        programs = [
+            program
+            for day_programs in await asyncio.gather(*tasks)
+                for program in day_programs
+        ]
 
         fill_finish_date_by_next_start_date(programs)        
 
         return programs
 
+    async def parse_day_async(self, url: str, current_day: datetime) -> list[TvProgramData]:
+        html = await self.fetch_text_async(url)
+        return await self.parse_cached_async(url, html, self.__parse_html, current_day)
+
 if (__name__=="__main__"):
     options = read_command_line_options()
     parser = IkraTvParser(options.parser_options)
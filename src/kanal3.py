@@ -1,8 +1,6 @@
 import asyncio
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
@@ -17,16 +15,46 @@ class Kanal3Parser(TvParser):
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        if (self.options.stream_html):
+            return await self.__stream_async()
 
-    def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
+
+    #Потоковый вариант __parse_html: строки каждой вкладки (дня) разбираются по мере загрузки.
+    #Как и в __parse_html, берутся только строки tbody (заголовок таблицы в thead - не программа)
+    async def __stream_async(self) -> list[TvProgramData]:
+        monday = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        days_programs: dict[int, list[TvProgramData]] = {}
+
+        def on_row(program, day_index):
+            days_programs.setdefault(day_index, []).append(
+                self.__parse_program(program, monday + timedelta(days=day_index))
+            )
+
+        await self.stream_rows_async(
+            self.__source_url,
+            on_row,
+            "div",
+            {"class": "sow-tabs-panel"},
+            max_containers=None,
+            row_parent="tbody"
+        )
+
+        parsed_programs = []
+        for day_index in sorted(days_programs):
+            parsed_programs.extend(
+                sorted(days_programs[day_index], key=lambda x: x.datetime_start)
+            )
+
+        fill_finish_date_by_next_start_date(parsed_programs, self.__remove_last)
+        return parsed_programs
+
+    def __parse_html(self, html_input: str, current_day: datetime):
+        html = self.parse_html(html_input)
         programs = html.find_all("div", {"class": "sow-tabs-panel"})
         parsed_programs = []
-        current_day = get_monday_datetime(self.__response_time_zone)
 
         for day_programs in programs:
             parsed_programs.extend(
@@ -50,25 +78,30 @@ class Kanal3Parser(TvParser):
         parsed_programs = []
 
         for program in day_programs.find_all("tr", recursive=False):
-            program = program.find_all("td")
-            datetime_start = self.__parse_time(
-                program[0].text, 
-                current_day
+            parsed_programs.append(
+                self.__parse_program(program, current_day)
             )
-            show_name = replace_spaces(program[1].text)
-
-            parsed_programs.append(TvProgramData(
-                datetime_start,
-                None,
-                self.__channel_name,
-                show_name,
-                self.__channel_logo_url,
-                None,
-                False
-            ))
         
         return sorted(parsed_programs, key=lambda x: x.datetime_start)
 
+    def __parse_program(self, program, current_day) -> TvProgramData:
+        program = program.find_all("td")
+        datetime_start = self.__parse_time(
+            program[0].text, 
+            current_day
+        )
+        show_name = replace_spaces(program[1].text)
+
+        return TvProgramData(
+            datetime_start,
+            None,
+            self.__channel_name,
+            show_name,
+            self.__channel_logo_url,
+            None,
+            False
+        )
+
 if (__name__=="__main__"):
     options = read_command_line_options()
     parser = Kanal3Parser(options.parser_options)
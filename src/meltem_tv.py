@@ -1,9 +1,8 @@
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
+from shared.http import HttpClient
 from shared.options import ParserOptions, SaveOptions, read_command_line_options
 from shared.output import run_parser_out_to_csv
 from shared.utils import fill_finish_date_by_next_start_date, get_monday_datetime
@@ -15,8 +14,8 @@ class MeltemTvParser(TvParser):
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
 
-    def __init__(self, options: ParserOptions) -> None:
-        super().__init__(options)
+    def __init__(self, options: ParserOptions, http_client: HttpClient = None) -> None:
+        super().__init__(options, http_client)
 
     def __parse_day_programs(self, stream_list, current_day):
         day_programs = []
@@ -46,14 +45,12 @@ class MeltemTvParser(TvParser):
 
         return day_programs
 
-    def __parse_html(self, html_input: str):
+    def __parse_html(self, html_input: str, current_day: datetime):
         
-        html = BeautifulSoup(html_input, 'html.parser')
+        html = self.parse_html(html_input)
         stream_lists = html.find_all("div", {"class": "streamList"})
         parsed_programs = []
 
-        current_day = get_monday_datetime(self.__response_time_zone)
-
         for stream_list in stream_lists:
             day_streams = self.__parse_day_programs(stream_list, current_day)
             parsed_programs.extend(day_streams)
@@ -64,10 +61,9 @@ class MeltemTvParser(TvParser):
         return parsed_programs
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
 
 if (__name__=="__main__"):
     options = read_command_line_options()
@@ -0,0 +1,55 @@
+import sys
+import time
+
+from shared.options import read_runner_command_line_options
+from shared.registry import create_parsers, select_parsers
+
+#Запуск всех (или выбранных через --channels) парсеров в одном процессе.
+#Модули парсеров импортируются только для выбранных каналов, см. shared/registry.py
+if (__name__=="__main__"):
+    options = read_runner_command_line_options()
+
+    try:
+        infos = select_parsers(options.channels)
+    except KeyError as ex:
+        sys.exit(ex.args[0])
+
+    if (options.list_channels):
+        for info in infos:
+            print(f"{info.key}\t{', '.join(info.describe_capabilities())}")
+        sys.exit(0)
+
+    #модули запуска тянут aiohttp и bs4 - для --list они не нужны
+    from shared.daemon import run_daemon
+    from shared.http import HttpClient
+    from shared.html_verify import format_html_backend_reports, verify_html_backends
+    from shared.replay import get_replay_parser_options
+    from shared.runner import format_report, run_parsers_out_to_csv
+
+    #один пул соединений на все каналы
+    http_client = HttpClient(options.parser_options.http_options)
+    parsers = create_parsers(infos, options.parser_options, http_client)
+
+    #на записанных ответах "текущее время" каждого парсера - момент записи корпуса его канала
+    replay_dir = options.parser_options.http_options.replay_dir
+    if (replay_dir is not None):
+        for info in infos:
+            parsers[info.key].options = get_replay_parser_options(options.parser_options, replay_dir, info.key)
+
+    if (options.verify_html_backend is not None):
+        reports = verify_html_backends(parsers, options.verify_html_backend, http_client)
+        print(format_html_backend_reports(reports))
+        sys.exit(0 if all(report.is_equal for report in reports) else 1)
+
+    if (options.daemon):
+        if (options.merge and options.delta_dir is not None):
+            sys.exit("--delta with --merge is not supported in --daemon mode")
+        run_daemon(infos, parsers, options, http_client)
+        sys.exit(0)
+
+    started = time.perf_counter()
+    results = run_parsers_out_to_csv(parsers, options, http_client)
+    print(format_report(results, time.perf_counter() - started))
+
+    if (not all(result.is_success for result in results)):
+        sys.exit(1)
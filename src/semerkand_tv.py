@@ -1,6 +1,4 @@
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
@@ -47,14 +45,12 @@ class SemerkandTvParser(TvParser):
 
         return parsed_programs
 
-    def __parse_html(self, html_input: str):
+    def __parse_html(self, html_input: str, current_day: datetime):
         
-        html = BeautifulSoup(html_input, 'html.parser')
+        html = self.parse_html(html_input)
         programs = html.find_all("div", {"class": "streaming"})
         parsed_programs = []
 
-        current_day = get_monday_datetime(self.__response_time_zone)
-
         for current_day_programs in programs:
             day_streams = self.__parse_day_programs(current_day_programs, current_day)
             parsed_programs.extend(day_streams)
@@ -65,10 +61,9 @@ class SemerkandTvParser(TvParser):
         return parsed_programs
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
 
 if (__name__=="__main__"):
     options = read_command_line_options()
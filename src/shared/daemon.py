@@ -0,0 +1,135 @@
+import asyncio
+import random
+import signal
+from datetime import datetime, timedelta, timezone
+
+from .options import RunnerOptions
+from .http import HttpClient
+from .models import TvParser
+from .executor import shutdown_process_pool
+from .js_pool import warm_js_pool
+from .registry import ParserInfo
+from .runner import ChannelResult, out_channel_async, refresh_channel_async
+from .schedule_index import ScheduleIndex
+from .output import out_to_csv_async, out_to_sqlite_async, out_to_xmltv_async
+
+#после ошибки канал повторяется не позже чем через это время, даже если его периодичность больше
+RETRY_DELAY = timedelta(minutes=30)
+
+#Долгоживущий режим (run.py --daemon): вместо запуска по cron каждый канал обновляется
+#по своей периодичности из каталога (ParserInfo.cadence).
+#Парсеры, их модули, общий HTTP клиент и пул процессов создаются один раз и живут между обновлениями.
+#Каждый запуск сдвигается на случайную задержку до options.jitter секунд, чтобы каналы не шли к источникам разом.
+#Результат канала сохраняется сразу по завершении обновления, при --merge общий csv перезаписывается
+#последними успешными результатами всех каналов, так же перезаписывается общий XMLTV (--xmltv)
+class ScheduleDaemon:
+    options: RunnerOptions
+    #последние успешные результаты каналов
+    index: ScheduleIndex
+
+    def __init__(self, infos: list[ParserInfo], parsers: dict[str, TvParser], options: RunnerOptions):
+        self.options = options
+        self.index = ScheduleIndex()
+        self.__infos = {info.key: info for info in infos}
+        self.__parsers = parsers
+        self.__stop = asyncio.Event()
+        self.__merge_lock = asyncio.Lock()
+
+    def stop(self):
+        self.__stop.set()
+
+    async def run_async(self):
+        self.__add_signal_handlers()
+        await asyncio.gather(*[
+            self.__run_channel_async(channel, parser)
+            for channel, parser in self.__parsers.items()
+        ])
+
+    async def __run_channel_async(self, channel: str, parser: TvParser):
+        cadence = self.__infos[channel].cadence
+        #первое обновление сразу после старта
+        next_run = self.__add_jitter(datetime.now(timezone.utc))
+
+        while (not await self.__wait_until_async(next_run)):
+            result = await refresh_channel_async(channel, parser)
+            finished = datetime.now(timezone.utc)
+
+            if (result.is_success):
+                self.index.update(channel, result.programs)
+                await self.__out_async(result)
+                next_run = cadence.get_next_run(finished)
+            else:
+                next_run = finished + min(cadence.interval, RETRY_DELAY)
+
+            next_run = self.__add_jitter(next_run)
+            print(self.__format_result(result, next_run), flush=True)
+
+    #Ждет момента moment, возвращает True, если за это время демон остановили
+    async def __wait_until_async(self, moment: datetime) -> bool:
+        delay = (moment - datetime.now(timezone.utc)).total_seconds()
+        try:
+            await asyncio.wait_for(self.__stop.wait(), max(0, delay))
+        except asyncio.TimeoutError:
+            pass
+        return self.__stop.is_set()
+
+    async def __out_async(self, result: ChannelResult):
+        if (not self.options.merge):
+            await out_channel_async(result, self.options)
+        elif (self.options.sqlite_path is not None):
+            await out_to_sqlite_async(result.programs, self.options.sqlite_path)
+
+        async with self.__merge_lock:
+            if (self.options.merge):
+                await out_to_csv_async(list(self.index), self.options.get_save_options(None))
+            #расписания каналов в индексе уже отсортированы по времени начала
+            if (self.options.xmltv_path is not None):
+                await out_to_xmltv_async(
+                    [(channel, self.index.get_schedule(channel).programs) for channel in self.index.channels],
+                    self.options.xmltv_path
+                )
+
+    def __add_jitter(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=random.uniform(0, self.options.jitter))
+
+    def __add_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, self.stop)
+            #Windows: остановка по Ctrl+C через KeyboardInterrupt
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    @staticmethod
+    def __format_result(result: ChannelResult, next_run: datetime) -> str:
+        status = "ok" if result.is_success else f"error: {result.error!r}"
+        return (
+            f"{datetime.now().astimezone().isoformat('T', 'seconds')}"
+            + f"\t{result.channel}"
+            + f"\t{len(result.programs)}"
+            + f"\t{result.elapsed:.3f}"
+            + f"\t{status}"
+            + f"\tnext {next_run.astimezone().isoformat('T', 'seconds')}"
+        )
+
+
+async def __run_daemon_async(daemon: ScheduleDaemon, http_client: HttpClient):
+    async with http_client:
+        await daemon.run_async()
+
+#http_client - общий клиент, внедренный в парсеры, закрывается при остановке демона
+def run_daemon(
+    infos: list[ParserInfo],
+    parsers: dict[str, TvParser],
+    options: RunnerOptions,
+    http_client: HttpClient
+):
+    #контексты V8 создаются до первого обновления и живут все время работы демона
+    warm_js_pool(info.extra_requirements for info in infos)
+    try:
+        asyncio.run(__run_daemon_async(ScheduleDaemon(infos, parsers, options), http_client))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_process_pool()
@@ -0,0 +1,189 @@
+import os
+import pickle
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from typing import Iterable, Union
+
+from .models import TvProgramData, TvProgramList
+from .options import SaveOptions
+from .output import CSV_COLUMNS, format_csv_line, open_output, write_csv
+
+CHANGE_INSERTED = "inserted"
+CHANGE_UPDATED = "updated"
+CHANGE_REMOVED = "removed"
+
+#Изменение программы между двумя запусками.
+#Для removed program - программа из прошлого запуска, для остальных - из текущего
+class ProgramChange:
+    kind: str
+    program: TvProgramData
+    #для updated - программа из прошлого запуска
+    previous: Union[TvProgramData, None]
+
+    def __init__(self, kind: str, program: TvProgramData, previous: Union[TvProgramData, None] = None):
+        self.kind = kind
+        self.program = program
+        self.previous = previous
+
+
+#Даты программ парсеры часто получают из datetime.now(), а источники дают время с точностью до минуты,
+#поэтому в ключе и при сравнении даты обрезаются до минут
+def __truncate(date: Union[datetime, None]) -> Union[datetime, None]:
+    if (date is None):
+        return None
+    return date.replace(second=0, microsecond=0)
+
+def get_program_key(program: TvProgramData) -> tuple[str, datetime]:
+    return (program.channel, __truncate(program.datetime_start))
+
+#Ключ для программ, не нашедших пару по времени начала. Начало текущей передачи некоторые парсеры
+#берут из datetime.now() (cnn_turk, trt_belgesel: "Şimdi"), и при каждом запуске оно другое;
+#такая программа - та же передача того же дня, т.е. updated, а не removed + inserted
+def __get_fallback_key(program: TvProgramData) -> tuple:
+    return (program.channel, program.datetime_start.date(), program.title)
+
+#Поля, попадающие в csv; программы с одинаковыми значениями не считаются измененными
+def __get_program_values(program: TvProgramData) -> tuple:
+    return (
+        __truncate(program.datetime_finish),
+        program.title,
+        program.channel_logo_url,
+        program.description,
+        bool(program.available_archive)
+    )
+
+#Изменения от previous к current по ключу (канал, datetime_start до минуты), в порядке ключей.
+#Оставшиеся без пары программы сопоставляются по каналу, дню и названию (по порядку)
+def diff_programs(previous: Iterable[TvProgramData], current: Iterable[TvProgramData]) -> list[ProgramChange]:
+    previous_by_key = {get_program_key(program): program for program in previous}
+    current_by_key = {get_program_key(program): program for program in current}
+
+    changes = []
+    inserted = []
+    for key, program in current_by_key.items():
+        previous_program = previous_by_key.get(key)
+        if (previous_program is None):
+            inserted.append(program)
+        elif (__get_program_values(previous_program) != __get_program_values(program)):
+            changes.append(ProgramChange(CHANGE_UPDATED, program, previous_program))
+
+    removed_by_fallback_key: dict[tuple, list[TvProgramData]] = {}
+    for key, program in previous_by_key.items():
+        if (key not in current_by_key):
+            removed_by_fallback_key.setdefault(__get_fallback_key(program), []).append(program)
+
+    for program in inserted:
+        candidates = removed_by_fallback_key.get(__get_fallback_key(program))
+        if (candidates is not None and len(candidates) > 0):
+            changes.append(ProgramChange(CHANGE_UPDATED, program, candidates.pop(0)))
+        else:
+            changes.append(ProgramChange(CHANGE_INSERTED, program))
+
+    for candidates in removed_by_fallback_key.values():
+        for program in candidates:
+            changes.append(ProgramChange(CHANGE_REMOVED, program))
+
+    changes.sort(key=lambda change: get_program_key(change.program))
+    return changes
+
+
+#Версионированные результаты каналов: directory/<канал>/<версия>.pickle,
+#версия - UTC время сохранения (YYYYmmddTHHMMSSffffffZ), поэтому сортируется как строка
+class DeltaStore:
+    directory: str
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def list_versions(self, channel: str) -> list[str]:
+        channel_dir = os.path.join(self.directory, channel)
+        if (not os.path.isdir(channel_dir)):
+            return []
+
+        return sorted(
+            name[:-len(".pickle")]
+            for name in os.listdir(channel_dir)
+                if name.endswith(".pickle")
+        )
+
+    def load_version(self, channel: str, version: str) -> TvProgramList:
+        with open(self.__get_path(channel, version), "rb") as snapshot_file:
+            return pickle.load(snapshot_file)
+
+    def load_latest(self, channel: str) -> Union[TvProgramList, None]:
+        versions = self.list_versions(channel)
+        if (len(versions) == 0):
+            return None
+        return self.load_version(channel, versions[-1])
+
+    #Расписание канала по состоянию на момент moment - последняя версия, сохраненная не позже него
+    def load_as_of(self, channel: str, moment: datetime) -> Union[TvProgramList, None]:
+        moment_version = self.__format_version(moment)
+        versions = [version for version in self.list_versions(channel) if version <= moment_version]
+        if (len(versions) == 0):
+            return None
+        return self.load_version(channel, versions[-1])
+
+    def store(self, channel: str, programs: Iterable[TvProgramData]) -> str:
+        version = self.__format_version(datetime.now(timezone.utc))
+        path = self.__get_path(channel, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            pickle.dump(TvProgramList(programs), snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+        return version
+
+    #Сравнивает результат канала с прошлой версией, сохраняет его новой версией и возвращает изменения.
+    #Первый запуск канала - все программы inserted
+    def update(self, channel: str, programs: list[TvProgramData]) -> list[ProgramChange]:
+        previous = self.load_latest(channel)
+        changes = diff_programs(previous if previous is not None else [], programs)
+        self.store(channel, programs)
+        return changes
+
+    def __get_path(self, channel: str, version: str) -> str:
+        return os.path.join(self.directory, channel, f"{version}.pickle")
+
+    @staticmethod
+    def __format_version(moment: datetime) -> str:
+        return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def format_changes_header(separator: str) -> str:
+    return separator.join(f"\"{column}\"" for column in ["change"] + CSV_COLUMNS) + "\n"
+
+#Файл изменений: колонка change (inserted/updated/removed), затем те же колонки, что в обычном csv
+def write_changes_csv(changes: Iterable[ProgramChange], options: SaveOptions):
+    separator = options.separator
+    with open_output(options.output_path) as stream:
+        stream.write(format_changes_header(separator))
+        stream.write("".join(
+            f"\"{change.kind}\"{separator}{format_csv_line(change.program, separator)}"
+            for change in changes
+        ))
+
+
+#Расписание канала по состоянию на прошлый запуск:
+#python -m shared.delta -d ./delta -c dost_tv -a 2024-11-20T12:00:00+00:00 -o dost_tv.csv
+if (__name__ == "__main__"):
+    args_parser = ArgumentParser()
+    args_parser.add_argument("-d", "--delta", required=True)
+    args_parser.add_argument("-c", "--channel", required=True)
+    args_parser.add_argument("-a", "--as-of")
+    args_parser.add_argument("-o", "--output", default="./out.csv")
+    args_parser.add_argument("-sep", "--separator", default="\t")
+    args = args_parser.parse_args()
+
+    store = DeltaStore(args.delta)
+    if (args.as_of is None):
+        programs = store.load_latest(args.channel)
+    else:
+        programs = store.load_as_of(args.channel, datetime.fromisoformat(args.as_of))
+
+    if (programs is None):
+        raise SystemExit(f"No versions of {args.channel} in {args.delta}")
+
+    write_csv(programs, SaveOptions(args.output, args.separator))
@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Union
+
+#Общий на процесс пул процессов для разбора страниц (CPU-bound часть парсеров).
+#Создается лениво при первом обращении, размер задается --parse-workers
+__process_pool: Union[ProcessPoolExecutor, None] = None
+__process_pool_workers = 0
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    global __process_pool, __process_pool_workers
+
+    if (__process_pool is None or __process_pool_workers != workers):
+        if (__process_pool is not None):
+            __process_pool.shutdown(wait=False)
+        __process_pool = ProcessPoolExecutor(max_workers=workers)
+        __process_pool_workers = workers
+
+    return __process_pool
+
+def shutdown_process_pool():
+    global __process_pool, __process_pool_workers
+
+    if (__process_pool is not None):
+        __process_pool.shutdown()
+    __process_pool = None
+    __process_pool_workers = 0
+
+#Имя, под которым метод доступен через getattr, с учетом name mangling (__parse_html -> _Parser__parse_html).
+#Связанный метод с приватным именем нельзя передать в пул как есть: pickle ищет его по __name__ без mangling
+def __get_method_name(method: Callable[..., Any]) -> str:
+    name = method.__func__.__name__
+    if (name.startswith("__") and not name.endswith("__")):
+        class_name = method.__func__.__qualname__.rsplit(".", 1)[0].lstrip("_")
+        name = f"_{class_name}{name}"
+    return name
+
+def __call_method(instance: Any, method_name: str, *args) -> Any:
+    return getattr(instance, method_name)(*args)
+
+#Выполняет связанный метод method(*args) в пуле процессов.
+#Экземпляр, которому принадлежит метод, передается в процесс через pickle
+async def run_method_in_process_pool_async(
+    pool: ProcessPoolExecutor,
+    method: Callable[..., Any],
+    *args
+) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        pool,
+        __call_method,
+        method.__self__,
+        __get_method_name(method),
+        *args
+    )
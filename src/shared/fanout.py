@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable, TypeVar, Union
+
+from .options import ParserOptions
+from .models import TvProgramData
+from .utils import fill_finish_date_by_next_start_date
+
+T = TypeVar("T")
+
+#Дни с first по last включительно, с шагом в сутки
+def get_days(first: datetime, last: datetime) -> list[datetime]:
+    days = []
+    current_day = first
+    while (current_day <= last):
+        days.append(current_day)
+        current_day += timedelta(days=1)
+    return days
+
+#Дни из --start-date/--finish-date; если дата не задана, от default_start и default_days дней
+def get_option_days(options: ParserOptions, default_start: datetime, default_days: int = 7) -> list[datetime]:
+    first = options.start_date if options.start_date is not None else default_start
+    last = options.finish_date if options.finish_date is not None else first + timedelta(days=default_days)
+    return get_days(first, last)
+
+#Разбирает дни конкурентно, не более options.day_concurrency одновременно.
+#parse_day(day) - загрузка и разбор одного дня (день передается тот же, что в days).
+#Результаты склеиваются в порядке days, а не в порядке завершения,
+#после чего один раз заполняется дата окончания программ
+async def fan_out_days_async(
+    options: ParserOptions,
+    days: Iterable[T],
+    parse_day: Callable[[T], Awaitable[list[TvProgramData]]],
+    remove_last: bool = False
+) -> list[TvProgramData]:
+    semaphore = asyncio.Semaphore(max(1, options.day_concurrency))
+
+    async def parse_day_bounded_async(day: T) -> list[TvProgramData]:
+        async with semaphore:
+            return await parse_day(day)
+
+    days_programs = await asyncio.gather(*[
+        parse_day_bounded_async(day) for day in days
+    ])
+
+    programs = [
+        program
+        for day_programs in days_programs
+            for program in day_programs
+    ]
+
+    fill_finish_date_by_next_start_date(programs, remove_last)
+
+    return programs
@@ -0,0 +1,164 @@
+import asyncio
+import random
+from collections import deque
+from typing import Awaitable, Callable, TypeVar, Union
+import aiohttp
+
+T = TypeVar("T")
+
+#Статусы, на которые запрос повторяется: источник перегружен или временно недоступен
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+#Источник ответил статусом из RETRY_STATUSES, а попытки закончились
+class HttpStatusError(Exception):
+    status: int
+    url: str
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+#Политика запросов к источнику: таймауты, повторы с задержкой, дублирующие (hedged) запросы.
+#Задается парсером через атрибут класса TvParser.fetch_policy
+class FetchPolicy:
+    #секунд на установку соединения
+    connect_timeout: float
+    #секунд между пакетами ответа
+    read_timeout: float
+    #секунд на одну попытку целиком
+    total_timeout: float
+    #число повторов после первой попытки
+    retries: int
+    #задержка перед повтором - случайная в [0, min(backoff_max, backoff_base * 2^номер повтора)]
+    backoff_base: float
+    backoff_max: float
+    #повторять POST (только если запрос к источнику ничего не меняет)
+    retry_post: bool
+    #перцентиль времени ответа хоста, после которого GET дублируется, None - без дублирования
+    hedge_percentile: Union[float, None]
+    #минимальная задержка перед дублирующим запросом в секундах
+    hedge_min_delay: float
+    #сколько ответов хоста нужно замерить, прежде чем задержка берется из перцентиля.
+    #Замеры живут в HttpClient одного процесса: разовый запуск (cron) делает по хосту единицы запросов,
+    #и набирает их только режим daemon
+    hedge_min_samples: int
+    #задержка перед дублирующим запросом, пока замеров меньше hedge_min_samples, None - до этого не дублировать
+    hedge_initial_delay: Union[float, None]
+
+    def __init__(
+        self,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        total_timeout: float = 60,
+        retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8,
+        retry_post: bool = False,
+        hedge_percentile: Union[float, None] = None,
+        hedge_min_delay: float = 0.2,
+        hedge_min_samples: int = 10,
+        hedge_initial_delay: Union[float, None] = None
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_post = retry_post
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_initial_delay = hedge_initial_delay
+
+    def get_timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout
+        )
+
+    def get_backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** retry))
+
+
+#Политика по умолчанию для парсеров, которые не задали свою
+DEFAULT_FETCH_POLICY = FetchPolicy()
+
+
+#Время ответа последних запросов к каждому хосту
+class LatencyTracker:
+    window: int
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.__samples: dict[str, deque[float]] = {}
+
+    def add(self, host: str, elapsed: float):
+        samples = self.__samples.get(host)
+        if (samples is None):
+            samples = deque(maxlen=self.window)
+            self.__samples[host] = samples
+        samples.append(elapsed)
+
+    def count(self, host: str) -> int:
+        return len(self.__samples.get(host, ()))
+
+    def percentile(self, host: str, percentile: float) -> Union[float, None]:
+        samples = self.__samples.get(host)
+        if (samples is None or len(samples) == 0):
+            return None
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, HttpStatusError))
+
+#Выполняет attempt по политике: повторы с задержкой на сетевых ошибках, таймаутах и RETRY_STATUSES,
+#а при hedge_delay - дублирующую попытку, если первая не завершилась за hedge_delay секунд.
+#Берется результат попытки, завершившейся успешно первой, вторая отменяется
+async def execute_with_policy_async(
+    policy: FetchPolicy,
+    attempt: Callable[[], Awaitable[T]],
+    can_retry: bool = True,
+    hedge_delay: Union[float, None] = None
+) -> T:
+    retries = policy.retries if can_retry else 0
+
+    for retry in range(retries + 1):
+        try:
+            if (hedge_delay is None):
+                return await attempt()
+            return await __hedge_async(attempt, hedge_delay)
+        except Exception as ex:
+            if (retry >= retries or not is_retryable_error(ex)):
+                raise
+
+        await asyncio.sleep(policy.get_backoff(retry))
+
+async def __hedge_async(attempt: Callable[[], Awaitable[T]], hedge_delay: float) -> T:
+    tasks = [asyncio.ensure_future(attempt())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if (len(done) > 0):
+            return tasks[0].result()
+
+        tasks.append(asyncio.ensure_future(attempt()))
+        pending = set(tasks)
+        error = None
+        while (len(pending) > 0):
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if (task.exception() is None):
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if (not task.done()):
+                task.cancel()
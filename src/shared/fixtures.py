@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Union
+
+from .options import HttpOptions
+from .http import HttpClient
+from .fetch_policy import FetchPolicy
+
+#Записанный ответ источника
+class Fixture:
+    method: str
+    url: str
+    #тело POST запроса, None - для GET
+    data: Union[str, None]
+    body: str
+    #время получения ответа при записи, в секундах
+    elapsed: float
+
+    def __init__(self, method: str, url: str, data: Union[str, None], body: str, elapsed: float = 0):
+        self.method = method
+        self.url = url
+        self.data = data
+        self.body = body
+        self.elapsed = elapsed
+
+    @property
+    def key(self) -> tuple[str, str, Union[str, None]]:
+        return (self.method, self.url, self.data)
+
+
+#Корпус записанных ответов одного канала.
+#directory/manifest.json - время записи и список запросов (метод, url, тело запроса, время ответа),
+#directory/<sha256>.body - тело ответа
+class FixtureStore:
+    directory: str
+    #момент записи (UTC), при воспроизведении "текущее время" парсера подменяется на него
+    recorded_at: Union[datetime, None]
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.recorded_at = None
+        self.__fixtures: dict[tuple, Fixture] = {}
+        self.__load_manifest()
+
+    @property
+    def fixtures(self) -> list[Fixture]:
+        return list(self.__fixtures.values())
+
+    def exists(self) -> bool:
+        return os.path.exists(self.__get_manifest_path())
+
+    def load(self, method: str, url: str, data: Union[str, None] = None) -> Union[Fixture, None]:
+        return self.__fixtures.get((method, url, data))
+
+    def add(self, fixture: Fixture):
+        self.__fixtures[fixture.key] = fixture
+
+    def save(self, recorded_at: Union[datetime, None] = None):
+        if (recorded_at is not None):
+            self.recorded_at = recorded_at
+        if (self.recorded_at is None):
+            self.recorded_at = datetime.now(timezone.utc)
+
+        os.makedirs(self.directory, exist_ok=True)
+        requests = []
+        for fixture in self.__fixtures.values():
+            body_file = self.__get_body_file(fixture.key)
+            with open(os.path.join(self.directory, body_file), "w", encoding="utf-8", newline="") as body_stream:
+                body_stream.write(fixture.body)
+            requests.append({
+                "method": fixture.method,
+                "url": fixture.url,
+                "data": fixture.data,
+                "elapsed": fixture.elapsed,
+                "body": body_file
+            })
+
+        with open(self.__get_manifest_path(), "w", encoding="utf-8") as manifest_stream:
+            json.dump({
+                "recorded_at": self.recorded_at.isoformat(),
+                "requests": requests
+            }, manifest_stream, ensure_ascii=False, indent=2)
+
+    def __load_manifest(self):
+        try:
+            with open(self.__get_manifest_path(), "r", encoding="utf-8") as manifest_stream:
+                manifest = json.load(manifest_stream)
+        except (OSError, ValueError):
+            return
+
+        self.recorded_at = datetime.fromisoformat(manifest["recorded_at"])
+        for request in manifest["requests"]:
+            with open(os.path.join(self.directory, request["body"]), "r", encoding="utf-8", newline="") as body_stream:
+                body = body_stream.read()
+            self.add(Fixture(
+                request["method"],
+                request["url"],
+                request["data"],
+                body,
+                request.get("elapsed", 0)
+            ))
+
+    def __get_manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    @staticmethod
+    def __get_body_file(key: tuple) -> str:
+        return hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest() + ".body"
+
+
+#Ответа на запрос нет в корпусе
+class FixtureMissingError(KeyError):
+    pass
+
+
+#HTTP клиент поверх корпуса записанных ответов.
+#С inner - запись: запросы уходят во внутренний клиент, ответы сохраняются в store.
+#Без inner - воспроизведение: ответы отдаются из памяти, без сети
+class FixtureHttpClient(HttpClient):
+    store: FixtureStore
+    inner: Union[HttpClient, None]
+
+    def __init__(self, store: FixtureStore, inner: Union[HttpClient, None] = None):
+        super().__init__(HttpOptions())
+        self.store = store
+        self.inner = inner
+
+    async def get_text(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        return await self.__request("GET", url, None, headers, policy)
+
+    async def get_json(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> Any:
+        return json.loads(await self.__request("GET", url, None, headers, policy))
+
+    async def post_text(
+        self,
+        url: str,
+        data: Any,
+        headers: Union[dict[str, str], None] = None,
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        return await self.__request("POST", url, str(data), headers, policy)
+
+    async def stream_text(
+        self,
+        url: str,
+        feed: Callable[[str], bool],
+        headers: Union[dict[str, str], None] = None,
+        chunk_size: int = 16 * 1024,
+        policy: Union[FetchPolicy, None] = None
+    ):
+        body = await self.__request("GET", url, None, headers, policy)
+        for start in range(0, len(body), chunk_size):
+            if (feed(body[start:start + chunk_size])):
+                return
+        feed("")
+
+    #внутренний клиент закрывает его владелец
+    async def close(self):
+        pass
+
+    async def __request(
+        self,
+        method: str,
+        url: str,
+        data: Union[str, None],
+        headers: Union[dict[str, str], None],
+        policy: Union[FetchPolicy, None]
+    ) -> str:
+        fixture = self.store.load(method, url, data)
+        if (fixture is not None):
+            return fixture.body
+
+        if (self.inner is None):
+            raise FixtureMissingError(f"No fixture for {method} {url}")
+
+        started = time.perf_counter()
+        if (method == "POST"):
+            body = await self.inner.post_text(url, data, headers, policy)
+        else:
+            body = await self.inner.get_text(url, headers, policy=policy)
+        self.store.add(Fixture(method, url, data, body, time.perf_counter() - started))
+        return body
@@ -0,0 +1,21 @@
+from typing import Union
+from bs4 import BeautifulSoup, FeatureNotFound
+
+#Доступные построители дерева для BeautifulSoup.
+#Все парсеры обходят дерево через API bs4 (find, find_all, .next, .children),
+#поэтому бэкенд - это построитель дерева bs4, а не отдельная библиотека со своим API.
+#html.parser - чистый python, lxml - C-расширение (pip install lxml), в разы быстрее на больших страницах
+HTML_BACKENDS = ["html.parser", "lxml", "html5lib"]
+DEFAULT_HTML_BACKEND = "html.parser"
+
+def parse_html(html_text: str, backend: Union[str, None] = None) -> BeautifulSoup:
+    if (backend is None):
+        backend = DEFAULT_HTML_BACKEND
+
+    if (backend not in HTML_BACKENDS):
+        raise ValueError(f"Unknown html backend: {backend}, expected one of {', '.join(HTML_BACKENDS)}")
+
+    try:
+        return BeautifulSoup(html_text, backend)
+    except FeatureNotFound:
+        raise ValueError(f"Html backend {backend} is not installed")
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Union
+
+from .html import DEFAULT_HTML_BACKEND
+from .http import HttpClient, RecordingHttpClient
+from .models import TvParser, TvProgramData
+from .utils import format_date
+
+#Результат сверки двух построителей дерева на одном канале
+class HtmlBackendReport:
+    channel: str
+    #время разбора (parse_async без сети) для каждого бэкенда, в секундах
+    elapsed: dict[str, float]
+    #расхождения в результатах, пустой список - результаты совпали
+    differences: list[str]
+
+    def __init__(self, channel: str, elapsed: dict[str, float], differences: list[str]):
+        self.channel = channel
+        self.elapsed = elapsed
+        self.differences = differences
+
+    @property
+    def is_equal(self) -> bool:
+        return len(self.differences) == 0
+
+
+def __program_fields(program: TvProgramData) -> tuple:
+    return (
+        format_date(program.datetime_start),
+        format_date(program.datetime_finish),
+        program.channel,
+        program.title,
+        program.channel_logo_url,
+        program.description,
+        int(program.available_archive)
+    )
+
+#Сравнивает списки программ поле за полем, возвращает описание расхождений
+def diff_programs(
+    expected: list[TvProgramData],
+    actual: list[TvProgramData],
+    max_differences: int = 20
+) -> list[str]:
+    differences = []
+    if (len(expected) != len(actual)):
+        differences.append(f"programs count: {len(expected)} != {len(actual)}")
+
+    for index, (expected_program, actual_program) in enumerate(zip(expected, actual)):
+        expected_fields = __program_fields(expected_program)
+        actual_fields = __program_fields(actual_program)
+        if (expected_fields != actual_fields):
+            differences.append(f"program #{index}: {expected_fields!r} != {actual_fields!r}")
+        if (len(differences) >= max_differences):
+            break
+
+    return differences
+
+async def __parse_with_backend_async(
+    parser_class: type[TvParser],
+    parser: TvParser,
+    http_client: HttpClient,
+    backend: str
+) -> tuple[list[TvProgramData], float]:
+    #отдельный экземпляр на каждый прогон, без кеша снимков и общих результатов разбора - иначе DOM вообще не строится
+    parser = parser_class(parser.options, http_client)
+    parser.snapshot_cache = None
+    http_client.shared_parses.clear()
+    parser.html_backend = backend
+
+    started = time.perf_counter()
+    programs = await parser.parse_async()
+    return (programs, time.perf_counter() - started)
+
+#Прогоняет парсер с backend и с candidate_backend на одних и тех же ответах источника
+#(первый прогон загружает страницы, замеры делаются повторными прогонами из памяти)
+#и сравнивает итоговые списки программ
+async def verify_html_backends_async(
+    channel: str,
+    parser: TvParser,
+    candidate_backend: str,
+    backend: Union[str, None] = None
+) -> HtmlBackendReport:
+    if (backend is None):
+        backend = parser.html_backend or parser.options.html_backend or DEFAULT_HTML_BACKEND
+
+    parser_class = type(parser)
+    http_client = RecordingHttpClient(parser.http_client)
+    try:
+        await __parse_with_backend_async(parser_class, parser, http_client, backend)
+
+        expected, expected_elapsed = await __parse_with_backend_async(parser_class, parser, http_client, backend)
+        actual, actual_elapsed = await __parse_with_backend_async(parser_class, parser, http_client, candidate_backend)
+    except Exception as ex:
+        return HtmlBackendReport(channel, {}, [f"error: {ex!r}"])
+
+    return HtmlBackendReport(
+        channel,
+        {backend: expected_elapsed, candidate_backend: actual_elapsed},
+        diff_programs(expected, actual)
+    )
+
+def format_html_backend_reports(reports: list[HtmlBackendReport]) -> str:
+    lines = []
+    for report in reports:
+        timings = ", ".join(
+            f"{backend} {elapsed:.3f}s"
+            for backend, elapsed in report.elapsed.items()
+        )
+        status = "equal" if report.is_equal else f"{len(report.differences)} differences"
+        lines.append(f"{report.channel}\t{timings}\t{status}")
+        for difference in report.differences:
+            lines.append(f"    {difference}")
+
+    return "\n".join(lines)
+
+async def __verify_all_async(
+    parsers: dict[str, TvParser],
+    candidate_backend: str,
+    http_client: HttpClient
+) -> list[HtmlBackendReport]:
+    async with http_client:
+        return await asyncio.gather(*[
+            verify_html_backends_async(channel, parser, candidate_backend)
+            for channel, parser in parsers.items()
+        ])
+
+def verify_html_backends(
+    parsers: dict[str, TvParser],
+    candidate_backend: str,
+    http_client: HttpClient
+) -> list[HtmlBackendReport]:
+    return asyncio.run(
+        __verify_all_async(parsers, candidate_backend, http_client)
+    )
@@ -0,0 +1,328 @@
+import asyncio
+import codecs
+import json
+import ssl
+import time
+from datetime import timedelta
+from typing import Any, Callable, Mapping, Union
+import aiohttp
+from yarl import URL
+
+from .options import HttpOptions
+from .http_cache import CacheEntry, HttpCache
+from .fetch_policy import (
+    DEFAULT_FETCH_POLICY,
+    RETRY_STATUSES,
+    FetchPolicy,
+    HttpStatusError,
+    LatencyTracker,
+    execute_with_policy_async
+)
+
+#Общий HTTP клиент для всех парсеров.
+#Один TCPConnector на процесс: keep-alive соединения переиспользуются между страницами и каналами,
+#число соединений к одному хосту ограничено (пачки asyncio.gather по дням не открывают по соединению на запрос),
+#DNS ответы кешируются, а SSLContext (с загруженными сертификатами) создается один раз.
+#Сессия создается лениво, внутри запущенного event loop.
+#Если задан options.cache_dir, GET ответы кешируются на диске (см. get_text).
+#Одинаковые GET, отправленные одновременно (несколько каналов с одной страницы в одном запуске),
+#объединяются в один запрос, его ответ получают все
+class HttpClient:
+    options: HttpOptions
+    cache: Union[HttpCache, None]
+    #время ответа хостов, по нему выбирается задержка дублирующих запросов
+    latency: LatencyTracker
+    #результаты TvParser.parse_shared парсеров с этим клиентом: (parse, url, построитель) -> (аргументы, хеш тела, результат).
+    #Живут столько же, сколько клиент (один запуск или демон), на каждый ключ хранится только последний разбор
+    shared_parses: dict[tuple, tuple[tuple, str, Any]]
+
+    def __init__(self, options: Union[HttpOptions, None] = None):
+        self.options = options if options is not None else HttpOptions()
+        self.cache = None
+        if (self.options.cache_dir is not None):
+            self.cache = HttpCache(self.options.cache_dir)
+
+        self.__session = None
+        self.__ssl_context = None
+        self.__replay_server = None
+        self.__replay_lock = asyncio.Lock()
+        self.__pending_gets: dict[tuple, asyncio.Future] = {}
+        self.latency = LatencyTracker()
+        self.shared_parses = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if (self.__session is None or self.__session.closed):
+            if (self.__ssl_context is None):
+                self.__ssl_context = ssl.create_default_context()
+
+            connector = aiohttp.TCPConnector(
+                limit=self.options.limit,
+                limit_per_host=self.options.limit_per_host,
+                keepalive_timeout=self.options.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.options.dns_cache_ttl,
+                ssl=self.__ssl_context
+            )
+            self.__session = aiohttp.ClientSession(connector=connector)
+
+        return self.__session
+
+    #cache_ttl - в течение этого времени после получения ответ отдается из кеша без запроса,
+    #позже отправляется условный GET (If-None-Match/If-Modified-Since) и на 304 отдается закешированное тело.
+    #policy - таймауты, повторы и дублирующие запросы (shared/fetch_policy.py), None - политика по умолчанию
+    async def get_text(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        key = (url, tuple(sorted((headers or {}).items())))
+        pending = self.__pending_gets.get(key)
+        if (pending is None):
+            pending = asyncio.ensure_future(self.__get_text_async(url, headers, cache_ttl, policy))
+            self.__pending_gets[key] = pending
+            #после ответа запрос снова уходит в сеть (или в дисковый кеш)
+            pending.add_done_callback(lambda _: self.__pending_gets.pop(key, None))
+
+        #отмена одного из ожидающих не отменяет запрос для остальных
+        return await asyncio.shield(pending)
+
+    async def __get_text_async(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None],
+        cache_ttl: timedelta,
+        policy: Union[FetchPolicy, None]
+    ) -> str:
+        if (self.cache is None):
+            _, body, _ = await self.__request_async("GET", url, headers, None, policy)
+            return body
+
+        entry = await asyncio.to_thread(self.cache.load, url)
+        if (entry is not None and entry.is_fresh(cache_ttl)):
+            return entry.body
+
+        request_headers = headers
+        if (entry is not None):
+            request_headers = {**(headers or {}), **entry.get_conditional_headers()}
+
+        status, body, response_headers = await self.__request_async("GET", url, request_headers, None, policy)
+        if (status == 304 and entry is not None):
+            await asyncio.to_thread(self.cache.touch, entry)
+            return entry.body
+
+        if (status == 200):
+            await asyncio.to_thread(self.cache.store, CacheEntry(
+                url,
+                body,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+                time.time()
+            ))
+        return body
+
+    async def get_json(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> Any:
+        return json.loads(await self.get_text(url, headers, cache_ttl, policy))
+
+    async def post_text(
+        self,
+        url: str,
+        data: Any,
+        headers: Union[dict[str, str], None] = None,
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        _, body, _ = await self.__request_async("POST", url, headers, data, policy)
+        return body
+
+    #Отдает тело ответа в feed кусками по мере загрузки, не дожидаясь конца ответа.
+    #Если feed вернул True, соединение закрывается, а остаток тела не загружается.
+    #Дисковый кеш не используется - тело целиком может так и не быть получено.
+    #Из политики применяются только таймауты: часть тела уже могла уйти в feed, повторять нельзя
+    async def stream_text(
+        self,
+        url: str,
+        feed: Callable[[str], bool],
+        headers: Union[dict[str, str], None] = None,
+        chunk_size: int = 16 * 1024,
+        policy: Union[FetchPolicy, None] = None
+    ):
+        policy = policy or DEFAULT_FETCH_POLICY
+        request_url, request_headers = await self.__route_async(url, headers)
+        async with self.get_session().get(request_url, headers=request_headers, timeout=policy.get_timeout()) as resp:
+            decoder = codecs.getincrementaldecoder(self.__get_stream_encoding(resp))(errors="replace")
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if (feed(decoder.decode(chunk))):
+                    resp.close()
+                    return
+            feed(decoder.decode(b"", final=True))
+
+    #resp.get_encoding() без charset в Content-Type угадывает кодировку по телу и до чтения тела падает,
+    #поэтому берется объявленная кодировка, а без нее (или с неизвестной) - utf-8
+    @staticmethod
+    def __get_stream_encoding(resp: aiohttp.ClientResponse) -> str:
+        encoding = resp.charset
+        if (encoding is None):
+            return "utf-8"
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            return "utf-8"
+
+    #Один запрос по политике: каждая попытка с таймаутами, статусы RETRY_STATUSES и сетевые ошибки повторяются
+    #(POST - только при policy.retry_post), GET дублируется, если хост отвечает дольше перцентиля policy.hedge_percentile.
+    #Возвращает статус, тело и заголовки ответа
+    async def __request_async(
+        self,
+        method: str,
+        url: str,
+        headers: Union[dict[str, str], None],
+        data: Any,
+        policy: Union[FetchPolicy, None]
+    ) -> tuple[int, str, Mapping[str, str]]:
+        policy = policy or DEFAULT_FETCH_POLICY
+        host = URL(url).host or ""
+        request_url, request_headers = await self.__route_async(url, headers)
+
+        async def attempt_async() -> tuple[int, str, Mapping[str, str]]:
+            started = time.perf_counter()
+            async with self.get_session().request(
+                method,
+                request_url,
+                headers=request_headers,
+                data=data,
+                timeout=policy.get_timeout()
+            ) as resp:
+                body = await resp.text()
+                if (resp.status in RETRY_STATUSES):
+                    raise HttpStatusError(resp.status, url)
+
+                self.latency.add(host, time.perf_counter() - started)
+                return (resp.status, body, resp.headers)
+
+        is_get = method == "GET"
+        return await execute_with_policy_async(
+            policy,
+            attempt_async,
+            is_get or policy.retry_post,
+            self.__get_hedge_delay(policy, host) if is_get else None
+        )
+
+    #Пока замеров по хосту мало (разовый запуск), задержка постоянная - policy.hedge_initial_delay,
+    #перцентиль используется, когда замеры накопились (режим daemon)
+    def __get_hedge_delay(self, policy: FetchPolicy, host: str) -> Union[float, None]:
+        if (policy.hedge_percentile is None):
+            return None
+        if (self.latency.count(host) < policy.hedge_min_samples):
+            return policy.hedge_initial_delay
+
+        return max(policy.hedge_min_delay, self.latency.percentile(host, policy.hedge_percentile))
+
+    async def close(self):
+        if (self.__session is not None and not self.__session.closed):
+            await self.__session.close()
+        self.__session = None
+
+        if (self.__replay_server is not None):
+            await self.__replay_server.close()
+        self.__replay_server = None
+
+    #При options.replay_dir запрос уходит на локальный сервер воспроизведения, запускаемый при первом запросе,
+    #а исходный origin передается в заголовке. Ключ дискового кеша остается исходным url
+    async def __route_async(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None]
+    ) -> tuple[str, Union[dict[str, str], None]]:
+        if (self.options.replay_dir is None):
+            return (url, headers)
+
+        #shared.replay импортирует shared.fixtures, который сам импортирует этот модуль
+        from .replay import REPLAY_ORIGIN_HEADER, ReplayServer, rewrite_url
+
+        async with self.__replay_lock:
+            if (self.__replay_server is None):
+                self.__replay_server = ReplayServer(self.options.replay_dir, self.options.replay_latency)
+                await self.__replay_server.start_async()
+
+        replay_url, origin = rewrite_url(url, self.__replay_server.url)
+        return (replay_url, {**(headers or {}), REPLAY_ORIGIN_HEADER: origin})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+#Запоминает ответы в памяти: первый запрос уходит во внутренний клиент,
+#повторные с теми же параметрами отдаются из памяти без сети.
+#Нужен, чтобы прогнать парсер несколько раз на одних и тех же данных (см. shared/html_verify.py)
+class RecordingHttpClient(HttpClient):
+    inner: HttpClient
+    responses: dict[tuple, Any]
+
+    def __init__(self, inner: HttpClient):
+        super().__init__(HttpOptions())
+        self.inner = inner
+        self.responses = {}
+
+    async def get_text(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        key = ("GET", url, None)
+        if (key not in self.responses):
+            self.responses[key] = await self.inner.get_text(url, headers, cache_ttl, policy)
+        return self.responses[key]
+
+    async def get_json(
+        self,
+        url: str,
+        headers: Union[dict[str, str], None] = None,
+        cache_ttl: timedelta = timedelta(0),
+        policy: Union[FetchPolicy, None] = None
+    ) -> Any:
+        key = ("GET json", url, None)
+        if (key not in self.responses):
+            self.responses[key] = await self.inner.get_json(url, headers, cache_ttl, policy)
+        return self.responses[key]
+
+    async def post_text(
+        self,
+        url: str,
+        data: Any,
+        headers: Union[dict[str, str], None] = None,
+        policy: Union[FetchPolicy, None] = None
+    ) -> str:
+        key = ("POST", url, str(data))
+        if (key not in self.responses):
+            self.responses[key] = await self.inner.post_text(url, data, headers, policy)
+        return self.responses[key]
+
+    async def stream_text(
+        self,
+        url: str,
+        feed: Callable[[str], bool],
+        headers: Union[dict[str, str], None] = None,
+        chunk_size: int = 16 * 1024,
+        policy: Union[FetchPolicy, None] = None
+    ):
+        body = await self.get_text(url, headers, policy=policy)
+        for start in range(0, len(body), chunk_size):
+            if (feed(body[start:start + chunk_size])):
+                return
+        feed("")
+
+    #внутренний клиент закрывает его владелец
+    async def close(self):
+        pass
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import time
+from datetime import timedelta
+from typing import Union
+
+#Закешированный ответ источника вместе с валидаторами для условного GET
+class CacheEntry:
+    url: str
+    body: str
+    etag: Union[str, None]
+    last_modified: Union[str, None]
+    #unix time последнего получения (или подтверждения 304) ответа
+    stored_at: float
+
+    def __init__(
+        self,
+        url: str,
+        body: str,
+        etag: Union[str, None],
+        last_modified: Union[str, None],
+        stored_at: float
+    ):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl: timedelta) -> bool:
+        return time.time() - self.stored_at < ttl.total_seconds()
+
+    def get_conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if (self.etag is not None):
+            headers["If-None-Match"] = self.etag
+        if (self.last_modified is not None):
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+#Постоянный кеш GET ответов на диске.
+#На каждый URL два файла: <sha256>.json с метаданными и <sha256>.body с телом ответа
+class HttpCache:
+    directory: str
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, url: str) -> Union[CacheEntry, None]:
+        meta_path, body_path = self.__get_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, "r", encoding="utf-8", newline="") as body_file:
+                body = body_file.read()
+        except (OSError, ValueError):
+            return None
+
+        if (meta.get("url") != url):
+            return None
+
+        return CacheEntry(
+            url,
+            body,
+            meta.get("etag"),
+            meta.get("last_modified"),
+            meta.get("stored_at", 0)
+        )
+
+    def store(self, entry: CacheEntry):
+        meta_path, body_path = self.__get_paths(entry.url)
+        self.__write_atomic(body_path, entry.body)
+        self.__write_meta(meta_path, entry)
+
+    #Источник ответил 304 - тело прежнее, обновляется только время получения
+    def touch(self, entry: CacheEntry):
+        entry.stored_at = time.time()
+        meta_path, _ = self.__get_paths(entry.url)
+        self.__write_meta(meta_path, entry)
+
+    def __write_meta(self, meta_path: str, entry: CacheEntry):
+        self.__write_atomic(meta_path, json.dumps({
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "stored_at": entry.stored_at
+        }))
+
+    def __get_paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base_path = os.path.join(self.directory, key)
+        return (base_path + ".json", base_path + ".body")
+
+    @staticmethod
+    def __write_atomic(path: str, content: str):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8", newline="") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
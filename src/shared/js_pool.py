@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Union
+
+#Пул прогретых контекстов V8 (py_mini_racer) для парсеров, которые исполняют js источника.
+#Каждый поток пула держит свой контекст: создание MiniRacer (запуск изолята V8) оплачивается один раз на поток,
+#а не на каждый разбор. Контекст пересоздается после max_uses исполнений, чтобы не копилась память
+#и глобальное состояние скриптов источника.
+#Результат возвращается как JSON и разбирается в потоке пула: прокси-объекты V8 не выходят за пределы потока
+class JsContextPool:
+    size: int
+    max_uses: int
+    #секунд на одно исполнение
+    timeout: float
+
+    def __init__(self, size: int = 1, max_uses: int = 100, timeout: float = 10):
+        self.size = size
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.__local = threading.local()
+        self.__executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="js-context")
+
+    #code должен возвращать строку JSON (например, заканчиваться JSON.stringify(...))
+    def eval_json(self, code: str) -> Any:
+        return self.__executor.submit(self.__eval_json, code).result()
+
+    async def eval_json_async(self, code: str) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, self.__eval_json, code)
+
+    #Создает контексты во всех потоках пула заранее
+    def warm(self):
+        self.__run_in_each_thread(self.__get_context)
+
+    def close(self):
+        self.__run_in_each_thread(self.__close_context)
+        self.__executor.shutdown()
+
+    def __run_in_each_thread(self, action):
+        barrier = threading.Barrier(self.size)
+
+        def run():
+            action()
+            #каждая задача ждет остальные, чтобы все они попали в разные потоки
+            barrier.wait()
+
+        futures = [self.__executor.submit(run) for _ in range(self.size)]
+        for future in futures:
+            future.result()
+
+    def __eval_json(self, code: str) -> Any:
+        context = self.__get_context()
+        self.__local.uses += 1
+        return json.loads(context.eval(code, timeout_sec=self.timeout))
+
+    def __get_context(self):
+        context = getattr(self.__local, "context", None)
+        if (context is not None and self.__local.uses >= self.max_uses):
+            self.__close_context()
+            context = None
+
+        if (context is None):
+            #mini-racer нужен только парсерам с js, поэтому импортируется при первом исполнении
+            from py_mini_racer import MiniRacer
+            context = MiniRacer()
+            self.__local.context = context
+            self.__local.uses = 0
+
+        return context
+
+    def __close_context(self):
+        context = getattr(self.__local, "context", None)
+        if (context is not None):
+            context.close()
+        self.__local.context = None
+
+
+#Общий на процесс пул контекстов, создается и прогревается при первом обращении;
+#режим daemon прогревает его при старте (warm_js_pool для каналов с extra_requirements mini-racer).
+#Живет до конца процесса: в режиме daemon контексты переиспользуются между обновлениями
+__js_pool: Union[JsContextPool, None] = None
+__js_pool_lock = threading.Lock()
+
+#Есть ли уже прогретый пул: разовый запуск без него не платит за запуск V8
+def is_js_pool_warm() -> bool:
+    return __js_pool is not None
+
+#Прогревает общий пул, если он нужен хотя бы одному из парсеров (ParserInfo.extra_requirements)
+def warm_js_pool(extra_requirements: Iterable[Iterable[str]]):
+    if (any("mini-racer" in requirements for requirements in extra_requirements)):
+        get_js_pool()
+
+def get_js_pool() -> JsContextPool:
+    global __js_pool
+
+    with __js_pool_lock:
+        if (__js_pool is None):
+            __js_pool = JsContextPool()
+            __js_pool.warm()
+        return __js_pool
@@ -1,8 +1,28 @@
-from datetime import datetime
-from typing import Union
+from array import array
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone, tzinfo
+from sys import intern
+from typing import Any, Callable, Iterable, Iterator, Union
 from .options import ParserOptions
+from .http import HttpClient
+from .snapshots import SnapshotCache
+from .html import parse_html
+from .streaming import StreamNode, StreamingRowExtractor
+from .executor import get_process_pool, run_method_in_process_pool_async
+from .fetch_policy import DEFAULT_FETCH_POLICY, FetchPolicy
 
 class TvProgramData:
+    #без __dict__ у каждого экземпляра: программ в одном процессе бывают сотни тысяч
+    __slots__ = (
+        "datetime_start",
+        "datetime_finish",
+        "channel",
+        "title",
+        "channel_logo_url",
+        "description",
+        "available_archive"
+    )
+
     #формате YYYY-mm-ddThh:mm:ss+tz:tz (пример - 2024-07-22T16:27:01+00:00)
     datetime_start: datetime
     #формате YYYY-mm-ddThh:mm:ss+tz:tz (пример - 2024-07-22T16:27:01+00:00)
@@ -30,20 +50,248 @@ class TvProgramData:
     ):
         self.datetime_start = datetime_start
         self.datetime_finish = datetime_finish
-        self.channel = channel
-        self.title = title
+        #название канала и повторяющиеся названия передач хранятся в одном экземпляре
+        self.channel = self.__intern(channel)
+        self.title = self.__intern(title)
 
-        self.channel_logo_url = channel_logo_url
+        self.channel_logo_url = self.__intern(channel_logo_url)
         self.description = description
         self.available_archive = available_archive
 
+    #bs4 отдает NavigableString, который держит ссылку на все дерево документа,
+    #поэтому строка приводится к str и только потом интернируется
+    @staticmethod
+    def __intern(string: Union[str, None]) -> Union[str, None]:
+        if (string is None):
+            return None
+        return intern(str(string))
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    #снимки, сохраненные до появления __slots__, содержат __dict__
+    def __setstate__(self, state):
+        if (isinstance(state, dict)):
+            state = tuple(state.get(name) for name in self.__slots__)
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+#Колоночное хранилище программ для больших наборов (несколько каналов за несколько недель в одном процессе).
+#Даты хранятся как целые микросекунды от эпохи в array, строки - индексами в общей таблице строк,
+#временные зоны - индексами в таблице зон. Элементы отдаются как новые TvProgramData,
+#поэтому изменение полученного объекта не меняет хранилище - для этого есть __setitem__
+class TvProgramList:
+    __EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    __NAIVE_EPOCH = datetime(1970, 1, 1)
+    __MICROSECOND = timedelta(microseconds=1)
+    #индекс зоны для отсутствующей даты (datetime_finish = None)
+    __NO_DATE = -1
+
+    def __init__(self, programs: Iterable[TvProgramData] = ()):
+        #[0] - None
+        self.__strings: list[Union[str, None]] = [None]
+        self.__string_indexes: dict[str, int] = {}
+        self.__zones: list[Union[tzinfo, None]] = []
+        self.__zone_indexes: dict[Union[tzinfo, None], int] = {}
+
+        self.__starts = array("q")
+        self.__start_zones = array("h")
+        self.__finishes = array("q")
+        self.__finish_zones = array("h")
+        self.__channels = array("I")
+        self.__titles = array("I")
+        self.__logo_urls = array("I")
+        self.__descriptions = array("I")
+        self.__archives = bytearray()
+
+        self.extend(programs)
+
+    def append(self, program: TvProgramData):
+        start, start_zone = self.__encode_date(program.datetime_start)
+        finish, finish_zone = self.__encode_date(program.datetime_finish)
+        self.__starts.append(start)
+        self.__start_zones.append(start_zone)
+        self.__finishes.append(finish)
+        self.__finish_zones.append(finish_zone)
+        self.__channels.append(self.__encode_string(program.channel))
+        self.__titles.append(self.__encode_string(program.title))
+        self.__logo_urls.append(self.__encode_string(program.channel_logo_url))
+        self.__descriptions.append(self.__encode_string(program.description))
+        self.__archives.append(1 if program.available_archive else 0)
+
+    def extend(self, programs: Iterable[TvProgramData]):
+        for program in programs:
+            self.append(program)
+
+    def pop(self, index: int = -1) -> TvProgramData:
+        program = self[index]
+        for column in self.__get_columns():
+            del column[index]
+        return program
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __iter__(self) -> Iterator[TvProgramData]:
+        for index in range(len(self)):
+            yield self.__decode(index)
+
+    def __getitem__(self, index: int) -> TvProgramData:
+        if (index < 0):
+            index += len(self)
+        if (index < 0 or index >= len(self)):
+            raise IndexError("TvProgramList index out of range")
+        return self.__decode(index)
+
+    def __setitem__(self, index: int, program: TvProgramData):
+        start, start_zone = self.__encode_date(program.datetime_start)
+        finish, finish_zone = self.__encode_date(program.datetime_finish)
+        self.__starts[index] = start
+        self.__start_zones[index] = start_zone
+        self.__finishes[index] = finish
+        self.__finish_zones[index] = finish_zone
+        self.__channels[index] = self.__encode_string(program.channel)
+        self.__titles[index] = self.__encode_string(program.title)
+        self.__logo_urls[index] = self.__encode_string(program.channel_logo_url)
+        self.__descriptions[index] = self.__encode_string(program.description)
+        self.__archives[index] = 1 if program.available_archive else 0
+
+    #Аналог shared.utils.fill_finish_date_by_next_start_date без создания объектов программ
+    def fill_finish_date_by_next_start_date(self, remove_last = False):
+        if (len(self) == 0):
+            return
+
+        self.__finishes[:-1] = self.__starts[1:]
+        self.__finish_zones[:-1] = self.__start_zones[1:]
+
+        if (remove_last):
+            self.pop()
+            return
+
+        last_start = self.__decode_date(self.__starts[-1], self.__start_zones[-1])
+        self.__finishes[-1], self.__finish_zones[-1] = self.__encode_date(
+            last_start.replace(hour=23, minute=59)
+        )
+
+    def __get_columns(self) -> list:
+        return [
+            self.__starts, self.__start_zones, self.__finishes, self.__finish_zones,
+            self.__channels, self.__titles, self.__logo_urls, self.__descriptions, self.__archives
+        ]
+
+    def __encode_string(self, string: Union[str, None]) -> int:
+        if (string is None):
+            return 0
+
+        index = self.__string_indexes.get(string)
+        if (index is None):
+            index = len(self.__strings)
+            self.__strings.append(string)
+            self.__string_indexes[string] = index
+        return index
+
+    def __encode_date(self, date: Union[datetime, None]) -> tuple[int, int]:
+        if (date is None):
+            return (0, self.__NO_DATE)
+
+        zone = date.tzinfo
+        zone_index = self.__zone_indexes.get(zone)
+        if (zone_index is None):
+            zone_index = len(self.__zones)
+            self.__zones.append(zone)
+            self.__zone_indexes[zone] = zone_index
+
+        epoch = self.__NAIVE_EPOCH if zone is None else self.__EPOCH
+        return ((date - epoch) // self.__MICROSECOND, zone_index)
+
+    def __decode_date(self, value: int, zone_index: int) -> Union[datetime, None]:
+        if (zone_index == self.__NO_DATE):
+            return None
+
+        zone = self.__zones[zone_index]
+        if (zone is None):
+            return self.__NAIVE_EPOCH + timedelta(microseconds=value)
+        return (self.__EPOCH + timedelta(microseconds=value)).astimezone(zone)
+
+    def __decode(self, index: int) -> TvProgramData:
+        strings = self.__strings
+        return TvProgramData(
+            self.__decode_date(self.__starts[index], self.__start_zones[index]),
+            self.__decode_date(self.__finishes[index], self.__finish_zones[index]),
+            strings[self.__channels[index]],
+            strings[self.__titles[index]],
+            strings[self.__logo_urls[index]],
+            strings[self.__descriptions[index]],
+            bool(self.__archives[index])
+        )
+
 class TvParser:    
     options: ParserOptions
+    #общий HTTP клиент, внедряется раннером, иначе у парсера свой
+    http_client: HttpClient
+    #заголовки, отправляемые с каждым запросом к источнику
+    source_headers: dict[str, str] = {}
+    #время, в течение которого ответ источника отдается из дискового кеша без перепроверки
+    cache_ttl: timedelta = timedelta(0)
+    #построитель дерева для этого парсера (см. shared/html.py), None - из options.html_backend
+    html_backend: Union[str, None] = None
+    #таймауты, повторы и дублирующие запросы к источнику (см. shared/fetch_policy.py)
+    fetch_policy: FetchPolicy = DEFAULT_FETCH_POLICY
 
-    def __init__(self, options: ParserOptions) -> None:
+    #кеш результатов разбора, None - отключен
+    snapshot_cache: Union[SnapshotCache, None]
+
+    def __init__(self, options: ParserOptions, http_client: Union[HttpClient, None] = None) -> None:
         self.options = options
+        self.http_client = http_client if http_client is not None else HttpClient(options.http_options)
+        self.snapshot_cache = None
+        if (options.snapshot_dir is not None):
+            self.snapshot_cache = SnapshotCache(options.snapshot_dir)
+
+    def __merge_headers(self, headers: Union[dict[str, str], None]) -> dict[str, str]:
+        if (headers is None):
+            return self.source_headers
+        return {**self.source_headers, **headers}
+
+    async def fetch_text_async(self, url: str, headers: Union[dict[str, str], None] = None) -> str:
+        return await self.http_client.get_text(url, self.__merge_headers(headers), self.cache_ttl, self.fetch_policy)
+
+    async def fetch_json_async(self, url: str, headers: Union[dict[str, str], None] = None) -> Any:
+        return await self.http_client.get_json(url, self.__merge_headers(headers), self.cache_ttl, self.fetch_policy)
+
+    async def post_text_async(self, url: str, data: Any, headers: Union[dict[str, str], None] = None) -> str:
+        return await self.http_client.post_text(url, data, self.__merge_headers(headers), self.fetch_policy)
+
+    #Потоково разбирает страницу: строки контейнера отдаются в on_row по мере загрузки,
+    #соединение закрывается сразу после конца последнего нужного контейнера
+    async def stream_rows_async(
+        self,
+        url: str,
+        on_row: Callable[[StreamNode, int], None],
+        container_name: str,
+        container_attrs: Union[dict[str, str], None] = None,
+        row_name: str = "tr",
+        max_containers: Union[int, None] = 1,
+        row_parent: Union[str, None] = None
+    ):
+        extractor = StreamingRowExtractor(on_row, container_name, container_attrs, row_name, max_containers, row_parent)
+
+        def feed(chunk: str) -> bool:
+            extractor.feed(chunk)
+            return extractor.done
+
+        await self.http_client.stream_text(url, feed, self.__merge_headers(None), policy=self.fetch_policy)
+        extractor.close()
 
 
+    #Текущий момент для расчета дней расписания: options.now (момент записи корпуса в --replay) или datetime.now()
+    def now(self, tz: Union[tzinfo, None] = None) -> datetime:
+        if (self.options.now is None):
+            return datetime.now(tz)
+        if (tz is None):
+            return self.options.now.astimezone().replace(tzinfo=None)
+        return self.options.now.astimezone(tz)
+
     def in_config_time_interval(self, time):
         if (self.options.start_date != None and time < self.options.start_date):
             return False
@@ -53,6 +301,81 @@ class TvParser:
         
         return True
 
+    def parse_html(self, html_text: str):
+        backend = self.html_backend
+        if (backend is None):
+            backend = self.options.html_backend
+        return parse_html(html_text, backend)
+
+    #Вызывает parse(body, *args), а если тело ответа побайтно совпадает с прошлым разобранным,
+    #возвращает сохраненный результат разбора без построения DOM.
+    #url и args (день, от которого парсер отсчитывает время) входят в ключ снимка
+    def parse_cached(self, url: str, body: str, parse: Callable[..., Any], *args) -> Any:
+        if (self.snapshot_cache is None):
+            return parse(body, *args)
+
+        parser_name = type(self).__name__
+        body_hash = SnapshotCache.hash_body(body)
+        cached = self.snapshot_cache.load_programs(parser_name, url, args, body_hash)
+        if (cached is not None):
+            return cached
+
+        result = parse(body, *args)
+        self.snapshot_cache.store_programs(parser_name, url, args, body_hash, result)
+        return result
+
+    #То же, что parse_cached, но результат разбора общий для всех парсеров с этим http_client (один запуск):
+    #если страница с несколькими каналами уже разобрана этой же функцией parse (в том числе другим экземпляром
+    #или парсером-наследником) с теми же args и построителем дерева и тело ответа не изменилось, DOM не строится повторно.
+    #Каждый вызывающий получает свою копию результата
+    def parse_shared(self, url: str, body: str, parse: Callable[..., Any], *args) -> Any:
+        backend = self.html_backend
+        if (backend is None):
+            backend = self.options.html_backend
+
+        shared_parses = self.http_client.shared_parses
+        key = (getattr(parse, "__func__", parse), url, backend)
+        args_key = SnapshotCache.get_args_key(args)
+        body_hash = SnapshotCache.hash_body(body)
+        shared = shared_parses.get(key)
+        if (shared is not None and shared[0] == args_key and shared[1] == body_hash):
+            return deepcopy(shared[2])
+
+        result = self.parse_cached(url, body, parse, *args)
+        shared_parses[key] = (args_key, body_hash, deepcopy(result))
+        return result
+
+    #То же, что parse_cached, но при options.parse_workers > 0 разбор выполняется в пуле процессов
+    #и не блокирует event loop (остальные загрузки продолжаются, разбор идет на всех ядрах).
+    #parse должен быть методом этого парсера
+    async def parse_cached_async(self, url: str, body: str, parse: Callable[..., Any], *args) -> Any:
+        if (self.options.parse_workers <= 0):
+            return self.parse_cached(url, body, parse, *args)
+
+        parser_name = type(self).__name__
+        body_hash = None
+        if (self.snapshot_cache is not None):
+            body_hash = SnapshotCache.hash_body(body)
+            cached = self.snapshot_cache.load_programs(parser_name, url, args, body_hash)
+            if (cached is not None):
+                return cached
+
+        result = await run_method_in_process_pool_async(
+            get_process_pool(self.options.parse_workers),
+            parse,
+            body,
+            *args
+        )
+        if (self.snapshot_cache is not None):
+            self.snapshot_cache.store_programs(parser_name, url, args, body_hash, result)
+        return result
+
+    #В пул процессов парсер передается через pickle, HTTP клиент (сессия aiohttp) остается в этом процессе
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["http_client"] = None
+        return state
+
     async def parse_async(self) ->  list[TvProgramData]:
         pass
 
@@ -0,0 +1,34 @@
+import json
+import re
+from typing import Any, Iterator, Union
+
+#Извлечение данных Next.js (<script id="__NEXT_DATA__">) без построения DOM и без разбора всего JSON.
+#Скрипт находится регулярным выражением по тексту страницы, а из JSON материализуются
+#только значения нужного ключа (json.JSONDecoder.raw_decode с позиции значения)
+
+__NEXT_DATA_SCRIPT = re.compile(
+    r"""<script\b[^>]*\bid\s*=\s*["']__NEXT_DATA__["'][^>]*>(.*?)</script\s*>""",
+    re.DOTALL | re.IGNORECASE
+)
+__DECODER = json.JSONDecoder()
+
+#Текст JSON из <script id="__NEXT_DATA__">, None - скрипта на странице нет
+def find_next_data(html_text: str) -> Union[str, None]:
+    match = __NEXT_DATA_SCRIPT.search(html_text)
+    if (match is None):
+        return None
+    return match.group(1)
+
+#Значения всех свойств key в тексте JSON, по порядку. Разбирается только само значение,
+#остальной JSON пропускается без разбора.
+#Внутри строк JSON кавычки экранированы, поэтому "key": в тексте строки не совпадет
+def iter_json_values(json_text: str, key: str) -> Iterator[Any]:
+    pattern = re.compile(r'(?<!\\)"' + re.escape(key) + r'"\s*:\s*')
+    position = 0
+    while (True):
+        match = pattern.search(json_text, position)
+        if (match is None):
+            return
+
+        value, position = __DECODER.raw_decode(json_text, match.end())
+        yield value
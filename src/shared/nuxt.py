@@ -0,0 +1,205 @@
+import json
+import re
+from typing import Any, Union
+
+#Разбор состояния Nuxt (window.__NUXT__) без движка js.
+#Nuxt выдает его как IIFE с подстановкой повторяющихся значений через параметры:
+#window.__NUXT__=(function(a,b,c){return {data:[{title:a,...}],...}}("x",null,1));
+#Литералы js переписываются в JSON одним проходом регулярного выражения (ключи без кавычек, строки в одинарных
+#кавычках и escape-последовательности js, undefined/void 0, ссылки на параметры заменяются JSON их значений),
+#а сам разбор делает json.loads.
+#На любой другой конструкции (вызовы, операторы, обращения к свойствам, инструкции перед return, шестнадцатеричные числа)
+#выбрасывается NuxtDecodeError - тогда скрипт нужно исполнить в V8 (shared/js_pool.py).
+#Результат совпадает с JSON.parse(JSON.stringify(window.__NUXT__))
+
+#Конструкция, которую декодер не поддерживает
+class NuxtDecodeError(ValueError):
+    pass
+
+
+__PREFIX = re.compile(r"\s*(?:window\.__NUXT__\s*=\s*)?")
+__FUNCTION = re.compile(r"(\(\s*)?function\s*\(([\w$\s,]*)\)\s*\{\s*return\b\s*")
+__FUNCTION_END = re.compile(r"\s*;?\s*\}\s*")
+__SCRIPT_END = re.compile(r"\s*;?\s*")
+
+#строки и скобки, по ним ищутся границы тела функции и списка аргументов
+__BRACKETS = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[{}\[\]()]""", re.DOTALL)
+__OPEN_BRACKETS = frozenset("{[(")
+__CLOSE_BRACKETS = frozenset("}])")
+
+#строка; void 0; ключ объекта; идентификатор (не часть числа и не свойство после точки).
+#Вид токена определяется по match.lastgroup
+__JS_TOKEN = re.compile(r"""
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?<![\w$.])(?P<void>void\s+0)(?![\w$.])
+    |(?<![\w$.])(?P<key>[A-Za-z_$][\w$]*)\s*:
+    |(?<![\w$.])(?P<name>[A-Za-z_$][\w$]*)
+""", re.VERBOSE | re.DOTALL)
+
+#escape-последовательности, которых нет в JSON (\x41, \', \v, \0, перенос строки, \u{1F600})
+__NON_JSON_ESCAPE = re.compile(r"""\\(?:[^"\\/bfnrtu]|u(?![0-9a-fA-F]{4}))""")
+__ESCAPE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL)
+__SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+    "\n": "",
+    "\r": "",
+    "\r\n": "",
+    "\u2028": "",
+    "\u2029": "",
+}
+
+#ключ объекта - индекс массива: js перечисляет такие свойства первыми
+__INDEX_KEY = re.compile(r""""(?:0|[1-9]\d{0,9})"\s*:""")
+__ARRAY_INDEX = re.compile(r"0|[1-9]\d{0,9}")
+
+#undefined подставляется в JSON этой строкой, а после разбора такие свойства удаляются, а элементы массивов
+#становятся null (как в JSON.stringify)
+__UNDEFINED = "\0undefined"
+__UNDEFINED_JSON = json.dumps(__UNDEFINED)
+__LITERALS = {"true": "true", "false": "false", "null": "null", "undefined": __UNDEFINED_JSON}
+
+def __find_closing(script: str, start: int) -> int:
+    depth = 0
+    for match in __BRACKETS.finditer(script, start):
+        token = match[0]
+        if (token in __OPEN_BRACKETS):
+            depth += 1
+        elif (token in __CLOSE_BRACKETS):
+            depth -= 1
+            if (depth == 0):
+                return match.end()
+    raise NuxtDecodeError("Unbalanced brackets")
+
+def __replace_escape(match: re.Match) -> str:
+    escape = match.group(1)
+    if (escape in __SIMPLE_ESCAPES):
+        return __SIMPLE_ESCAPES[escape]
+    if (escape.startswith("u{")):
+        return chr(int(escape[2:-1], 16))
+    if (escape[0] in "ux" and len(escape) > 1):
+        return chr(int(escape[1:], 16))
+    #прочие символы после \ в js означают сами себя
+    return escape
+
+def __decode_string(literal: str) -> str:
+    value = __ESCAPE.sub(__replace_escape, literal[1:-1])
+    #суррогатные пары из \uXXXX\uXXXX склеиваются в один символ, как в JSON.parse
+    if (any("\ud800" <= char <= "\udfff" for char in value)):
+        value = value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+    return value
+
+#Переписывает литерал js в JSON; params - JSON значений параметров функции
+def __to_json(code: str, params: dict[str, str]) -> str:
+    def replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        if (kind == "key"):
+            return f"\"{match[kind]}\":"
+
+        token = match[0]
+        if (kind == "string"):
+            if (token[0] == "\"" and ("\\" not in token or __NON_JSON_ESCAPE.search(token) is None)):
+                return token
+            return json.dumps(__decode_string(token), ensure_ascii=False)
+
+        if (kind == "void"):
+            return __UNDEFINED_JSON
+        if (token in params):
+            return params[token]
+        if (token in __LITERALS):
+            return __LITERALS[token]
+        raise NuxtDecodeError(f"Unsupported identifier {token!r}")
+
+    return __JS_TOKEN.sub(replace, code)
+
+#JSON.stringify пишет целые числа без дробной части и экспоненты, json.loads превращает их в int
+def __parse_float(text: str) -> Union[int, float]:
+    value = float(text)
+    if (value.is_integer() and abs(value) < 1e21):
+        return int(value)
+    return value
+
+def __order_keys(pairs: list[tuple[str, Any]]) -> dict:
+    index_keys = sorted((int(key), key) for key, _ in pairs if __ARRAY_INDEX.fullmatch(key))
+    values = dict(pairs)
+    result = {key: values[key] for _, key in index_keys}
+    for key, value in pairs:
+        if (key not in result):
+            result[key] = values[key]
+    return result
+
+def __drop_undefined(value: Any) -> Any:
+    if (isinstance(value, dict)):
+        return {
+            key: __drop_undefined(item)
+            for key, item in value.items()
+                if item != __UNDEFINED
+        }
+    if (isinstance(value, list)):
+        return [None if item == __UNDEFINED else __drop_undefined(item) for item in value]
+    return value
+
+#drop_undefined=False - undefined остается строкой __UNDEFINED (аргументы IIFE подставляются в тело как есть)
+def __load_json(code: str, params: dict[str, str], drop_undefined: bool = True) -> Any:
+    text = __to_json(code, params)
+    object_pairs_hook = __order_keys if __INDEX_KEY.search(text) is not None else None
+    try:
+        value = json.loads(text, parse_float=__parse_float, strict=False, object_pairs_hook=object_pairs_hook)
+    except ValueError as ex:
+        raise NuxtDecodeError(f"Unsupported expression: {ex}") from ex
+
+    if (drop_undefined and __UNDEFINED_JSON in text):
+        value = __drop_undefined(value)
+    return value
+
+#script - содержимое <script> с window.__NUXT__=... (или само выражение)
+def decode_nuxt(script: str) -> Any:
+    position = __PREFIX.match(script).end()
+    function = __FUNCTION.match(script, position)
+    if (function is None):
+        literal_end = __find_closing(script, position)
+        if (__SCRIPT_END.match(script, literal_end).end() != len(script)):
+            raise NuxtDecodeError("Unsupported expression")
+        result = __load_json(script[position:literal_end], {})
+    else:
+        wrapped = function.group(1) is not None
+        names = [name.strip() for name in function.group(2).split(",") if name.strip() != ""]
+
+        body_start = function.end()
+        body_end = __find_closing(script, body_start)
+        function_end = __FUNCTION_END.match(script, body_end)
+        if (function_end is None):
+            raise NuxtDecodeError("Unsupported function body")
+        position = function_end.end()
+
+        #(function(){...})(args) или (function(){...}(args))
+        if (wrapped and script.startswith(")", position)):
+            wrapped = False
+            position += 1
+        if (not script.startswith("(", position)):
+            raise NuxtDecodeError("Expected function call")
+        args_end = __find_closing(script, position)
+        args = __load_json("[" + script[position + 1:args_end - 1] + "]", {}, drop_undefined=False)
+
+        position = args_end
+        if (wrapped):
+            if (not script.startswith(")", position)):
+                raise NuxtDecodeError("Expected ')'")
+            position += 1
+        if (__SCRIPT_END.match(script, position).end() != len(script)):
+            raise NuxtDecodeError("Unexpected code after payload")
+
+        params = {
+            name: json.dumps(args[index], ensure_ascii=False) if index < len(args) else __UNDEFINED_JSON
+            for index, name in enumerate(names)
+        }
+        result = __load_json(script[body_start:body_end], params)
+
+    if (result == __UNDEFINED):
+        raise NuxtDecodeError("Payload is undefined")
+    return result
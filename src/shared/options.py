@@ -1,32 +1,123 @@
+import os
 from datetime import datetime, UTC
 from typing import Union
 from argparse import ArgumentParser
 
+#Настройки общего пула соединений (shared/http.py)
+class HttpOptions:
+    #максимум одновременных соединений на весь процесс
+    limit: int
+    #максимум одновременных соединений к одному хосту
+    limit_per_host: int
+    #сколько секунд держать неиспользуемое keep-alive соединение
+    keepalive_timeout: float
+    #сколько секунд кешировать результат DNS запроса
+    dns_cache_ttl: int
+    #директория дискового кеша ответов, None - кеш отключен
+    cache_dir: Union[str, None]
+    #корпус записанных ответов (shared/fixtures.py): запросы ко всем хостам уходят
+    #на локальный сервер воспроизведения (shared/replay.py), None - обычная сеть
+    replay_dir: Union[str, None]
+    #сервер воспроизведения выдерживает записанное время ответа
+    replay_latency: bool
+
+    def __init__(
+        self,
+        limit: int = 64,
+        limit_per_host: int = 6,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 600,
+        cache_dir: Union[str, None] = None,
+        replay_dir: Union[str, None] = None,
+        replay_latency: bool = False
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.cache_dir = cache_dir
+        self.replay_dir = replay_dir
+        self.replay_latency = replay_latency
+
 class ParserOptions:
     #с какого числа
     start_date: Union[datetime, None]
     #по какое число включительно 
     #но не факт что будут передачи за этот период
     finish_date: Union[datetime, None]
+    #настройки HTTP клиента, который парсер создает, если клиент не был внедрен
+    http_options: HttpOptions
+    #директория кеша результатов разбора (shared/snapshots.py), None - кеш отключен
+    snapshot_dir: Union[str, None]
+    #построитель дерева для всех парсеров, у которых он не задан явно (shared/html.py)
+    html_backend: Union[str, None]
+    #парсеры, которые это поддерживают, разбирают таблицы потоково, без построения DOM (shared/streaming.py)
+    stream_html: bool
+    #число процессов для разбора страниц многодневных парсеров, 0 - разбор в event loop
+    parse_workers: int
+    #сколько дней многодневные парсеры загружают одновременно (shared/fanout.py),
+    #фактически не больше http_options.limit_per_host
+    day_concurrency: int
+    #момент, от которого парсеры отсчитывают текущий день (--replay - момент записи корпуса), None - текущее время
+    now: Union[datetime, None]
 
     def __init__(
         self,
         start_date: Union[datetime, None] = None,
-        finish_date: Union[datetime, None] = None
+        finish_date: Union[datetime, None] = None,
+        http_options: Union[HttpOptions, None] = None,
+        snapshot_dir: Union[str, None] = None,
+        html_backend: Union[str, None] = None,
+        stream_html: bool = False,
+        parse_workers: int = 0,
+        day_concurrency: int = 8,
+        now: Union[datetime, None] = None
     ):
         self.start_date = start_date
         self.finish_date = finish_date
+        self.http_options = http_options if http_options is not None else HttpOptions()
+        self.snapshot_dir = snapshot_dir
+        self.html_backend = html_backend
+        self.stream_html = stream_html
+        self.parse_workers = parse_workers
+        self.day_concurrency = day_concurrency
+        self.now = now
+
+#Сжатие выходных файлов: название для --compress и расширение файла, по которому оно выбирается
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    #нужен pip install zstandard
+    "zstd": ".zst"
+}
+
+#Добавляет расширение сжатия к пути, если его там еще нет
+def get_compressed_path(path: str, compression: Union[str, None]) -> str:
+    if (compression is None):
+        return path
+
+    extension = COMPRESSION_EXTENSIONS[compression]
+    if (path.endswith(extension)):
+        return path
+    return path + extension
 
 class SaveOptions:
     output_path: str
     separator: str
+    #база SQLite (shared/sqlite_store.py), в которую программы пишутся вместе с csv, None - только csv
+    sqlite_path: Union[str, None]
+    #файл XMLTV, который пишется вместе с csv, None - не писать
+    xmltv_path: Union[str, None]
     def __init__(
         self,
         output_path: str,
-        separator: str = "\t"
+        separator: str = "\t",
+        sqlite_path: Union[str, None] = None,
+        xmltv_path: Union[str, None] = None
     ):
         self.separator = separator
         self.output_path = output_path
+        self.sqlite_path = sqlite_path
+        self.xmltv_path = xmltv_path
 
 
 class Options:
@@ -42,28 +133,179 @@ class Options:
         self.save_options = save_options
 
 
+class RunnerOptions:
+    #ключи каналов, которые необходимо запарсить
+    channels: list[str]
+    parser_options: ParserOptions
+    #для раздельного вывода - директория, для объединенного - путь к csv-файлу
+    output_path: str
+    separator: str
+    #записать все каналы в один csv-файл
+    merge: bool
+    #только вывести каталог каналов, без запуска парсеров
+    list_channels: bool
+    #сразу отдать последний успешный результат канала из кеша снимков, обновляя его в фоне
+    stale_while_revalidate: bool
+    #вместо сохранения сверить результаты с этим построителем дерева (shared/html_verify.py)
+    verify_html_backend: Union[str, None]
+    #директория версий результатов каналов (shared/delta.py); если задана, вместо полного csv
+    #пишутся только изменения относительно прошлого запуска
+    delta_dir: Union[str, None]
+    #база SQLite, в которую дополнительно пишутся результаты каналов
+    sqlite_path: Union[str, None]
+    #не завершаться, а обновлять каналы по расписанию из каталога (shared/daemon.py)
+    daemon: bool
+    #случайная задержка запусков в режиме daemon, в секундах
+    jitter: float
+    #общий файл XMLTV всех каналов, None - не писать
+    xmltv_path: Union[str, None]
+    #сжатие файлов каналов при раздельном выводе (ключ COMPRESSION_EXTENSIONS), None - без сжатия
+    compression: Union[str, None]
+
+    def __init__(
+        self,
+        channels: list[str],
+        parser_options: ParserOptions,
+        output_path: str,
+        separator: str = "\t",
+        merge: bool = False,
+        list_channels: bool = False,
+        stale_while_revalidate: bool = False,
+        verify_html_backend: Union[str, None] = None,
+        delta_dir: Union[str, None] = None,
+        sqlite_path: Union[str, None] = None,
+        daemon: bool = False,
+        jitter: float = 60,
+        xmltv_path: Union[str, None] = None,
+        compression: Union[str, None] = None
+    ):
+        self.channels = channels
+        self.parser_options = parser_options
+        self.output_path = output_path
+        self.separator = separator
+        self.merge = merge
+        self.list_channels = list_channels
+        self.stale_while_revalidate = stale_while_revalidate
+        self.verify_html_backend = verify_html_backend
+        self.delta_dir = delta_dir
+        self.sqlite_path = sqlite_path
+        self.daemon = daemon
+        self.jitter = jitter
+        self.xmltv_path = xmltv_path
+        self.compression = compression
+
+    #настройки сохранения для конкретного канала (при раздельном выводе)
+    def get_save_options(self, channel: str) -> SaveOptions:
+        if (self.merge):
+            return SaveOptions(self.output_path, self.separator, self.sqlite_path)
+
+        return SaveOptions(
+            get_compressed_path(os.path.join(self.output_path, f"{channel}.csv"), self.compression),
+            self.separator,
+            self.sqlite_path
+        )
+
+
 def create_default_arg_parser() -> ArgumentParser:
     args_parser = ArgumentParser()
     args_parser.add_argument("-sd", "--start-date")
     args_parser.add_argument("-fd", "--finish-date")
     args_parser.add_argument("-o", "--output")
     args_parser.add_argument("-sep", "--separator")
+    args_parser.add_argument("-hc", "--http-cache")
+    args_parser.add_argument("-sc", "--snapshot-cache")
+    args_parser.add_argument("-hb", "--html-backend")
+    args_parser.add_argument("-st", "--stream-html", action="store_true")
+    args_parser.add_argument("-pw", "--parse-workers", type=int, default=0)
+    args_parser.add_argument("-dc", "--day-concurrency", type=int, default=8)
+    args_parser.add_argument("-rp", "--replay")
+    args_parser.add_argument("-rl", "--replay-latency", action="store_true")
+    args_parser.add_argument("-db", "--sqlite")
+    args_parser.add_argument("-x", "--xmltv")
+    args_parser.add_argument("-z", "--compress", choices=list(COMPRESSION_EXTENSIONS))
+
+    return args_parser
+
+def create_runner_arg_parser() -> ArgumentParser:
+    args_parser = create_default_arg_parser()
+    args_parser.add_argument("-c", "--channels")
+    args_parser.add_argument("-m", "--merge", action="store_true")
+    args_parser.add_argument("-l", "--list", action="store_true")
+    args_parser.add_argument("-swr", "--stale-while-revalidate", action="store_true")
+    args_parser.add_argument("-vhb", "--verify-html-backend")
+    args_parser.add_argument("-dl", "--delta")
+    args_parser.add_argument("-d", "--daemon", action="store_true")
+    args_parser.add_argument("-j", "--jitter", type=float, default=60)
 
     return args_parser
 
+def __parse_date(date: Union[str, None]) -> Union[datetime, None]:
+    if (date is None):
+        return None
+
+    return datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=UTC)
+
+def __get_xmltv_path(args) -> Union[str, None]:
+    if (args.xmltv is None):
+        return None
+    return get_compressed_path(args.xmltv, args.compress)
+
+def __read_parser_options(args) -> ParserOptions:
+    return ParserOptions(
+        __parse_date(args.start_date),
+        __parse_date(args.finish_date),
+        HttpOptions(
+            #дни одного канала грузятся одновременно с одного хоста
+            limit_per_host=max(HttpOptions().limit_per_host, args.day_concurrency),
+            cache_dir=args.http_cache,
+            replay_dir=args.replay,
+            replay_latency=args.replay_latency
+        ),
+        args.snapshot_cache,
+        args.html_backend,
+        args.stream_html,
+        args.parse_workers,
+        args.day_concurrency
+    )
+
 def read_command_line_options() -> Options:
     parser = create_default_arg_parser()
     args = parser.parse_args()
     
-    start_date = None
-    finish_date = None
     save_output = "./out.csv"
     separator = '\t'
 
-    if (args.start_date is not None):
-        start_date = datetime.strptime(args.start_date, "%Y-%m-%d").replace(tzinfo=UTC)
-    if (args.start_date is not None):
-        finish_date = datetime.strptime(args.finish_date, "%Y-%m-%d").replace(tzinfo=UTC)
+    if (args.output is not None):
+        save_output = args.output
+
+    if (args.separator is not None):
+        separator = args.separator
+
+    parser_options = __read_parser_options(args)
+    save_options = SaveOptions(
+        get_compressed_path(save_output, args.compress),
+        separator,
+        args.sqlite,
+        __get_xmltv_path(args)
+    )
+
+    return Options(parser_options, save_options)
+
+#Параметры для запуска нескольких парсеров в одном процессе (src/run.py)
+def read_runner_command_line_options() -> RunnerOptions:
+    parser = create_runner_arg_parser()
+    args = parser.parse_args()
+
+    channels = []
+    separator = '\t'
+    save_output = "./out.csv" if args.merge else "./out"
+
+    if (args.channels is not None):
+        channels = [
+            channel.strip() 
+            for channel in args.channels.split(",") 
+                if channel.strip() != ""
+        ]
 
     if (args.output is not None):
         save_output = args.output
@@ -71,7 +313,22 @@ def read_command_line_options() -> Options:
     if (args.separator is not None):
         separator = args.separator
 
-    parser_options = ParserOptions(start_date, finish_date)
-    save_options = SaveOptions(save_output, separator)
+    if (args.merge):
+        save_output = get_compressed_path(save_output, args.compress)
 
-    return Options(parser_options, save_options)
\ No newline at end of file
+    return RunnerOptions(
+        channels,
+        __read_parser_options(args),
+        save_output,
+        separator,
+        args.merge,
+        args.list,
+        args.stale_while_revalidate,
+        args.verify_html_backend,
+        args.delta,
+        args.sqlite,
+        args.daemon,
+        args.jitter,
+        __get_xmltv_path(args),
+        args.compress
+    )
\ No newline at end of file
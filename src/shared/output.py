@@ -1,13 +1,53 @@
 import asyncio
+import gzip
+import heapq
+import io
+import itertools
+import re
 from datetime import datetime
 import os
 from typing import *
-from aiofile import async_open
+from xml.sax.saxutils import escape as xml_escape, quoteattr
 
-from shared.utils import is_none_or_empty, replace_spaces
+from shared.utils import replace_spaces
 
-from .options import SaveOptions
+from .options import COMPRESSION_EXTENSIONS, SaveOptions
 from .models import TvParser, TvProgramData
+from .executor import shutdown_process_pool
+from .sqlite_store import ScheduleDatabase
+from .registry import find_parser_info
+from .replay import get_replay_parser_options
+
+#число строк, которые форматируются в буфер перед одной записью в файл
+CSV_BATCH_SIZE = 8192
+
+CSV_COLUMNS = [
+    "datetime_start",
+    "datetime_finish",
+    "channel",
+    "title",
+    "channel_logo_url",
+    "description",
+    "available_archive"
+]
+
+#Открывает выходной файл на запись текста; по расширению (.gz, .zst) сжимает поток по мере записи.
+#Сжатые файлы можно дописывать и склеивать: несколько gzip-членов или zstd-кадров подряд читаются как один поток
+def open_output(path: str) -> TextIO:
+    dirname = os.path.dirname(path)
+    if (dirname != None and dirname != ""):
+        os.makedirs(dirname, exist_ok=True)
+
+    if (path.endswith(COMPRESSION_EXTENSIONS["gzip"])):
+        return gzip.open(path, "wt", compresslevel=6, encoding="utf-8", newline="")
+
+    if (path.endswith(COMPRESSION_EXTENSIONS["zstd"])):
+        #необязательная зависимость, нужна только для .zst
+        import zstandard
+        writer = zstandard.ZstdCompressor(level=6).stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+
+    return open(path, "w", encoding="utf-8", newline="")
 
 def escape(input: str):
     if (input is None):
@@ -18,53 +58,152 @@ def escape(input: str):
 
 def __format_date(date: Union[datetime, None]):
     if (date is None):
-        return ""
+        return "\"\""
 
-    return date.isoformat("T", "seconds")
-    
-def __to_csv_line(data:TvProgramData, options: SaveOptions):
-    data.channel = replace_spaces(data.channel)
-    data.title = replace_spaces(data.title)
-    if (data.description != None):
-        data.description = replace_spaces(data.description)
-
-    return (f"{escape(__format_date(data.datetime_start))}" 
-    + f"{options.separator}{escape(__format_date(data.datetime_finish))}"
-    + f"{options.separator}{escape(data.channel)}"
-    + f"{options.separator}{escape(data.title)}"
-    + f"{options.separator}{escape(data.channel_logo_url)}"
-    + f"{options.separator}{escape(data.description)}"
-    + f"{options.separator}{str(int(data.available_archive))}"
-    + "\n")
-
-async def __out_to_csv_async(tvPrograms: list[TvProgramData], options: SaveOptions):
-    dirname = os.path.dirname(options.output_path)
-    if (dirname != None and dirname != ""):
-        os.makedirs(dirname, exist_ok=True)
-        
-    async with async_open(options.output_path, "w+") as asyncStream:
-        await asyncStream.write(
-            "\"datetime_start\""
-            +f"{options.separator}\"datetime_finish\""
-            +f"{options.separator}\"channel\""
-            +f"{options.separator}\"title\""
-            +f"{options.separator}\"channel_logo_url\""
-            +f"{options.separator}\"description\""
-            +f"{options.separator}\"available_archive\""
-            +"\n")
+    return f"\"{date.isoformat('T', 'seconds')}\""
+
+#Строка csv для программы, сама программа не изменяется
+def format_csv_line(data: TvProgramData, separator: str) -> str:
+    description = data.description
+    if (description is not None):
+        description = replace_spaces(description)
+
+    return separator.join((
+        __format_date(data.datetime_start),
+        __format_date(data.datetime_finish),
+        escape(replace_spaces(data.channel)),
+        escape(replace_spaces(data.title)),
+        escape(data.channel_logo_url),
+        escape(description),
+        str(int(data.available_archive))
+    )) + "\n"
 
+def format_csv_header(separator: str) -> str:
+    return separator.join(f"\"{column}\"" for column in CSV_COLUMNS) + "\n"
+
+#Синхронная запись csv: строки форматируются пачками по CSV_BATCH_SIZE и пишутся одним вызовом write
+def write_csv(tvPrograms: Iterable[TvProgramData], options: SaveOptions):
+    separator = options.separator
+    with open_output(options.output_path) as stream:
+        stream.write(format_csv_header(separator))
+
+        batch = []
         for tvProgram in tvPrograms:
-            await asyncStream.write(
-                __to_csv_line(tvProgram, options)
-            )
-        return
+            batch.append(format_csv_line(tvProgram, separator))
+            if (len(batch) >= CSV_BATCH_SIZE):
+                stream.write("".join(batch))
+                batch.clear()
+
+        if (len(batch) > 0):
+            stream.write("".join(batch))
+
+#Форматирование, сжатие и запись выполняются в отдельном потоке, event loop не блокируется
+async def out_to_csv_async(tvPrograms: list[TvProgramData], options: SaveOptions):
+    await asyncio.to_thread(write_csv, tvPrograms, options)
+
+def write_sqlite(tvPrograms: Iterable[TvProgramData], sqlite_path: str):
+    with ScheduleDatabase(sqlite_path) as database:
+        database.upsert(tvPrograms)
+
+async def out_to_sqlite_async(tvPrograms: list[TvProgramData], sqlite_path: str):
+    await asyncio.to_thread(write_sqlite, tvPrograms, sqlite_path)
+
+#символы, недопустимые в XML 1.0 (управляющие, кроме табуляции и переводов строки)
+__XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+def __xml_text(text: str) -> str:
+    return xml_escape(__XML_INVALID_CHARS.sub("", text))
+
+def __xml_attribute(text: str) -> str:
+    return quoteattr(__XML_INVALID_CHARS.sub("", text))
+
+def __format_xmltv_date(date: datetime) -> str:
+    return date.strftime("%Y%m%d%H%M%S %z").rstrip()
+
+def format_xmltv_channel(channel_id: str, program: TvProgramData) -> str:
+    lines = [f"  <channel id={__xml_attribute(channel_id)}>\n"]
+    lines.append(f"    <display-name>{__xml_text(replace_spaces(program.channel))}</display-name>\n")
+    if (program.channel_logo_url is not None):
+        lines.append(f"    <icon src={__xml_attribute(program.channel_logo_url)} />\n")
+    lines.append("  </channel>\n")
+    return "".join(lines)
+
+def format_xmltv_programme(channel_id: str, program: TvProgramData) -> str:
+    attributes = f"start=\"{__format_xmltv_date(program.datetime_start)}\""
+    if (program.datetime_finish is not None):
+        attributes += f" stop=\"{__format_xmltv_date(program.datetime_finish)}\""
+    attributes += f" channel={__xml_attribute(channel_id)}"
+
+    lines = [f"  <programme {attributes}>\n"]
+    lines.append(f"    <title>{__xml_text(replace_spaces(program.title))}</title>\n")
+    if (program.description is not None):
+        lines.append(f"    <desc>{__xml_text(replace_spaces(program.description))}</desc>\n")
+    lines.append("  </programme>\n")
+    return "".join(lines)
+
+def __xmltv_source(channel_id: str, programs: Iterable[TvProgramData]) -> Iterator[tuple[float, str, TvProgramData]]:
+    for program in programs:
+        yield (program.datetime_start.timestamp(), channel_id, program)
+
+#Потоковая запись XMLTV за один проход.
+#channels - пары (id канала, программы канала по возрастанию времени начала), программы могут быть итераторами.
+#Сначала пишутся <channel> (по первой программе каждого канала), затем <programme> всех каналов,
+#слитые по времени начала через heapq.merge: в памяти одновременно по одной программе от канала и буфер записи
+def write_xmltv(channels: Iterable[tuple[str, Iterable[TvProgramData]]], output_path: str):
+    with open_output(output_path) as stream:
+        stream.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n")
+        stream.write("<!DOCTYPE tv SYSTEM \"xmltv.dtd\">\n")
+        stream.write("<tv generator-info-name=\"TvParsers\">\n")
+
+        sources = []
+        for channel_id, programs in channels:
+            programs = iter(programs)
+            first = next(programs, None)
+            if (first is None):
+                continue
+            stream.write(format_xmltv_channel(channel_id, first))
+            sources.append(__xmltv_source(channel_id, itertools.chain([first], programs)))
+
+        batch = []
+        for _, channel_id, program in heapq.merge(*sources, key=lambda item: item[:2]):
+            batch.append(format_xmltv_programme(channel_id, program))
+            if (len(batch) >= CSV_BATCH_SIZE):
+                stream.write("".join(batch))
+                batch.clear()
+
+        batch.append("</tv>\n")
+        stream.write("".join(batch))
+
+#Программы канала по времени начала, как этого требует write_xmltv
+def sort_programs(programs: Iterable[TvProgramData]) -> list[TvProgramData]:
+    return sorted(programs, key=lambda program: program.datetime_start.timestamp())
+
+async def out_to_xmltv_async(channels: list[tuple[str, Iterable[TvProgramData]]], output_path: str):
+    await asyncio.to_thread(write_xmltv, channels, output_path)
 
 async def run_parser_out_to_csv_async(parser: TvParser, options: SaveOptions):
-    parsedData = await parser.parse_async()
-    await __out_to_csv_async(parsedData, options)
+    async with parser.http_client:
+        parsedData = await parser.parse_async()
+    await out_to_csv_async(parsedData, options)
+    if (options.sqlite_path is not None):
+        await out_to_sqlite_async(parsedData, options.sqlite_path)
+    if (options.xmltv_path is not None):
+        #id канала - ключ из каталога, как при запуске через run.py
+        info = find_parser_info(type(parser).__name__)
+        channel_id = info.key if info is not None else type(parser).__name__
+        await out_to_xmltv_async([(channel_id, sort_programs(parsedData))], options.xmltv_path)
 
 def run_parser_out_to_csv(parser: TvParser, options: SaveOptions):
+    #--replay: "текущее время" парсера - момент записи корпуса его канала
+    replay_dir = parser.options.http_options.replay_dir
+    info = find_parser_info(type(parser).__name__)
+    if (replay_dir is not None and info is not None):
+        parser.options = get_replay_parser_options(parser.options, replay_dir, info.key)
+
     loop = asyncio.get_event_loop()
-    loop.run_until_complete(
-        run_parser_out_to_csv_async(parser, options)
-    )
\ No newline at end of file
+    try:
+        loop.run_until_complete(
+            run_parser_out_to_csv_async(parser, options)
+        )
+    finally:
+        shutdown_process_pool()
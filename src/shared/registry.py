@@ -0,0 +1,181 @@
+import importlib
+from datetime import datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Iterable, Union
+
+from .options import ParserOptions
+
+#shared.models тянет aiohttp, поэтому импортируется только для аннотаций
+if TYPE_CHECKING:
+    from .http import HttpClient
+    from .models import TvParser
+
+MSK = timezone(timedelta(hours=3), "MSK")
+
+#Как часто обновлять канал в режиме daemon (из <канал>_info.txt).
+#Без at - каждые interval после прошлого запуска, с at - каждый день в это время (time с tzinfo)
+class Cadence:
+    interval: timedelta
+    at: Union[time, None]
+
+    def __init__(self, interval: timedelta, at: Union[time, None] = None):
+        self.interval = interval
+        self.at = at
+
+    def get_next_run(self, last_run: datetime) -> datetime:
+        if (self.at is None):
+            return last_run + self.interval
+
+        local_run = last_run.astimezone(self.at.tzinfo)
+        next_run = datetime.combine(local_run.date(), self.at.replace(tzinfo=None), self.at.tzinfo)
+        while (next_run <= local_run):
+            next_run += timedelta(days=1)
+        return next_run
+
+    def describe(self) -> str:
+        if (self.at is not None):
+            return f"daily at {self.at.strftime('%H:%M')} {self.at.tzname()}"
+        return f"every {self.interval.total_seconds() / 3600:g}h"
+
+
+#"Запускать раз в сутки"
+DAILY = Cadence(timedelta(days=1))
+#"Запускать несколько раз в сутки"
+SEVERAL_TIMES_A_DAY = Cadence(timedelta(hours=6))
+
+#Описание парсера в каталоге. Модуль парсера импортируется только при вызове load_class,
+#поэтому перечисление каналов не тянет за собой aiohttp, bs4 и py_mini_racer
+class ParserInfo:
+    #ключ канала, обычно совпадает с именем скрипта в src/
+    key: str
+    #модуль парсера, по умолчанию - key (несколько каналов с одной страницы живут в одном модуле)
+    module_name: str
+    class_name: str
+    #поддерживает --start-date
+    supports_start_date: bool
+    #поддерживает --finish-date
+    supports_finish_date: bool
+    #точная временная метка (дату можно определить по ответу источника, а не угадывать)
+    exact_timestamps: bool
+    #последняя программа отбрасывается, т.к. у нее нет даты окончания
+    remove_last: bool
+    #дополнительные зависимости сверх requirements #common
+    extra_requirements: list[str]
+    #периодичность обновления в режиме daemon
+    cadence: Cadence
+
+    def __init__(
+        self,
+        key: str,
+        class_name: str,
+        supports_start_date: bool = False,
+        supports_finish_date: bool = False,
+        exact_timestamps: bool = False,
+        remove_last: bool = False,
+        extra_requirements: list[str] = None,
+        cadence: Cadence = DAILY,
+        module_name: Union[str, None] = None
+    ):
+        self.key = key
+        self.module_name = module_name if module_name is not None else key
+        self.class_name = class_name
+        self.supports_start_date = supports_start_date
+        self.supports_finish_date = supports_finish_date
+        self.exact_timestamps = exact_timestamps
+        self.remove_last = remove_last
+        self.extra_requirements = extra_requirements or []
+        self.cadence = cadence
+
+    def load_class(self) -> type["TvParser"]:
+        module = importlib.import_module(self.module_name)
+        return getattr(module, self.class_name)
+
+    def create_parser(
+        self,
+        options: ParserOptions,
+        http_client: Union["HttpClient", None] = None
+    ) -> "TvParser":
+        return self.load_class()(options, http_client)
+
+    def describe_capabilities(self) -> list[str]:
+        capabilities = []
+        if (self.supports_start_date):
+            capabilities.append("start-date")
+        if (self.supports_finish_date):
+            capabilities.append("finish-date")
+        if (self.exact_timestamps):
+            capabilities.append("exact-timestamps")
+        if (self.remove_last):
+            capabilities.append("remove-last")
+        for requirement in self.extra_requirements:
+            capabilities.append(f"requires:{requirement}")
+        capabilities.append(f"cadence:{self.cadence.describe()}")
+        return capabilities
+
+
+#Каталог парсеров, возможности взяты из README.md и runners.info, периодичность - из <канал>_info.txt
+PARSERS: dict[str, ParserInfo] = {
+    info.key: info for info in [
+        ParserInfo("aksu_tv", "AksuTvParser", supports_start_date=True),
+        ParserInfo("beyaz_tv", "BeyazTvParser", remove_last=True),
+        ParserInfo("can_tv", "CanTvParser"),
+        ParserInfo("cartoon_network", "CatoonNetworkParser", exact_timestamps=True),
+        ParserInfo("cnn_turk", "CnnTurkParser", remove_last=True),
+        ParserInfo("dost_tv", "DostTvParser", supports_start_date=True, supports_finish_date=True, exact_timestamps=True, cadence=Cadence(timedelta(days=1), time(3, 0, tzinfo=MSK))),
+        ParserInfo("ekol_tv", "EkolTvParser", supports_start_date=True, supports_finish_date=True, exact_timestamps=True, remove_last=True),
+        ParserInfo("er_tv", "ErTVParser"),
+        ParserInfo("haber_global", "HaberGlobalParser", exact_timestamps=True),
+        ParserInfo("ikra_tv", "IkraTvParser"),
+        ParserInfo("kanal3", "Kanal3Parser", remove_last=True),
+        ParserInfo("kon_tv", "KonTvParser", remove_last=True),
+        ParserInfo("meltem_tv", "MeltemTvParser"),
+        ParserInfo("semerkand_tv", "SemerkandTvParser"),
+        ParserInfo("sozcu_tv", "SozcuTvParser"),
+        ParserInfo("star_tv", "StartTvParser", exact_timestamps=True),
+        ParserInfo("trt1", "Trt1Parser", exact_timestamps=True),
+        ParserInfo("trt2", "Trt2Parser", remove_last=True, cadence=SEVERAL_TIMES_A_DAY),
+        ParserInfo("trt_avaz", "TrtAvazParser", remove_last=True, cadence=SEVERAL_TIMES_A_DAY, module_name="trt2"),
+        ParserInfo("trt_belgesel", "TrtBelgeselParser", remove_last=True),
+        ParserInfo("trt_cocuk", "TrtCocukParser", exact_timestamps=True, extra_requirements=["mini-racer"]),
+        ParserInfo("trt_haber", "TrtHaberParser", exact_timestamps=True, remove_last=True),
+        ParserInfo("trt_muzic", "TrtMusicParser", exact_timestamps=True),
+        ParserInfo("trt_spor", "TrtSporParser", exact_timestamps=True, module_name="trt_spor_yildizi"),
+        ParserInfo("trt_spor_yildizi", "TrtSportYildiziParser", exact_timestamps=True),
+        ParserInfo("trt_turk", "TrtTurkParser", remove_last=True, cadence=SEVERAL_TIMES_A_DAY, module_name="trt2"),
+        ParserInfo("tv41", "Tv41Parser", exact_timestamps=True, remove_last=True, cadence=SEVERAL_TIMES_A_DAY),
+    ]
+}
+
+def get_parser_info(key: str) -> ParserInfo:
+    if (key not in PARSERS):
+        raise KeyError(f"Unknown channel: {key}")
+
+    return PARSERS[key]
+
+#Описание по имени класса парсера, None - парсера нет в каталоге
+def find_parser_info(class_name: str) -> Union[ParserInfo, None]:
+    for info in PARSERS.values():
+        if (info.class_name == class_name):
+            return info
+    return None
+
+#Возвращает описания выбранных каналов в порядке keys, пустой список - все каналы
+def select_parsers(keys: Iterable[str]) -> list[ParserInfo]:
+    keys = list(keys)
+    if (len(keys) == 0):
+        return list(PARSERS.values())
+
+    unknown_keys = [key for key in keys if key not in PARSERS]
+    if (len(unknown_keys) > 0):
+        raise KeyError(f"Unknown channels: {', '.join(unknown_keys)}")
+
+    return [PARSERS[key] for key in keys]
+
+def create_parsers(
+    infos: Iterable[ParserInfo],
+    options: ParserOptions,
+    http_client: Union["HttpClient", None] = None
+) -> dict[str, "TvParser"]:
+    return {
+        info.key: info.create_parser(options, http_client)
+        for info in infos
+    }
@@ -0,0 +1,153 @@
+import asyncio
+import os
+from argparse import ArgumentParser
+from copy import copy
+from datetime import datetime
+from typing import Union
+from aiohttp import web
+from yarl import URL
+
+from .fixtures import Fixture, FixtureStore
+from .options import ParserOptions
+
+#заголовок, в котором клиент передает исходный origin (схема и хост) перенаправленного запроса
+REPLAY_ORIGIN_HEADER = "X-Replay-Origin"
+
+#Переписывает url источника на адрес сервера воспроизведения.
+#Возвращает новый url и исходный origin для заголовка REPLAY_ORIGIN_HEADER
+def rewrite_url(url: str, replay_url: str) -> tuple[str, str]:
+    source = URL(url)
+    path = source.raw_path or "/"
+    if (source.raw_query_string != ""):
+        path += "?" + source.raw_query_string
+    return (replay_url.rstrip("/") + path, str(source.origin()))
+
+#Локальный HTTP сервер, отдающий записанные ответы (корпус shared/fixtures.py) по методу, url и телу запроса.
+#directory - корпус одного канала (с manifest.json) или каталог с корпусами каналов в поддиректориях.
+#latency - перед ответом выдерживается время ответа, замеренное при записи
+class ReplayServer:
+    directory: str
+    latency: bool
+    #адрес запущенного сервера, например http://127.0.0.1:41234
+    url: Union[str, None]
+
+    def __init__(self, directory: str, latency: bool = False):
+        self.directory = directory
+        self.latency = latency
+        self.url = None
+        self.__runner = None
+        self.__fixtures: dict[tuple, Fixture] = {}
+
+        for store in self.__load_stores(directory):
+            for fixture in store.fixtures:
+                self.__fixtures[self.__get_key(fixture.method, fixture.url, fixture.data)] = fixture
+
+    async def start_async(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.__handle_async)
+
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, host, port)
+        await site.start()
+
+        bound_host, bound_port = self.__runner.addresses[0][:2]
+        self.url = f"http://{bound_host}:{bound_port}"
+        return self.url
+
+    async def close(self):
+        if (self.__runner is not None):
+            await self.__runner.cleanup()
+        self.__runner = None
+        self.url = None
+
+    async def __handle_async(self, request: web.Request) -> web.Response:
+        origin = request.headers.get(REPLAY_ORIGIN_HEADER)
+        if (origin is None):
+            return web.Response(status=400, text=f"{REPLAY_ORIGIN_HEADER} header is required")
+
+        data = None
+        if (request.method == "POST"):
+            data = await request.text()
+
+        fixture = self.__fixtures.get((request.method, str(URL(origin).origin()), request.raw_path, data))
+        if (fixture is None):
+            return web.Response(status=404, text=f"No fixture for {request.method} {origin}{request.raw_path}")
+
+        if (self.latency and fixture.elapsed > 0):
+            await asyncio.sleep(fixture.elapsed)
+
+        content_type = "text/html"
+        if (fixture.body.lstrip()[:1] in ("{", "[")):
+            content_type = "application/json"
+        return web.Response(text=fixture.body, content_type=content_type, charset="utf-8")
+
+    #Ключ в том виде, в каком запрос приходит на сервер: путь с query в закодированном виде, пустой путь - "/"
+    @staticmethod
+    def __get_key(method: str, url: str, data: Union[str, None]) -> tuple:
+        source = URL(url)
+        path = source.raw_path or "/"
+        if (source.raw_query_string != ""):
+            path += "?" + source.raw_query_string
+        return (method, str(source.origin()), path, data)
+
+    @staticmethod
+    def __load_stores(directory: str) -> list[FixtureStore]:
+        stores = []
+        root = FixtureStore(directory)
+        if (root.exists()):
+            stores.append(root)
+
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if (os.path.isdir(path)):
+                store = FixtureStore(path)
+                if (store.exists()):
+                    stores.append(store)
+
+        return stores
+
+
+#Момент записи корпуса канала: directory/<channel>/manifest.json или корпус одного канала в самой directory
+def get_recorded_at(directory: str, channel: str) -> Union[datetime, None]:
+    for path in (os.path.join(directory, channel), directory):
+        store = FixtureStore(path)
+        if (store.exists()):
+            return store.recorded_at
+    return None
+
+#Режим --replay: URL дней, тела запросов и даты, отсчитанные от текущего дня, должны совпадать с записанными,
+#поэтому "текущее время" парсера канала - момент записи корпуса этого канала (ParserOptions.now).
+#Возвращает копию options, без корпуса канала - сами options
+def get_replay_parser_options(options: ParserOptions, directory: str, channel: str) -> ParserOptions:
+    recorded_at = get_recorded_at(directory, channel)
+    if (recorded_at is None):
+        return options
+
+    replay_options = copy(options)
+    replay_options.now = recorded_at
+    return replay_options
+
+
+#Отдельный сервер для нагрузочных прогонов внешними инструментами:
+#python -m shared.replay -d benchmarks/fixtures -p 8080 --latency
+async def __serve_async(directory: str, port: int, latency: bool):
+    server = ReplayServer(directory, latency)
+    url = await server.start_async(port=port)
+    print(f"replaying {directory} on {url}, pass the source origin in {REPLAY_ORIGIN_HEADER}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+if (__name__ == "__main__"):
+    args_parser = ArgumentParser()
+    args_parser.add_argument("-d", "--directory", required=True)
+    args_parser.add_argument("-p", "--port", type=int, default=8080)
+    args_parser.add_argument("--latency", action="store_true")
+    args = args_parser.parse_args()
+
+    try:
+        asyncio.run(__serve_async(args.directory, args.port, args.latency))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,284 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Union
+
+from .options import RunnerOptions
+from .http import HttpClient
+from .models import TvParser, TvProgramData, TvProgramList
+from .output import out_to_csv_async, out_to_sqlite_async, out_to_xmltv_async, sort_programs
+from .delta import CHANGE_INSERTED, CHANGE_REMOVED, CHANGE_UPDATED, DeltaStore, ProgramChange, write_changes_csv
+from .executor import shutdown_process_pool
+
+#Результат работы одного парсера в рамках общего запуска
+class ChannelResult:
+    channel: str
+    programs: list[TvProgramData]
+    #время работы парсера (parse_async) в секундах
+    elapsed: float
+    #исключение, если парсер упал
+    error: Union[Exception, None]
+    #результат взят из кеша снимков (stale-while-revalidate), свежий парсится в фоне
+    stale: bool
+    #изменения относительно прошлого запуска (режим --delta), None - не считались
+    changes: Union[list[ProgramChange], None]
+
+    def __init__(
+        self,
+        channel: str,
+        programs: list[TvProgramData],
+        elapsed: float,
+        error: Union[Exception, None] = None,
+        stale: bool = False
+    ):
+        self.channel = channel
+        self.programs = programs
+        self.elapsed = elapsed
+        self.error = error
+        self.stale = stale
+        self.changes = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
+
+
+#фоновые обновления каналов, запущенные в режиме stale-while-revalidate
+__background_refreshes: set[asyncio.Task] = set()
+
+#Запускает парсер канала; успешный результат сохраняется в кеш снимков
+async def refresh_channel_async(channel: str, parser: TvParser) -> ChannelResult:
+    started = time.perf_counter()
+    try:
+        programs = await parser.parse_async()
+    except Exception as ex:
+        #падение одного канала не должно ронять остальные
+        return ChannelResult(channel, [], time.perf_counter() - started, ex)
+
+    if (parser.snapshot_cache is not None):
+        await asyncio.to_thread(parser.snapshot_cache.store_result, channel, programs)
+
+    return ChannelResult(channel, programs, time.perf_counter() - started)
+
+async def __background_refresh_async(
+    channel: str,
+    parser: TvParser,
+    on_refreshed: Union[Callable[[ChannelResult], Awaitable[None]], None]
+) -> ChannelResult:
+    result = await refresh_channel_async(channel, parser)
+    if (result.is_success and on_refreshed is not None):
+        await on_refreshed(result)
+    return result
+
+#stale_while_revalidate - если в кеше снимков есть прошлый успешный результат канала,
+#он возвращается сразу, а парсер запускается в фоне; по завершении вызывается on_refreshed
+async def parse_channel_async(
+    channel: str,
+    parser: TvParser,
+    stale_while_revalidate: bool = False,
+    on_refreshed: Union[Callable[[ChannelResult], Awaitable[None]], None] = None
+) -> ChannelResult:
+    if (stale_while_revalidate and parser.snapshot_cache is not None):
+        started = time.perf_counter()
+        programs = await asyncio.to_thread(parser.snapshot_cache.load_result, channel)
+        if (programs is not None):
+            task = asyncio.create_task(
+                __background_refresh_async(channel, parser, on_refreshed)
+            )
+            __background_refreshes.add(task)
+            task.add_done_callback(__background_refreshes.discard)
+            return ChannelResult(channel, programs, time.perf_counter() - started, stale=True)
+
+    return await refresh_channel_async(channel, parser)
+
+#Дожидается фоновых обновлений, запущенных parse_channel_async
+async def wait_background_refreshes_async() -> list[ChannelResult]:
+    if (len(__background_refreshes) == 0):
+        return []
+
+    return list(await asyncio.gather(*__background_refreshes))
+
+#В режиме --delta сравнивает успешный свежий результат канала с прошлой версией и сохраняет новую.
+#Результат из кеша снимков (stale) считается неизменным
+async def __update_delta_async(result: ChannelResult, store: DeltaStore) -> list[ProgramChange]:
+    result.changes = []
+    if (result.is_success and not result.stale):
+        result.changes = await asyncio.to_thread(store.update, result.channel, result.programs)
+    return result.changes
+
+#Сохраняет результат канала при раздельном выводе: csv (или изменения в режиме --delta) и SQLite
+async def out_channel_async(result: ChannelResult, options: RunnerOptions):
+    save_options = options.get_save_options(result.channel)
+    if (options.sqlite_path is not None and not result.stale):
+        await out_to_sqlite_async(result.programs, options.sqlite_path)
+
+    if (options.delta_dir is None):
+        await out_to_csv_async(result.programs, save_options)
+        return
+
+    changes = await __update_delta_async(result, DeltaStore(options.delta_dir))
+    await asyncio.to_thread(write_changes_csv, changes, save_options)
+
+async def __parse_channel_out_to_csv_async(
+    channel: str,
+    parser: TvParser,
+    options: RunnerOptions
+) -> ChannelResult:
+    async def out_refreshed_to_csv_async(result: ChannelResult):
+        await out_channel_async(result, options)
+
+    result = await parse_channel_async(
+        channel,
+        parser,
+        options.stale_while_revalidate,
+        out_refreshed_to_csv_async
+    )
+    if (result.is_success):
+        await out_channel_async(result, options)
+
+    return result
+
+async def __out_merged_async(results: list[ChannelResult], options: RunnerOptions):
+    save_options = options.get_save_options(None)
+    if (options.sqlite_path is not None):
+        programs = TvProgramList()
+        for result in results:
+            if (not result.stale):
+                programs.extend(result.programs)
+        await out_to_sqlite_async(programs, options.sqlite_path)
+
+    if (options.delta_dir is None):
+        merged = TvProgramList()
+        for result in results:
+            merged.extend(result.programs)
+        await out_to_csv_async(merged, save_options)
+        return
+
+    store = DeltaStore(options.delta_dir)
+    changes = []
+    for result in results:
+        #при перезаписи после фонового обновления изменения остальных каналов уже посчитаны
+        if (result.changes is None):
+            await __update_delta_async(result, store)
+        changes.extend(result.changes)
+    await asyncio.to_thread(write_changes_csv, changes, save_options)
+
+#Объединенный вывод: общий файл пишется после завершения всех парсеров.
+#В режиме stale-while-revalidate каждое завершившееся фоновое обновление заменяет снимок канала,
+#и общий файл перезаписывается последними результатами всех каналов
+async def __parse_merged_async(
+    parsers: dict[str, TvParser],
+    options: RunnerOptions
+) -> list[ChannelResult]:
+    latest: dict[str, ChannelResult] = {}
+    merge_lock = asyncio.Lock()
+    written = False
+
+    def get_latest_results() -> list[ChannelResult]:
+        return [latest[channel] for channel in parsers if channel in latest]
+
+    async def out_refreshed_merged_async(result: ChannelResult):
+        async with merge_lock:
+            latest[result.channel] = result
+            #до первой записи в latest еще нет остальных каналов
+            if (written):
+                await __out_merged_async(get_latest_results(), options)
+
+    results = await asyncio.gather(*[
+        parse_channel_async(channel, parser, options.stale_while_revalidate, out_refreshed_merged_async)
+        for channel, parser in parsers.items()
+    ])
+
+    async with merge_lock:
+        for result in results:
+            #фоновое обновление могло завершиться раньше остальных каналов
+            latest.setdefault(result.channel, result)
+        written = True
+        await __out_merged_async(get_latest_results(), options)
+
+    return list(results)
+
+#Запускает все парсеры конкурентно в одном event loop.
+#При раздельном выводе csv канала пишется сразу по готовности,
+#при объединенном - один файл после завершения всех парсеров, в порядке options.channels.
+#В режиме stale-while-revalidate сначала пишутся снимки, затем csv каналов (или общий csv)
+#перезаписываются по мере завершения фоновых обновлений.
+#В режиме --delta вместо полного csv пишутся изменения (shared/delta.py).
+#С --xmltv после всех каналов (и фоновых обновлений) пишется общий XMLTV
+async def run_parsers_out_to_csv_async(
+    parsers: dict[str, TvParser],
+    options: RunnerOptions
+) -> list[ChannelResult]:
+    if (options.merge):
+        results = await __parse_merged_async(parsers, options)
+    else:
+        results = await asyncio.gather(*[
+            __parse_channel_out_to_csv_async(channel, parser, options)
+            for channel, parser in parsers.items()
+        ])
+
+    results = list(results) + await wait_background_refreshes_async()
+    if (options.xmltv_path is not None):
+        await __out_xmltv_async(results, options.xmltv_path)
+    return results
+
+#Один XMLTV на все каналы; для канала берется последний успешный результат (фоновое обновление идет после снимка)
+async def __out_xmltv_async(results: list[ChannelResult], xmltv_path: str):
+    latest = {}
+    for result in results:
+        if (result.is_success):
+            latest[result.channel] = result.programs
+
+    await out_to_xmltv_async(
+        [(channel, sort_programs(programs)) for channel, programs in latest.items()],
+        xmltv_path
+    )
+
+#http_client - общий клиент, внедренный в парсеры, закрывается после завершения всех парсеров
+async def __run_with_http_client_async(
+    parsers: dict[str, TvParser],
+    options: RunnerOptions,
+    http_client: HttpClient
+) -> list[ChannelResult]:
+    async with http_client:
+        return await run_parsers_out_to_csv_async(parsers, options)
+
+def run_parsers_out_to_csv(
+    parsers: dict[str, TvParser],
+    options: RunnerOptions,
+    http_client: HttpClient
+) -> list[ChannelResult]:
+    try:
+        return asyncio.run(
+            __run_with_http_client_async(parsers, options, http_client)
+        )
+    finally:
+        shutdown_process_pool()
+
+def __format_changes(changes: list[ProgramChange]) -> str:
+    counts = {CHANGE_INSERTED: 0, CHANGE_UPDATED: 0, CHANGE_REMOVED: 0}
+    for change in changes:
+        counts[change.kind] += 1
+    return f"+{counts[CHANGE_INSERTED]} ~{counts[CHANGE_UPDATED]} -{counts[CHANGE_REMOVED]}"
+
+def format_report(results: list[ChannelResult], total_elapsed: float) -> str:
+    lines = []
+    channel_width = max([len("channel")] + [len(result.channel) for result in results])
+
+    lines.append(f"{'channel'.ljust(channel_width)}\tprograms\tseconds\tstatus")
+    for result in results:
+        status = "ok"
+        if (not result.is_success):
+            status = f"error: {result.error!r}"
+        elif (result.stale):
+            status = "stale"
+        if (result.is_success and result.changes is not None):
+            status += "\t" + __format_changes(result.changes)
+        lines.append(
+            f"{result.channel.ljust(channel_width)}"
+            + f"\t{len(result.programs)}"
+            + f"\t{result.elapsed:.3f}"
+            + f"\t{status}"
+        )
+    lines.append(f"{'total'.ljust(channel_width)}\t\t{total_elapsed:.3f}")
+
+    return "\n".join(lines)
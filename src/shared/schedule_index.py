@@ -0,0 +1,152 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable, Iterator, Mapping, Union
+
+from .models import TvProgramData
+
+#Расписание одного канала, отсортированное по времени начала.
+#Время начала и фактического окончания хранится unix временем в массивах, поиск - бинарный.
+#Фактическое окончание - datetime_finish, а если его нет - начало следующей программы;
+#у последней программы без datetime_finish (парсеры без remove_last) окончание неизвестно, она считается идущей
+class ChannelSchedule:
+    #ключ канала из каталога (shared/registry.py)
+    channel: str
+    programs: list[TvProgramData]
+
+    __OPEN_FINISH = float("inf")
+
+    def __init__(self, channel: str, programs: Iterable[TvProgramData]):
+        self.channel = channel
+
+        #при одинаковом времени начала остается программа, полученная последней
+        by_start = {}
+        for program in programs:
+            by_start[program.datetime_start.timestamp()] = program
+
+        self.__starts = array("d", sorted(by_start))
+        self.programs = [by_start[start] for start in self.__starts]
+        self.__finishes = array("d", self.__get_finishes())
+
+    def __get_finishes(self) -> Iterable[float]:
+        for index, program in enumerate(self.programs):
+            if (program.datetime_finish is not None):
+                yield program.datetime_finish.timestamp()
+            elif (index + 1 < len(self.programs)):
+                yield self.__starts[index + 1]
+            else:
+                yield self.__OPEN_FINISH
+
+    def __len__(self) -> int:
+        return len(self.programs)
+
+    #Программа, идущая в момент moment
+    def get_at(self, moment: datetime) -> Union[TvProgramData, None]:
+        moment_ts = moment.timestamp()
+        index = bisect_right(self.__starts, moment_ts) - 1
+        if (index < 0 or self.__finishes[index] <= moment_ts):
+            return None
+        return self.programs[index]
+
+    #Первая программа, начинающаяся после момента moment
+    def get_next(self, moment: datetime) -> Union[TvProgramData, None]:
+        index = bisect_right(self.__starts, moment.timestamp())
+        if (index >= len(self.programs)):
+            return None
+        return self.programs[index]
+
+    #Программы, идущие в интервале [start, finish).
+    #Расписание канала не пересекается, поэтому из начавшихся до start в интервал может попасть только последняя
+    def get_window(self, start: datetime, finish: datetime) -> list[TvProgramData]:
+        start_ts = start.timestamp()
+        first = bisect_right(self.__starts, start_ts) - 1
+        if (first < 0 or self.__finishes[first] <= start_ts):
+            first += 1
+        last = bisect_left(self.__starts, finish.timestamp())
+        return self.programs[first:last]
+
+
+#Индекс расписания всех каналов для запросов "что идет сейчас и что дальше".
+#Строится из результатов парсеров; при обновлении канала перестраивается только его расписание.
+#Каналы везде (update, запросы, ключи результатов) - ключи каталога, как в run.py и daemon,
+#а не TvProgramData.channel: отображаемое название у разных парсеров может совпадать или меняться
+class ScheduleIndex:
+    #channels - ключ канала -> результат его парсера
+    def __init__(self, channels: Union[Mapping[str, Iterable[TvProgramData]], None] = None):
+        self.__channels: dict[str, ChannelSchedule] = {}
+
+        for channel, programs in (channels or {}).items():
+            self.update(channel, programs)
+
+    @property
+    def channels(self) -> list[str]:
+        return sorted(self.__channels)
+
+    def __len__(self) -> int:
+        return sum(len(schedule) for schedule in self.__channels.values())
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self.__channels
+
+    #Все программы: каналы по алфавиту, внутри канала - по времени начала
+    def __iter__(self) -> Iterator[TvProgramData]:
+        for channel in self.channels:
+            yield from self.__channels[channel].programs
+
+    #Заменяет расписание канала новым результатом парсера
+    def update(self, channel: str, programs: Iterable[TvProgramData]):
+        schedule = ChannelSchedule(channel, programs)
+        if (len(schedule) == 0):
+            self.__channels.pop(channel, None)
+        else:
+            self.__channels[channel] = schedule
+
+    def remove(self, channel: str):
+        self.__channels.pop(channel, None)
+
+    def get_schedule(self, channel: str) -> Union[ChannelSchedule, None]:
+        return self.__channels.get(channel)
+
+    def get_at(self, channel: str, moment: datetime) -> Union[TvProgramData, None]:
+        schedule = self.__channels.get(channel)
+        if (schedule is None):
+            return None
+        return schedule.get_at(moment)
+
+    def get_next(self, channel: str, moment: datetime) -> Union[TvProgramData, None]:
+        schedule = self.__channels.get(channel)
+        if (schedule is None):
+            return None
+        return schedule.get_next(moment)
+
+    #Для каждого канала - программа, идущая в момент moment, и следующая за ней
+    def get_now_next(
+        self,
+        moment: datetime,
+        channels: Union[Iterable[str], None] = None
+    ) -> dict[str, tuple[Union[TvProgramData, None], Union[TvProgramData, None]]]:
+        result = {}
+        for schedule in self.__get_schedules(channels):
+            result[schedule.channel] = (schedule.get_at(moment), schedule.get_next(moment))
+        return result
+
+    def get_window(
+        self,
+        start: datetime,
+        finish: datetime,
+        channels: Union[Iterable[str], None] = None
+    ) -> dict[str, list[TvProgramData]]:
+        return {
+            schedule.channel: schedule.get_window(start, finish)
+            for schedule in self.__get_schedules(channels)
+        }
+
+    def __get_schedules(self, channels: Union[Iterable[str], None]) -> list[ChannelSchedule]:
+        if (channels is None):
+            return [self.__channels[channel] for channel in self.channels]
+
+        return [
+            self.__channels[channel]
+            for channel in channels
+                if channel in self.__channels
+        ]
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Union
+
+#shared.models сам импортирует этот модуль
+if TYPE_CHECKING:
+    from .models import TvProgramData
+
+#Дисковый кеш результатов разбора.
+#programs/ - результат разбора одной страницы, привязанный к sha256 ее тела:
+#если тело совпадает побайтно с прошлым запуском, DOM не строится вовсе.
+#results/ - последний успешный итоговый результат канала (для stale-while-revalidate)
+class SnapshotCache:
+    directory: str
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "programs"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "results"), exist_ok=True)
+
+    @staticmethod
+    def hash_body(body: str) -> str:
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    def load_programs(self, parser_name: str, url: str, args: tuple, body_hash: str) -> Any:
+        snapshot = self.__load(self.__get_programs_path(parser_name, url, args))
+        if (snapshot is None or snapshot[0] != body_hash):
+            return None
+
+        return snapshot[1]
+
+    def store_programs(self, parser_name: str, url: str, args: tuple, body_hash: str, programs: Any):
+        self.__store(
+            self.__get_programs_path(parser_name, url, args),
+            (body_hash, programs)
+        )
+
+    def load_result(self, channel: str) -> Union[list["TvProgramData"], None]:
+        return self.__load(self.__get_result_path(channel))
+
+    def store_result(self, channel: str, programs: list["TvProgramData"]):
+        self.__store(self.__get_result_path(channel), programs)
+
+    def __get_programs_path(self, parser_name: str, url: str, args: tuple) -> str:
+        key = "|".join([parser_name, url, *self.get_args_key(args)])
+        return os.path.join(
+            self.directory,
+            "programs",
+            hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pickle"
+        )
+
+    def __get_result_path(self, channel: str) -> str:
+        return os.path.join(self.directory, "results", f"{channel}.pickle")
+
+    #Ключ аргументов разбора (parse(body, *args)), тот же используется для общих результатов в памяти.
+    #День, от которого парсер отсчитывает время, обычно получен из datetime.now(),
+    #поэтому в ключе учитываются только дата и временная зона
+    @staticmethod
+    def get_args_key(args: tuple) -> tuple[str, ...]:
+        return tuple(SnapshotCache.__get_arg_key(arg) for arg in args)
+
+    @staticmethod
+    def __get_arg_key(arg: Any) -> str:
+        if (isinstance(arg, datetime)):
+            return f"{arg.date().isoformat()}{arg.tzinfo}"
+        return repr(arg)
+
+    @staticmethod
+    def __load(path: str) -> Any:
+        try:
+            with open(path, "rb") as snapshot_file:
+                return pickle.load(snapshot_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    @staticmethod
+    def __store(path: str, value: Any):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as snapshot_file:
+            pickle.dump(value, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
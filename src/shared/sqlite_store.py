@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, Union
+
+from .models import TvProgramData
+from .utils import replace_spaces
+
+#Хранилище расписания в SQLite (WAL).
+#Программа идентифицируется каналом и временем начала: повторная запись обновляет ее, история не теряется.
+#Время хранится и текстом с исходной зоной (как в csv), и unix временем для запросов по интервалам.
+#Методы синхронные, из event loop вызываются через asyncio.to_thread
+class ScheduleDatabase:
+    path: str
+
+    __SCHEMA = """
+    CREATE TABLE IF NOT EXISTS programs (
+        channel TEXT NOT NULL,
+        start_ts INTEGER NOT NULL,
+        finish_ts INTEGER,
+        datetime_start TEXT NOT NULL,
+        datetime_finish TEXT,
+        title TEXT NOT NULL,
+        channel_logo_url TEXT,
+        description TEXT,
+        available_archive INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        PRIMARY KEY (channel, start_ts)
+    );
+    CREATE INDEX IF NOT EXISTS programs_finish ON programs (finish_ts);
+    """
+
+    __UPSERT = """
+    INSERT INTO programs (
+        channel, start_ts, finish_ts, datetime_start, datetime_finish,
+        title, channel_logo_url, description, available_archive, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, strftime('%s', 'now'))
+    ON CONFLICT (channel, start_ts) DO UPDATE SET
+        finish_ts = excluded.finish_ts,
+        datetime_start = excluded.datetime_start,
+        datetime_finish = excluded.datetime_finish,
+        title = excluded.title,
+        channel_logo_url = excluded.channel_logo_url,
+        description = excluded.description,
+        available_archive = excluded.available_archive,
+        updated_at = excluded.updated_at
+    """
+
+    __COLUMNS = "datetime_start, datetime_finish, channel, title, channel_logo_url, description, available_archive"
+
+    @staticmethod
+    def __to_timestamp(date: Union[datetime, None]) -> Union[int, None]:
+        if (date is None):
+            return None
+        return int(date.timestamp())
+
+    @staticmethod
+    def __to_text(date: Union[datetime, None]) -> Union[str, None]:
+        if (date is None):
+            return None
+        return date.isoformat("T", "seconds")
+
+    @staticmethod
+    def __to_row(program: TvProgramData) -> tuple:
+        description = program.description
+        if (description is not None):
+            description = replace_spaces(description)
+
+        return (
+            replace_spaces(program.channel),
+            ScheduleDatabase.__to_timestamp(program.datetime_start),
+            ScheduleDatabase.__to_timestamp(program.datetime_finish),
+            ScheduleDatabase.__to_text(program.datetime_start),
+            ScheduleDatabase.__to_text(program.datetime_finish),
+            replace_spaces(program.title),
+            program.channel_logo_url,
+            description,
+            1 if program.available_archive else 0
+        )
+
+    @staticmethod
+    def __from_row(row: tuple) -> TvProgramData:
+        return TvProgramData(
+            datetime.fromisoformat(row[0]),
+            datetime.fromisoformat(row[1]) if row[1] is not None else None,
+            row[2],
+            row[3],
+            row[4],
+            row[5],
+            bool(row[6])
+        )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(self.__SCHEMA)
+
+    #Вставляет программы одной транзакцией, существующие (тот же канал и время начала) обновляются
+    def upsert(self, programs: Iterable[TvProgramData]) -> int:
+        rows = [self.__to_row(program) for program in programs]
+        with self.__lock, self.__connection:
+            self.__connection.executemany(self.__UPSERT, rows)
+        return len(rows)
+
+    #Программы, идущие в интервале [start, finish): начались до finish и закончились после start
+    #(программа без даты окончания попадает, если началась внутри интервала)
+    def get_programs(
+        self,
+        start: datetime,
+        finish: datetime,
+        channels: Union[Iterable[str], None] = None
+    ) -> list[TvProgramData]:
+        start_ts = self.__to_timestamp(start)
+        finish_ts = self.__to_timestamp(finish)
+        query = (
+            f"SELECT {self.__COLUMNS} FROM programs"
+            + " WHERE start_ts < ? AND (finish_ts > ? OR (finish_ts IS NULL AND start_ts >= ?))"
+        )
+        params = [finish_ts, start_ts, start_ts]
+
+        if (channels is not None):
+            channels = list(channels)
+            query += f" AND channel IN ({', '.join('?' for _ in channels)})"
+            params.extend(channels)
+
+        query += " ORDER BY channel, start_ts"
+        with self.__lock:
+            rows = self.__connection.execute(query, params).fetchall()
+        return [self.__from_row(row) for row in rows]
+
+    #Программы, идущие в момент moment
+    def get_current(self, moment: datetime, channels: Union[Iterable[str], None] = None) -> list[TvProgramData]:
+        moment_ts = self.__to_timestamp(moment)
+        query = f"SELECT {self.__COLUMNS} FROM programs WHERE start_ts <= ? AND finish_ts > ?"
+        params = [moment_ts, moment_ts]
+
+        if (channels is not None):
+            channels = list(channels)
+            query += f" AND channel IN ({', '.join('?' for _ in channels)})"
+            params.extend(channels)
+
+        query += " ORDER BY channel"
+        with self.__lock:
+            rows = self.__connection.execute(query, params).fetchall()
+        return [self.__from_row(row) for row in rows]
+
+    def get_channels(self) -> list[str]:
+        with self.__lock:
+            rows = self.__connection.execute("SELECT DISTINCT channel FROM programs ORDER BY channel").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,253 @@
+from html.parser import HTMLParser
+from typing import Callable, Union
+
+#Элементы без закрывающего тэга
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+#Элементы, внутри которых bs4 не сворачивает пробельные строки
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+#Пробельные символы, из которых состоит сворачиваемая строка (BeautifulSoup.ASCII_SPACES)
+__ASCII_SPACES = frozenset("\x20\x0a\x09\x0c\x0d")
+
+#Текст между тэгами так же, как его сохраняет bs4: строка только из пробельных символов
+#заменяется на "\n" (если в ней был перенос строки) или " ", кроме строк внутри pre и textarea
+def normalize_data(data: str, preserve_whitespace: bool = False) -> str:
+    if (preserve_whitespace or not all(char in __ASCII_SPACES for char in data)):
+        return data
+    if ("\n" in data):
+        return "\n"
+    return " "
+
+#Комментарий внутри строки таблицы. Как и bs4 Comment, это строка (попадает в get_node_text),
+#но не входит в .text
+class StreamComment(str):
+    pass
+
+
+#Легковесный узел дерева одной строки таблицы.
+#Повторяет ту часть API bs4, которой пользуются парсеры (find, find_all, .next, .children, .text, .attrs,
+#обращение к дочернему тэгу через атрибут), поэтому к нему применима shared.utils.get_node_text
+class StreamNode:
+    name: str
+    attrs: dict[str, str]
+    contents: list[Union["StreamNode", str]]
+
+    def __init__(self, name: str, attrs: dict[str, str]):
+        self.name = name
+        self.attrs = attrs
+        self.contents = []
+
+    @property
+    def children(self):
+        return iter(self.contents)
+
+    #Первый дочерний узел, для строки таблицы совпадает с bs4 Tag.next
+    @property
+    def next(self):
+        if (len(self.contents) == 0):
+            return None
+        return self.contents[0]
+
+    @property
+    def text(self) -> str:
+        parts = []
+        stack = [self]
+        while (len(stack) > 0):
+            node = stack.pop()
+            if (isinstance(node, StreamComment)):
+                continue
+            if (isinstance(node, str)):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.contents))
+        return "".join(parts)
+
+    def matches(self, name: Union[str, None], attrs: Union[dict[str, str], None] = None) -> bool:
+        if (name is not None and self.name != name):
+            return False
+
+        for key, value in (attrs or {}).items():
+            actual = self.attrs.get(key)
+            if (actual is None):
+                return False
+            if (key == "class"):
+                if (value != actual and value not in actual.split()):
+                    return False
+            elif (actual != value):
+                return False
+
+        return True
+
+    def find_all(
+        self,
+        name: Union[str, None] = None,
+        attrs: Union[dict[str, str], None] = None,
+        recursive: bool = True
+    ) -> list["StreamNode"]:
+        result = []
+        stack = [child for child in reversed(self.contents) if not isinstance(child, str)]
+        while (len(stack) > 0):
+            node = stack.pop()
+            if (node.matches(name, attrs)):
+                result.append(node)
+            if (recursive):
+                stack.extend(child for child in reversed(node.contents) if not isinstance(child, str))
+        return result
+
+    def find(
+        self,
+        name: Union[str, None] = None,
+        attrs: Union[dict[str, str], None] = None,
+        recursive: bool = True
+    ) -> Union["StreamNode", None]:
+        stack = [child for child in reversed(self.contents) if not isinstance(child, str)]
+        while (len(stack) > 0):
+            node = stack.pop()
+            if (node.matches(name, attrs)):
+                return node
+            if (recursive):
+                stack.extend(child for child in reversed(node.contents) if not isinstance(child, str))
+        return None
+
+    def __getattr__(self, name: str):
+        if (name.startswith("__")):
+            raise AttributeError(name)
+        return self.find(name)
+
+
+#Потоковое (SAX) извлечение строк таблицы.
+#Принимает куски html по мере загрузки (feed), внутри контейнера (container_name + container_attrs)
+#собирает только дерево текущей строки (row_name) и отдает его в on_row(row, container_index).
+#row_parent - строкой считается только row_name, непосредственно вложенный в этот тэг (tbody > tr),
+#None - любой row_name внутри контейнера.
+#После закрытия max_containers контейнеров выставляет done - остаток страницы можно не загружать
+class StreamingRowExtractor(HTMLParser):
+    done: bool
+
+    def __init__(
+        self,
+        on_row: Callable[[StreamNode, int], None],
+        container_name: str,
+        container_attrs: Union[dict[str, str], None] = None,
+        row_name: str = "tr",
+        max_containers: Union[int, None] = 1,
+        row_parent: Union[str, None] = None
+    ):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.__on_row = on_row
+        self.__container = StreamNode(container_name, container_attrs or {})
+        self.__row_name = row_name
+        self.__row_parent = row_parent
+        self.__max_containers = max_containers
+        self.__container_index = 0
+        #имена открытых тэгов внутри текущего контейнера
+        self.__open_tags = []
+        #открытые узлы текущей строки, [0] - сама строка
+        self.__row_stack = []
+        #текст, пришедший после последнего тэга: html.parser может отдать его по частям,
+        #а bs4 склеивает части в одну строку до нормализации
+        self.__data = []
+
+    def feed(self, data: str):
+        if (not self.done):
+            super().feed(data)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Union[str, None]]]):
+        self.__flush_data()
+        if (self.done):
+            return
+
+        if (len(self.__open_tags) == 0):
+            if (tag == self.__container.name and StreamNode(tag, self.__to_dict(attrs)).matches(None, self.__container.attrs)):
+                self.__open_tags.append(tag)
+            return
+
+        if (len(self.__row_stack) > 0):
+            node = StreamNode(tag, self.__to_dict(attrs))
+            self.__row_stack[-1].contents.append(node)
+            if (tag not in VOID_TAGS):
+                self.__row_stack.append(node)
+        elif (tag == self.__row_name and (self.__row_parent is None or self.__open_tags[-1] == self.__row_parent)):
+            self.__row_stack.append(StreamNode(tag, self.__to_dict(attrs)))
+
+        if (tag not in VOID_TAGS):
+            self.__open_tags.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, Union[str, None]]]):
+        self.handle_starttag(tag, attrs)
+        if (tag not in VOID_TAGS):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str):
+        self.__flush_data()
+        if (self.done or len(self.__open_tags) == 0 or tag not in self.__open_tags):
+            return
+
+        #незакрытые вложенные тэги (<td> без </td>) закрываются вместе с родителем
+        while (len(self.__open_tags) > 0):
+            open_tag = self.__open_tags.pop()
+            self.__close_row_node(open_tag)
+            if (open_tag == tag):
+                break
+
+        if (len(self.__open_tags) == 0):
+            self.__container_index += 1
+            if (self.__max_containers is not None and self.__container_index >= self.__max_containers):
+                self.done = True
+
+    def handle_data(self, data: str):
+        if (len(self.__row_stack) > 0):
+            self.__data.append(data)
+
+    def handle_comment(self, data: str):
+        self.__flush_data()
+        if (len(self.__row_stack) > 0):
+            self.__row_stack[-1].contents.append(StreamComment(data))
+
+    def close(self):
+        super().close()
+        self.__flush_data()
+
+    def __flush_data(self):
+        if (len(self.__data) == 0):
+            return
+
+        data = "".join(self.__data)
+        self.__data.clear()
+        if (data == ""):
+            return
+        preserve_whitespace = any(node.name in PRESERVE_WHITESPACE_TAGS for node in self.__row_stack)
+        self.__row_stack[-1].contents.append(normalize_data(data, preserve_whitespace))
+
+    def __close_row_node(self, tag: str):
+        if (len(self.__row_stack) == 0 or self.__row_stack[-1].name != tag):
+            return
+
+        node = self.__row_stack.pop()
+        if (len(self.__row_stack) == 0):
+            self.__on_row(node, self.__container_index)
+
+    @staticmethod
+    def __to_dict(attrs: list[tuple[str, Union[str, None]]]) -> dict[str, str]:
+        return {key: value if value is not None else "" for key, value in attrs}
+
+
+def extract_rows(
+    html_text: str,
+    container_name: str,
+    container_attrs: Union[dict[str, str], None] = None,
+    row_name: str = "tr"
+) -> list[StreamNode]:
+    rows = []
+    extractor = StreamingRowExtractor(
+        lambda row, _: rows.append(row),
+        container_name,
+        container_attrs,
+        row_name
+    )
+    extractor.feed(html_text)
+    extractor.close()
+    return rows
@@ -0,0 +1,43 @@
+from typing import Union
+
+#Строки, которые считаются пустыми (пробельный символ целиком, а не строка из пробелов)
+__EMPTY_STRINGS = frozenset(["", " ", "\t", "\n", "\r"])
+
+def is_none_or_empty(string: Union[str, None]):
+    if (string is None):
+        return True
+
+    return string in __EMPTY_STRINGS
+
+#Удаляет пустые символы из начала и конца строк
+#(те же символы, что считает пустыми is_none_or_empty)
+def replace_spaces(string: str):
+    return string.strip(" \t\n\r")
+
+#Обход узла в глубину, возвращающий текст без тэгов.
+#Строки, состоящие из одного пустого символа, пропускаются,
+#перед тэгом p добавляется перенос строки, если текст уже есть; тэг br игнорируется.
+#Работает за линейное время: стек итераторов по детям вместо вставок в начало списка,
+#части текста собираются в список и склеиваются один раз
+def get_node_text(node):
+    if (isinstance(node, str)):
+        return node
+
+    parts = []
+    stack = [iter(node.children)]
+
+    while (len(stack) > 0):
+        child = next(stack[-1], None)
+        if (child is None):
+            stack.pop()
+            continue
+
+        if (isinstance(child, str)):
+            if (child not in __EMPTY_STRINGS):
+                parts.append(child)
+        else:
+            if (child.name == "p" and len(parts) > 0):
+                parts.append("\n")
+            stack.append(iter(child.children))
+
+    return "".join(parts)
@@ -1,9 +1,13 @@
 from datetime import datetime, timedelta
 from typing import Union
-from .models import TvProgramData
-
-def get_monday_datetime(timezone):
-    now = datetime.now(timezone)
+from .models import TvProgramData, TvProgramList
+#функции работы с текстом вынесены в shared/text.py, здесь оставлены для существующих импортов
+from .text import get_node_text, is_none_or_empty, replace_spaces
+
+#now - текущий момент парсера (TvParser.now), None - datetime.now()
+def get_monday_datetime(timezone, now: Union[datetime, None] = None):
+    if (now is None):
+        now = datetime.now(timezone)
     now -= timedelta(days=now.weekday())
     return now
 
@@ -16,7 +20,11 @@ def format_date(date: Union[datetime, None]):
 #Заполняет дату и время для каждой программы, 
 #основываясь на дате начала предыдущей программы.
 #Для последней программы дата окончания 23:59 этого же дня
-def fill_finish_date_by_next_start_date(tv_programs: list[TvProgramData], remove_last = False):
+def fill_finish_date_by_next_start_date(tv_programs: Union[list[TvProgramData], TvProgramList], remove_last = False):
+    if (isinstance(tv_programs, TvProgramList)):
+        tv_programs.fill_finish_date_by_next_start_date(remove_last)
+        return
+
     for i in range(1, len(tv_programs)):
         tv_programs[i-1].datetime_finish = tv_programs[i].datetime_start
 
@@ -32,50 +40,3 @@ def fill_finish_date_by_next_start_date(tv_programs: list[TvProgramData], remove
         hour=23,
         minute=59
     )
-
-def is_none_or_empty(string: str):
-    if (string is None):
-        return True
-    
-    return string == "" or string == " " or string == "\t" or string == "\n" or string == "\r"
-
-
-#рекурсивный обход узла, возвращающий текст без тэгов
-#игнорирует тэг br
-def get_node_text(node):
-        if (isinstance(node, str)):
-            return node
-
-        stack = [*node.children]
-        result = ""
-
-        while(len(stack) > 0):
-            node = stack.pop(0)
-        
-            if (isinstance(node, str)):
-                if (is_none_or_empty(node)):
-                    continue
-                result += node
-            else:
-                if (node.name == "p" and len(result) > 0):
-                    result += "\n"
-                for index, child in enumerate(node.children):
-                    stack.insert(index, child)
-
-        return result
-
-#Удаляет пустые символы из начала и конца строк
-def replace_spaces(string: str):
-    start = 0
-    end = len(string)
-    for i in string:
-        if (not is_none_or_empty(i)):
-            break
-        start += 1
-
-    for i in reversed(string):
-        if (not is_none_or_empty(i)):
-            break
-        end -= 1
-    
-    return string[start: end]
\ No newline at end of file
@@ -1,8 +1,6 @@
 import asyncio
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
@@ -16,17 +14,15 @@ class SozcuTvParser(TvParser):
     __response_time_zone = timezone(timedelta(hours=3))
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = get_monday_datetime(self.__response_time_zone, self.now(self.__response_time_zone))
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html, current_day)
 
-    def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
+    def __parse_html(self, html_input: str, current_day: datetime):
+        html = self.parse_html(html_input)
         program_days = html.find("div", {"class": "tab-content px-3"})
         parsed_programs = []
 
-        current_day = get_monday_datetime(self.__response_time_zone)
         for current_day_programs in program_days.find_all("div", recursive=False):
             parsed_programs.extend(
                 self.__parse_day_programs(current_day_programs, current_day)
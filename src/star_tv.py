@@ -1,6 +1,5 @@
 
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
 from bs4 import BeautifulSoup
 
@@ -18,10 +17,8 @@ class StartTvParser(TvParser):
     __response_time_zone = timezone(timedelta(hours=3))
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                json = await resp.json()
-                return self.__parse_json(json)
+        json = await self.fetch_json_async(self.__source_url)
+        return self.__parse_json(json)
     
     def __parse_json(self, programs:list[dict]):
         parsed_programs = []
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from shared.delta import CHANGE_INSERTED, CHANGE_REMOVED, CHANGE_UPDATED, DeltaStore, diff_programs
+from shared.models import TvProgramData
+from shared.utils import fill_finish_date_by_next_start_date
+
+MSK = timezone(timedelta(hours=3))
+
+#Расписание в духе cnn_turk: у текущей передачи ("Şimdi") начало - момент запуска
+def __create_schedule(now: datetime, titles: list[str] = None) -> list[TvProgramData]:
+    titles = titles or ["Sabah", "Şimdi", "Akşam", "Gece"]
+    day = now.replace(hour=0, minute=0)
+    starts = [
+        day.replace(hour=6, second=0),
+        now,
+        day.replace(hour=18, second=0),
+        day.replace(hour=22, second=0)
+    ]
+    programs = [TvProgramData(start, None, "cnn türk", title, None, None, False) for start, title in zip(starts, titles)]
+    fill_finish_date_by_next_start_date(programs)
+    return programs
+
+def test_unchanged_schedule_with_now_based_seconds_has_no_changes():
+    first = __create_schedule(datetime(2026, 10, 21, 12, 30, 5, 123456, tzinfo=MSK))
+    second = __create_schedule(datetime(2026, 10, 21, 12, 30, 47, 654321, tzinfo=MSK))
+
+    assert diff_programs(first, second) == []
+
+def test_moved_current_program_is_one_update():
+    first = __create_schedule(datetime(2026, 10, 21, 12, 30, 5, tzinfo=MSK))
+    second = __create_schedule(datetime(2026, 10, 21, 13, 10, 5, tzinfo=MSK))
+
+    changes = diff_programs(first, second)
+    #начало текущей передачи и конец предыдущей
+    assert [(change.kind, change.program.title) for change in changes] == [
+        (CHANGE_UPDATED, "Sabah"),
+        (CHANGE_UPDATED, "Şimdi")
+    ]
+    assert changes[1].previous.datetime_start.hour == 12
+
+def test_other_changes_are_still_reported():
+    now = datetime(2026, 10, 21, 12, 30, tzinfo=MSK)
+    first = __create_schedule(now)
+    second = __create_schedule(now, ["Sabah", "Şimdi", "Akşam", "Film"])
+
+    changes = diff_programs(first, second)
+    assert [(change.kind, change.program.title) for change in changes] == [(CHANGE_UPDATED, "Film")]
+
+    third = __create_schedule(now)[:3] + [TvProgramData(datetime(2026, 10, 21, 23, tzinfo=MSK), None, "cnn türk", "Haber", None, None, False)]
+    changes = diff_programs(first, third)
+    assert sorted((change.kind, change.program.title) for change in changes) == [
+        (CHANGE_INSERTED, "Haber"),
+        (CHANGE_REMOVED, "Gece")
+    ]
+
+def test_fallback_pairs_only_same_title_on_same_day():
+    day = datetime(2026, 10, 21, tzinfo=MSK)
+    first = [
+        TvProgramData(day.replace(hour=10), None, "cnn türk", "Haber", None, None, False),
+        TvProgramData(day.replace(hour=11), None, "cnn türk", "Haber", None, None, False),
+        TvProgramData(day.replace(hour=23), None, "cnn türk", "Film", None, None, False)
+    ]
+    second = [
+        #оба выпуска "Haber" сдвинулись: пары по порядку
+        TvProgramData(day.replace(hour=10, minute=15), None, "cnn türk", "Haber", None, None, False),
+        TvProgramData(day.replace(hour=11, minute=15), None, "cnn türk", "Haber", None, None, False),
+        #тот же фильм на следующий день - другая передача
+        TvProgramData(day.replace(hour=23) + timedelta(hours=2), None, "cnn türk", "Film", None, None, False)
+    ]
+
+    changes = diff_programs(first, second)
+    assert [(change.kind, change.program.datetime_start.hour) for change in changes] == [
+        (CHANGE_UPDATED, 10),
+        (CHANGE_UPDATED, 11),
+        (CHANGE_REMOVED, 23),
+        (CHANGE_INSERTED, 1)
+    ]
+    assert [change.previous.datetime_start.hour for change in changes[:2]] == [10, 11]
+
+def test_delta_store_reports_changes_against_latest_version(tmp_path):
+    store = DeltaStore(str(tmp_path))
+    now = datetime(2026, 10, 21, 12, 30, 5, tzinfo=MSK)
+
+    assert [change.kind for change in store.update("cnn_turk", __create_schedule(now))] == [CHANGE_INSERTED] * 4
+    assert store.update("cnn_turk", __create_schedule(now.replace(second=50))) == []
+    assert len(store.list_versions("cnn_turk")) == 2
+    assert [program.title for program in store.load_latest("cnn_turk")] == ["Sabah", "Şimdi", "Akşam", "Gece"]
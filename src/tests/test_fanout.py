@@ -0,0 +1,46 @@
+import asyncio
+from datetime import UTC, datetime, timedelta, timezone
+
+from shared.fanout import fan_out_days_async, get_option_days
+from shared.models import TvProgramData
+from shared.options import ParserOptions
+from ekol_tv import EkolTvParser
+
+MSK = timezone(timedelta(hours=3))
+
+def test_finish_date_is_inclusive_from_midnight():
+    monday = datetime(2026, 10, 12, tzinfo=MSK)
+    options = ParserOptions(finish_date=datetime(2026, 10, 14, tzinfo=UTC))
+
+    days = get_option_days(options, monday, 6)
+    assert [day.date().isoformat() for day in days] == ["2026-10-12", "2026-10-13", "2026-10-14"]
+
+    #с текущим временем суток последний день выпадает
+    days = get_option_days(options, monday.replace(hour=15), 6)
+    assert [day.date().isoformat() for day in days] == ["2026-10-12", "2026-10-13"]
+
+def test_fan_out_keeps_day_order():
+    async def parse_day(day: datetime):
+        #последний день завершается первым
+        await asyncio.sleep(0.01 * (14 - day.day))
+        return [TvProgramData(day, None, "ekol tv", str(day.day), None, None, False)]
+
+    days = [datetime(2026, 10, day, 6, tzinfo=MSK) for day in (12, 13, 14)]
+    programs = asyncio.run(fan_out_days_async(ParserOptions(day_concurrency=2), days, parse_day))
+    assert [program.title for program in programs] == ["12", "13", "14"]
+    assert [program.datetime_finish for program in programs[:-1]] == days[1:]
+
+def test_ekol_tv_finish_date_only_includes_last_day(monkeypatch):
+    requested = []
+    async def parse_day_async(self, day):
+        requested.append(day)
+        return []
+    monkeypatch.setattr(EkolTvParser, "parse_day_async", parse_day_async)
+
+    options = ParserOptions(
+        finish_date=datetime(2026, 10, 14, tzinfo=UTC),
+        now=datetime(2026, 10, 13, 15, 30, tzinfo=MSK)
+    )
+    asyncio.run(EkolTvParser(options).parse_async())
+
+    assert requested == [datetime(2026, 10, day, tzinfo=MSK) for day in (12, 13, 14)]
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from shared.fetch_policy import FetchPolicy
+from shared.http import HttpClient
+
+async def __get_with_slow_first_response_async(policy: FetchPolicy) -> tuple[str, int, float]:
+    requests = 0
+
+    async def handler(request):
+        nonlocal requests
+        requests += 1
+        #первый ответ зависает, дубль отвечает сразу
+        if (requests == 1):
+            await asyncio.sleep(2)
+        return web.Response(text=f"response {requests}")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    try:
+        async with HttpClient() as client:
+            started = time.perf_counter()
+            body = await client.get_text(f"http://127.0.0.1:{port}/", policy=policy)
+            elapsed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+    return (body, requests, elapsed)
+
+def test_hedge_fires_before_latency_samples_exist():
+    policy = FetchPolicy(hedge_percentile=90, hedge_initial_delay=0.1)
+    body, requests, elapsed = asyncio.run(__get_with_slow_first_response_async(policy))
+
+    assert body == "response 2"
+    assert requests == 2
+    assert elapsed < 1.5
+
+def test_no_hedge_without_initial_delay():
+    policy = FetchPolicy(hedge_percentile=90)
+    body, requests, _ = asyncio.run(__get_with_slow_first_response_async(policy))
+
+    assert body == "response 1"
+    assert requests == 1
@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.parsers import DEFAULT_FIXTURES_DIR
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHANNELS = sorted(
+    name for name in os.listdir(DEFAULT_FIXTURES_DIR)
+        if os.path.exists(os.path.join(DEFAULT_FIXTURES_DIR, name, "manifest.json"))
+)
+
+def __run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=SRC_DIR, capture_output=True, text=True, timeout=120)
+
+def test_corpus_is_committed():
+    assert len(CHANNELS) >= 2
+
+def test_benchmark_and_replay_run_on_committed_corpus(tmp_path):
+    results_path = str(tmp_path / "results.json")
+    completed = __run("-m", "benchmarks.parsers", "-c", *CHANNELS, "-r", "1", "-o", results_path)
+    assert completed.returncode == 0, completed.stderr
+    with open(results_path, encoding="utf-8") as results_stream:
+        results = json.load(results_stream)["results"]
+    assert all("error" not in results[channel] for channel in CHANNELS), results
+
+    output_dir = str(tmp_path / "out")
+    completed = __run("run.py", "-c", ",".join(CHANNELS), "--replay", DEFAULT_FIXTURES_DIR, "-o", output_dir)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    for channel in CHANNELS:
+        with open(os.path.join(output_dir, f"{channel}.csv"), encoding="utf-8") as csv_stream:
+            #заголовок + программы, столько же, сколько в бенчмарке
+            assert len(csv_stream.read().splitlines()) == results[channel]["programs"] + 1
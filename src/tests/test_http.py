@@ -0,0 +1,37 @@
+import asyncio
+
+from aiohttp import web
+
+from shared.http import HttpClient
+
+PAGE = "<html><body>Günaydın Türkiye</body></html>"
+
+async def __stream_async(body: bytes, content_type: str) -> str:
+    async def handler(request):
+        return web.Response(body=body, headers={"Content-Type": content_type})
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    chunks = []
+    def feed(chunk: str) -> bool:
+        chunks.append(chunk)
+        return False
+
+    try:
+        async with HttpClient() as client:
+            await client.stream_text(f"http://127.0.0.1:{port}/", feed, chunk_size=7)
+    finally:
+        await runner.cleanup()
+    return "".join(chunks)
+
+def test_stream_text_without_charset_is_utf8():
+    assert asyncio.run(__stream_async(PAGE.encode("utf-8"), "text/html")) == PAGE
+
+def test_stream_text_uses_declared_charset():
+    assert asyncio.run(__stream_async(PAGE.encode("cp1254"), "text/html; charset=windows-1254")) == PAGE
@@ -0,0 +1,20 @@
+from shared.js_pool import JsContextPool, get_js_pool, is_js_pool_warm, warm_js_pool
+
+def test_pool_reuses_and_recycles_contexts():
+    pool = JsContextPool(size=1, max_uses=2)
+    pool.warm()
+    try:
+        assert pool.eval_json("globalThis.counter = (globalThis.counter || 0) + 1; JSON.stringify(counter)") == 1
+        assert pool.eval_json("globalThis.counter += 1; JSON.stringify(counter)") == 2
+        #после max_uses исполнений контекст пересоздается
+        assert pool.eval_json("JSON.stringify(typeof counter)") == "undefined"
+    finally:
+        pool.close()
+
+def test_shared_pool_is_warmed_only_for_js_parsers():
+    warm_js_pool([[], ["lxml"]])
+    assert not is_js_pool_warm()
+
+    warm_js_pool([[], ["mini-racer"]])
+    assert is_js_pool_warm()
+    assert get_js_pool().eval_json("JSON.stringify([1, 2])") == [1, 2]
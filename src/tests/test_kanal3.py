@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from shared.http import HttpClient
+from shared.options import ParserOptions
+from kanal3 import Kanal3Parser
+
+PAGE = """
+<html><body>
+<div class="sow-tabs-panel"><table>
+    <thead><tr><th>Saat</th><th>Program</th></tr></thead>
+    <tbody>
+        <tr><td>08:00</td><td>Sabah Haberleri</td></tr>
+        <tr><td>06:00</td><td>Günaydın</td></tr>
+    </tbody>
+</table></div>
+<div class="sow-tabs-panel"><table>
+    <thead><tr><th>Saat</th><th>Program</th></tr></thead>
+    <tbody><tr><td>07:30</td><td>Belgesel</td></tr></tbody>
+</table></div>
+</body></html>
+"""
+
+class StaticHttpClient(HttpClient):
+    async def get_text(self, url, headers=None, cache_ttl=timedelta(0), policy=None) -> str:
+        return PAGE
+
+    async def stream_text(self, url, feed, headers=None, chunk_size=16, policy=None):
+        for start in range(0, len(PAGE), chunk_size):
+            if (feed(PAGE[start:start + chunk_size])):
+                return
+        feed("")
+
+def __parse(stream_html: bool) -> list[tuple]:
+    #оба пути отсчитывают неделю от одного и того же момента
+    now = datetime(2026, 10, 14, 12, 30, tzinfo=timezone.utc)
+    parser = Kanal3Parser(ParserOptions(stream_html=stream_html, now=now), StaticHttpClient())
+    programs = asyncio.run(parser.parse_async())
+    return [(program.datetime_start, program.datetime_finish, program.title) for program in programs]
+
+def test_streamed_rows_equal_dom_with_table_header():
+    from_dom = __parse(False)
+    assert [title for _, _, title in from_dom] == ["Günaydın", "Sabah Haberleri"]
+    assert __parse(True) == from_dom
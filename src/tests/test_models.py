@@ -0,0 +1,73 @@
+import pickle
+from datetime import datetime, timedelta, timezone
+
+from bs4 import BeautifulSoup
+
+from shared.models import TvProgramData, TvProgramList
+from shared.utils import fill_finish_date_by_next_start_date
+
+MSK = timezone(timedelta(hours=3))
+
+def __fields(program: TvProgramData) -> tuple:
+    return tuple(getattr(program, name) for name in TvProgramData.__slots__)
+
+def __create_programs() -> list[TvProgramData]:
+    day = datetime(2026, 10, 18, tzinfo=MSK)
+    return [
+        TvProgramData(day.replace(hour=6), None, "trt 1", "Sabah", "https://trt.net.tr/logo.png", "canlı", True),
+        TvProgramData(day.replace(hour=9), None, "trt 1", "Haber", None, None, False),
+        TvProgramData(datetime(2026, 10, 18, 8), None, "trt 1", "Naive", None, None, False)
+    ]
+
+def test_program_has_no_dict_and_interns_repeated_strings():
+    first = TvProgramData(datetime(2026, 10, 18, tzinfo=MSK), None, "".join(["trt ", "1"]), "Haber", None, None, False)
+    second = TvProgramData(datetime(2026, 10, 19, tzinfo=MSK), None, "".join(["trt ", "1"]), "Haber", None, None, False)
+
+    assert not hasattr(first, "__dict__")
+    assert first.channel is second.channel
+
+def test_navigable_string_is_stored_as_str():
+    title = BeautifulSoup("<p>Haber</p>", "html.parser").p.string
+    program = TvProgramData(datetime(2026, 10, 18, tzinfo=MSK), None, "trt 1", title, None, None, False)
+
+    #NavigableString держит ссылку на все дерево документа
+    assert type(program.title) is str
+
+def test_program_pickles_and_reads_old_dict_state():
+    program = __create_programs()[0]
+    assert __fields(pickle.loads(pickle.dumps(program))) == __fields(program)
+
+    #снимок до __slots__: состояние - __dict__
+    restored = TvProgramData.__new__(TvProgramData)
+    restored.__setstate__({name: getattr(program, name) for name in TvProgramData.__slots__})
+    assert __fields(restored) == __fields(program)
+
+def test_program_list_round_trips_programs():
+    programs = __create_programs()
+    program_list = TvProgramList(programs)
+
+    assert len(program_list) == 3
+    assert [__fields(program) for program in program_list] == [__fields(program) for program in programs]
+    assert program_list[-1].datetime_start.tzinfo is None
+    assert [__fields(program) for program in pickle.loads(pickle.dumps(program_list))] == [__fields(program) for program in programs]
+
+    #элементы - копии, изменение меняет хранилище только через __setitem__
+    program = program_list[1]
+    program.title = "Spor"
+    assert program_list[1].title == "Haber"
+    program_list[1] = program
+    assert program_list[1].title == "Spor"
+
+    assert program_list.pop().title == "Naive"
+    assert len(program_list) == 2
+
+def test_program_list_fills_finish_like_list():
+    programs = __create_programs()[:2]
+    program_list = TvProgramList(programs)
+
+    fill_finish_date_by_next_start_date(programs)
+    fill_finish_date_by_next_start_date(program_list)
+    assert [__fields(program) for program in program_list] == [__fields(program) for program in programs]
+
+    program_list.fill_finish_date_by_next_start_date(remove_last=True)
+    assert len(program_list) == 1
@@ -0,0 +1,38 @@
+import pytest
+
+import trt_cocuk
+from benchmarks.nuxt_decode import create_nuxt_script
+from shared.js_pool import JsContextPool
+from shared.nuxt import NuxtDecodeError, decode_nuxt
+from trt_cocuk import TrtCocukParser
+
+def __eval_in_v8(script: str):
+    pool = JsContextPool()
+    try:
+        return pool.eval_json("(function(){var window={};" + script + ";return JSON.stringify(window.__NUXT__)})()")
+    finally:
+        pool.close()
+
+def test_python_decoder_matches_v8():
+    script = create_nuxt_script(2, 10)
+    assert decode_nuxt(script) == __eval_in_v8(script)
+
+def test_unsupported_script_raises():
+    with pytest.raises(NuxtDecodeError):
+        decode_nuxt("window.__NUXT__=(function(a){return {x:a.length}}('abc'));")
+
+def test_cold_pool_uses_python_decoder(monkeypatch):
+    def fail():
+        raise AssertionError("V8 must not be started")
+    monkeypatch.setattr(trt_cocuk, "is_js_pool_warm", lambda: False)
+    monkeypatch.setattr(trt_cocuk, "get_js_pool", fail)
+
+    assert TrtCocukParser.decode_nuxt_state("window.__NUXT__={a:[1,'x']};") == {"a": [1, "x"]}
+
+def test_warm_pool_uses_v8(monkeypatch):
+    def fail(script):
+        raise AssertionError("warm V8 context is faster than the python decoder")
+    monkeypatch.setattr(trt_cocuk, "is_js_pool_warm", lambda: True)
+    monkeypatch.setattr(trt_cocuk, "decode_nuxt", fail)
+
+    assert TrtCocukParser.decode_nuxt_state("window.__NUXT__={a:[1,'x']};") == {"a": [1, "x"]}
@@ -0,0 +1,92 @@
+import gzip
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from shared.models import TvProgramData
+from shared.options import SaveOptions, get_compressed_path
+from shared.output import sort_programs, write_csv, write_xmltv
+
+MSK = timezone(timedelta(hours=3))
+
+def __program(channel: str, hour: int, title: str, description: str = None) -> TvProgramData:
+    return TvProgramData(
+        datetime(2026, 10, 18, hour, tzinfo=MSK),
+        datetime(2026, 10, 18, hour + 1, tzinfo=MSK),
+        channel,
+        title,
+        None,
+        description,
+        False
+    )
+
+def test_xmltv_merges_channels_by_start_in_one_pass(tmp_path):
+    path = str(tmp_path / "tv.xml")
+    trt1 = [__program("trt 1", 6, "Sabah"), __program("trt 1", 9, "Haber & Spor")]
+    kanal3 = [__program("kANAL 3", 7, "Dizi", "bölüm\x0b 1"), __program("kANAL 3", 8, "Film")]
+
+    #программы - одноразовые итераторы: запись за один проход
+    write_xmltv([("trt1", iter(trt1)), ("kanal3", iter(kanal3)), ("empty", iter([]))], path)
+
+    tv = ElementTree.parse(path).getroot()
+    assert [(channel.get("id"), channel.findtext("display-name")) for channel in tv.findall("channel")] == [
+        ("trt1", "trt 1"),
+        ("kanal3", "kANAL 3")
+    ]
+    assert [(programme.get("channel"), programme.findtext("title")) for programme in tv.findall("programme")] == [
+        ("trt1", "Sabah"),
+        ("kanal3", "Dizi"),
+        ("kanal3", "Film"),
+        ("trt1", "Haber & Spor")
+    ]
+    first = tv.find("programme")
+    assert (first.get("start"), first.get("stop")) == ("20261018060000 +0300", "20261018070000 +0300")
+    #недопустимые в XML символы удаляются
+    assert tv.findall("programme")[1].findtext("desc") == "bölüm 1"
+
+def test_sort_programs_orders_by_instant():
+    programs = [
+        __program("trt 1", 9, "Haber"),
+        TvProgramData(datetime(2026, 10, 18, 5, tzinfo=timezone.utc), None, "trt 1", "UTC", None, None, False)
+    ]
+    #05:00 UTC = 08:00 MSK
+    assert [program.title for program in sort_programs(programs)] == ["UTC", "Haber"]
+
+def test_csv_is_compressed_by_extension(tmp_path):
+    programs = [__program("trt 1", 6, "Sabah"), __program("trt 1", 9, "Haber")]
+    plain_path = str(tmp_path / "trt1.csv")
+    gzip_path = get_compressed_path(plain_path, "gzip")
+    assert gzip_path == plain_path + ".gz"
+    assert get_compressed_path(gzip_path, "gzip") == gzip_path
+
+    write_csv(programs, SaveOptions(plain_path))
+    write_csv(programs, SaveOptions(gzip_path))
+
+    with open(gzip_path, "rb") as compressed:
+        assert compressed.read(2) == b"\x1f\x8b"
+    with gzip.open(gzip_path, "rt", encoding="utf-8", newline="") as compressed, open(plain_path, encoding="utf-8", newline="") as plain:
+        assert compressed.read() == plain.read()
+
+def test_concatenated_gzip_members_read_as_one_stream(tmp_path):
+    first_path = str(tmp_path / "first.csv.gz")
+    second_path = str(tmp_path / "second.csv.gz")
+    write_csv([__program("trt 1", 6, "Sabah")], SaveOptions(first_path))
+    write_csv([__program("kANAL 3", 7, "Dizi")], SaveOptions(second_path))
+
+    with open(first_path, "ab") as joined, open(second_path, "rb") as second:
+        joined.write(second.read())
+
+    with gzip.open(first_path, "rt", encoding="utf-8") as joined:
+        lines = joined.read().splitlines()
+    assert len(lines) == 4
+    assert "Sabah" in lines[1] and "Dizi" in lines[3]
+
+def test_zstd_output(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = get_compressed_path(str(tmp_path / "trt1.csv"), "zstd")
+    write_csv([__program("trt 1", 6, "Sabah")], SaveOptions(path))
+
+    with open(path, "rb") as compressed:
+        text = zstandard.ZstdDecompressor().stream_reader(compressed).read().decode("utf-8")
+    assert "Sabah" in text
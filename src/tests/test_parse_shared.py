@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+from shared.http import HttpClient
+from shared.models import TvParser
+from shared.options import ParserOptions
+
+MSK = timezone(timedelta(hours=3))
+PAGE = "<html><body><p>trt 1</p><p>trt 2</p></body></html>"
+DAY = datetime(2026, 10, 18, 12, tzinfo=MSK)
+
+class CountingParser(TvParser):
+    parsed: list[tuple[str, str]] = []
+
+    def parse_day(self, day: datetime, body: str = PAGE) -> dict[str, list[str]]:
+        return self.parse_shared("https://example.com", body, self.__parse_html, day)
+
+    def __parse_html(self, html_input: str, day: datetime) -> dict[str, list[str]]:
+        CountingParser.parsed.append((day.date().isoformat(), self.html_backend))
+        html = self.parse_html(html_input)
+        return {"channels": [p.text for p in html.find_all("p")]}
+
+def __create_parsers(count: int, http_client: HttpClient) -> list[CountingParser]:
+    CountingParser.parsed = []
+    return [CountingParser(ParserOptions(), http_client) for _ in range(count)]
+
+def test_parsers_with_one_client_share_the_parse():
+    first, second = __create_parsers(2, HttpClient())
+    assert first.parse_day(DAY) == second.parse_day(DAY.replace(hour=18))
+    assert CountingParser.parsed == [("2026-10-18", None)]
+
+def test_another_day_body_or_backend_is_parsed_again():
+    first, second = __create_parsers(2, HttpClient())
+    first.parse_day(DAY)
+    second.parse_day(DAY + timedelta(days=1))
+    second.parse_day(DAY + timedelta(days=1), PAGE.replace("trt 2", "trt 3"))
+    second.html_backend = "html.parser"
+    second.parse_day(DAY + timedelta(days=1), PAGE.replace("trt 2", "trt 3"))
+    assert CountingParser.parsed == [
+        ("2026-10-18", None),
+        ("2026-10-19", None),
+        ("2026-10-19", None),
+        ("2026-10-19", "html.parser")
+    ]
+
+def test_memo_is_scoped_to_the_http_client():
+    first, = __create_parsers(1, HttpClient())
+    second, = [CountingParser(ParserOptions(), HttpClient())]
+    first.parse_day(DAY)
+    second.parse_day(DAY)
+    assert len(CountingParser.parsed) == 2
+
+def test_callers_get_independent_results():
+    first, second = __create_parsers(2, HttpClient())
+    first.parse_day(DAY)["channels"].append("changed")
+    assert second.parse_day(DAY) == {"channels": ["trt 1", "trt 2"]}
+    assert len(CountingParser.parsed) == 1
@@ -0,0 +1,22 @@
+from datetime import datetime, time, timedelta, timezone
+
+from shared.registry import DAILY, MSK, PARSERS, SEVERAL_TIMES_A_DAY, Cadence
+
+def test_interval_cadence_counts_from_last_run():
+    last_run = datetime(2026, 10, 18, 23, 40, tzinfo=timezone.utc)
+    assert SEVERAL_TIMES_A_DAY.get_next_run(last_run) == datetime(2026, 10, 19, 5, 40, tzinfo=timezone.utc)
+    assert DAILY.get_next_run(last_run) == datetime(2026, 10, 19, 23, 40, tzinfo=timezone.utc)
+
+def test_daily_cadence_runs_at_local_time():
+    cadence = Cadence(timedelta(days=1), time(3, 0, tzinfo=MSK))
+
+    #23:40 UTC - уже 02:40 следующего дня по Москве: запуск в тот же московский день
+    assert cadence.get_next_run(datetime(2026, 10, 18, 23, 40, tzinfo=timezone.utc)) == datetime(2026, 10, 19, 3, 0, tzinfo=MSK)
+    #ровно в 03:00 - следующий запуск через сутки
+    assert cadence.get_next_run(datetime(2026, 10, 19, 3, 0, tzinfo=MSK)) == datetime(2026, 10, 20, 3, 0, tzinfo=MSK)
+    assert cadence.get_next_run(datetime(2026, 10, 19, 3, 0, 1, tzinfo=MSK)) == datetime(2026, 10, 20, 3, 0, tzinfo=MSK)
+
+def test_cadence_from_info_files():
+    assert PARSERS["dost_tv"].cadence.describe() == "daily at 03:00 MSK"
+    assert PARSERS["trt2"].cadence.describe() == "every 6h"
+    assert PARSERS["kanal3"].cadence.describe() == "every 24h"
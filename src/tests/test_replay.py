@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import shared.utils
+from shared.fixtures import Fixture, FixtureStore
+from shared.options import HttpOptions, ParserOptions
+from shared.replay import get_replay_parser_options
+from er_tv import ErTVParser
+from sozcu_tv import SozcuTvParser
+
+MSK = timezone(timedelta(hours=3))
+PAGE = '<html><body><div id="newstext"><p>06:00 Sabah<br/>12:00 Öğle</p></div></body></html>'
+
+def __record(directory: str, url: str, recorded_at: datetime):
+    store = FixtureStore(directory)
+    store.add(Fixture("GET", url, None, PAGE))
+    store.save(recorded_at)
+
+def __parse_replayed(parser_class, replay_dir: str, channel: str):
+    async def parse_async():
+        options = ParserOptions(http_options=HttpOptions(replay_dir=replay_dir))
+        parser = parser_class(get_replay_parser_options(options, replay_dir, channel))
+        async with parser.http_client:
+            return await parser.parse_async()
+
+    return asyncio.run(parse_async())
+
+def test_replay_uses_recording_time(tmp_path):
+    __record(str(tmp_path / "er_tv"), "https://www.ertv.com.tr/yayin-akisi-s7.html", datetime(2024, 11, 20, 9, tzinfo=timezone.utc))
+
+    programs = __parse_replayed(ErTVParser, str(tmp_path), "er_tv")
+
+    #понедельник недели записи, а не текущей
+    assert programs[0].datetime_start == datetime(2024, 11, 18, 6, tzinfo=MSK)
+
+def test_replay_options_are_per_channel(tmp_path):
+    __record(str(tmp_path / "er_tv"), "https://www.ertv.com.tr/yayin-akisi-s7.html", datetime(2024, 11, 20, 9, tzinfo=timezone.utc))
+    __record(str(tmp_path / "sozcu_tv"), "https://www.sozcu.com.tr/", datetime(2024, 12, 4, 9, tzinfo=timezone.utc))
+
+    options = ParserOptions()
+    er_tv_options = get_replay_parser_options(options, str(tmp_path), "er_tv")
+    sozcu_tv_options = get_replay_parser_options(options, str(tmp_path), "sozcu_tv")
+
+    assert er_tv_options.now == datetime(2024, 11, 20, 9, tzinfo=timezone.utc)
+    assert sozcu_tv_options.now == datetime(2024, 12, 4, 9, tzinfo=timezone.utc)
+    assert options.now is None
+    #общие модули не подменяются
+    assert shared.utils.datetime is datetime
+    assert get_replay_parser_options(options, str(tmp_path), "kanal3") is options
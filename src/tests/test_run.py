@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_list_does_not_import_parsers_or_http_stack():
+    script = (
+        "import runpy, sys\n"
+        "sys.argv = ['run.py', '--list']\n"
+        "try:\n"
+        "    runpy.run_path('run.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print([name for name in ('aiohttp', 'bs4', 'shared.models', 'trt2') if name in sys.modules])\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    lines = completed.stdout.splitlines()
+    assert any(line.startswith("trt2\t") for line in lines)
+    assert lines[-1] == "[]"
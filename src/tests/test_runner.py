@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from shared.models import TvParser, TvProgramData
+from shared.options import ParserOptions, RunnerOptions
+from shared.runner import run_parsers_out_to_csv_async
+
+MSK = timezone(timedelta(hours=3))
+
+class FakeParser(TvParser):
+    def __init__(self, options: ParserOptions, channel: str, title: str):
+        super().__init__(options)
+        self.channel = channel
+        self.title = title
+
+    async def parse_async(self) -> list[TvProgramData]:
+        return [TvProgramData(datetime(2024, 11, 18, 6, tzinfo=MSK), None, self.channel, self.title, None, None, False)]
+
+
+def __run(parsers: dict[str, TvParser], options: RunnerOptions):
+    async def run_async():
+        results = await run_parsers_out_to_csv_async(parsers, options)
+        for parser in parsers.values():
+            await parser.http_client.close()
+        return results
+
+    return asyncio.run(run_async())
+
+def test_merged_csv_is_rewritten_after_background_refresh(tmp_path):
+    parser_options = ParserOptions(snapshot_dir=str(tmp_path / "snapshots"))
+    output_path = str(tmp_path / "merged.csv")
+    options = RunnerOptions([], parser_options, output_path, merge=True, stale_while_revalidate=True)
+
+    __run({"a": FakeParser(parser_options, "a", "old a"), "b": FakeParser(parser_options, "b", "old b")}, options)
+    results = __run({"a": FakeParser(parser_options, "a", "new a"), "b": FakeParser(parser_options, "b", "new b")}, options)
+
+    #снимки отданы сразу, свежие результаты пришли фоновыми обновлениями
+    assert [result.stale for result in results] == [True, True, False, False]
+    with open(output_path, encoding="utf-8") as stream:
+        text = stream.read()
+    assert "new a" in text and "new b" in text
+    assert "old a" not in text and "old b" not in text
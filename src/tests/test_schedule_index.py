@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+from shared.models import TvProgramData
+from shared.schedule_index import ScheduleIndex
+
+MSK = timezone(timedelta(hours=3))
+
+def __create_programs(channel_name: str) -> list[TvProgramData]:
+    day = datetime(2026, 10, 21, tzinfo=MSK)
+    return [
+        TvProgramData(day.replace(hour=6), day.replace(hour=9), channel_name, "Sabah", None, None, False),
+        TvProgramData(day.replace(hour=9), day.replace(hour=12), channel_name, "Haber", None, None, False)
+    ]
+
+def test_index_is_keyed_by_registry_key():
+    moment = datetime(2026, 10, 21, 7, tzinfo=MSK)
+    index = ScheduleIndex({"trt2": __create_programs("trt 2")})
+    #обновление так же, как в daemon - по ключу канала
+    index.update("tv41", __create_programs("TV 41"))
+
+    assert index.channels == ["trt2", "tv41"]
+    assert index.get_at("trt2", moment).title == "Sabah"
+    assert index.get_at("trt 2", moment) is None
+    assert list(index.get_now_next(moment)) == ["trt2", "tv41"]
+
+    index.update("trt2", __create_programs("trt 2")[1:])
+    assert index.get_at("trt2", moment) is None
+    assert len(index) == 3
+
+def test_lookups_at_program_boundaries():
+    day = datetime(2026, 10, 21, tzinfo=MSK)
+    programs = __create_programs("trt 2") + [
+        #без даты окончания: идет до начала следующей, последняя - без конца
+        TvProgramData(day.replace(hour=14), None, "trt 2", "Dizi", None, None, False),
+        TvProgramData(day.replace(hour=16), None, "trt 2", "Film", None, None, False)
+    ]
+    index = ScheduleIndex({"trt2": programs})
+
+    #начало включается, окончание - нет
+    assert index.get_at("trt2", day.replace(hour=6)).title == "Sabah"
+    assert index.get_at("trt2", day.replace(hour=9)).title == "Haber"
+    assert index.get_at("trt2", day.replace(hour=5, minute=59)) is None
+    #промежуток 12:00-14:00 без программы
+    assert index.get_at("trt2", day.replace(hour=12)) is None
+    assert index.get_at("trt2", day.replace(hour=15, minute=59)).title == "Dizi"
+    assert index.get_at("trt2", day.replace(hour=23)).title == "Film"
+
+    assert index.get_next("trt2", day.replace(hour=9)).title == "Dizi"
+    assert index.get_next("trt2", day.replace(hour=8, minute=59)).title == "Haber"
+    assert index.get_next("trt2", day.replace(hour=16)) is None
+
+    schedule = index.get_schedule("trt2")
+    assert [p.title for p in schedule.get_window(day.replace(hour=9), day.replace(hour=14))] == ["Haber"]
+    assert [p.title for p in schedule.get_window(day.replace(hour=8), day.replace(hour=14, minute=1))] == ["Sabah", "Haber", "Dizi"]
+    assert schedule.get_window(day.replace(hour=12), day.replace(hour=14)) == []
+
+def test_later_program_with_same_start_wins():
+    day = datetime(2026, 10, 21, tzinfo=MSK)
+    programs = __create_programs("trt 2") + [
+        TvProgramData(day.replace(hour=6), day.replace(hour=9), "trt 2", "Sabah (yeni)", None, None, False)
+    ]
+    index = ScheduleIndex({"trt2": programs})
+
+    assert len(index) == 2
+    assert index.get_at("trt2", day.replace(hour=7)).title == "Sabah (yeni)"
@@ -0,0 +1,39 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from shared.http import HttpClient
+from shared.options import ParserOptions
+from er_tv import ErTVParser
+
+MSK = timezone(timedelta(hours=3))
+PAGE = '<html><body><div id="newstext"><p>06:00 Sabah<br/>12:00 Öğle</p><p>07:00 Haber</p></div></body></html>'
+
+class StaticHttpClient(HttpClient):
+    async def get_text(self, url, headers=None, cache_ttl=timedelta(0), policy=None) -> str:
+        return PAGE
+
+def __parse(snapshot_dir: str, now: datetime):
+    parser = ErTVParser(ParserOptions(snapshot_dir=snapshot_dir, now=now), StaticHttpClient())
+    return asyncio.run(parser.parse_async())
+
+def test_unchanged_body_is_parsed_again_for_another_week(tmp_path):
+    first = __parse(str(tmp_path), datetime(2026, 10, 14, 12, tzinfo=MSK))
+    assert first[0].datetime_start.date().isoformat() == "2026-10-12"
+
+    #тело страницы то же, но наступила следующая неделя
+    second = __parse(str(tmp_path), datetime(2026, 10, 21, 12, tzinfo=MSK))
+    assert second[0].datetime_start.date().isoformat() == "2026-10-19"
+    assert second[-1].datetime_start.date().isoformat() == "2026-10-20"
+
+def test_unchanged_body_is_served_from_cache_on_the_same_day(tmp_path, monkeypatch):
+    __parse(str(tmp_path), datetime(2026, 10, 14, 12, tzinfo=MSK))
+
+    parsed = []
+    original_parse = ErTVParser._ErTVParser__parse_html
+    def counted_parse(self, html_input, current_day):
+        parsed.append(current_day)
+        return original_parse(self, html_input, current_day)
+    monkeypatch.setattr(ErTVParser, "_ErTVParser__parse_html", counted_parse)
+
+    assert len(__parse(str(tmp_path), datetime(2026, 10, 14, 18, tzinfo=MSK))) == 3
+    assert parsed == []
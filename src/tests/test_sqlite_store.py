@@ -0,0 +1,64 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from shared.models import TvProgramData
+from shared.sqlite_store import ScheduleDatabase
+
+MSK = timezone(timedelta(hours=3))
+
+def __program(channel: str, hour: int, title: str, description: str = None) -> TvProgramData:
+    return TvProgramData(
+        datetime(2026, 10, 18, hour, tzinfo=MSK),
+        datetime(2026, 10, 18, hour + 1, tzinfo=MSK),
+        channel,
+        title,
+        None,
+        description,
+        False
+    )
+
+def __count_rows(path: str) -> int:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM programs").fetchone()[0]
+
+def test_repeated_upsert_is_idempotent(tmp_path):
+    path = str(tmp_path / "schedule.sqlite")
+    programs = [__program("trt 1", 6, "Sabah"), __program("trt 1", 7, "Haber"), __program("kanal 3", 6, "Dizi")]
+
+    with ScheduleDatabase(path) as database:
+        database.upsert(programs)
+        first = database.get_programs(datetime(2026, 10, 18, tzinfo=MSK), datetime(2026, 10, 19, tzinfo=MSK))
+        database.upsert(programs)
+        second = database.get_programs(datetime(2026, 10, 18, tzinfo=MSK), datetime(2026, 10, 19, tzinfo=MSK))
+
+    assert __count_rows(path) == 3
+    assert [(p.channel, p.datetime_start, p.title) for p in second] == [(p.channel, p.datetime_start, p.title) for p in first]
+
+def test_upsert_updates_program_with_same_start(tmp_path):
+    path = str(tmp_path / "schedule.sqlite")
+    with ScheduleDatabase(path) as database:
+        database.upsert([__program("trt 1", 6, "Sabah")])
+        database.upsert([__program("trt 1", 6, "Sabah Haberleri", "canlı")])
+        programs = database.get_current(datetime(2026, 10, 18, 6, 30, tzinfo=MSK))
+
+    assert __count_rows(path) == 1
+    assert [(p.title, p.description) for p in programs] == [("Sabah Haberleri", "canlı")]
+    #время читается с исходной зоной
+    assert programs[0].datetime_start.utcoffset() == timedelta(hours=3)
+
+def test_database_uses_wal_and_interval_queries(tmp_path):
+    path = str(tmp_path / "schedule.sqlite")
+    with ScheduleDatabase(path) as database:
+        database.upsert([__program("trt 1", 6, "Sabah"), __program("trt 1", 7, "Haber"), __program("kanal 3", 7, "Dizi")])
+        window = database.get_programs(
+            datetime(2026, 10, 18, 7, tzinfo=MSK),
+            datetime(2026, 10, 18, 8, tzinfo=MSK),
+            ["trt 1"]
+        )
+        channels = database.get_channels()
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    #[start, finish): программа, закончившаяся ровно в start, не попадает
+    assert [p.title for p in window] == ["Haber"]
+    assert channels == ["kanal 3", "trt 1"]
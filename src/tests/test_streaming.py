@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timezone
+
+from bs4 import BeautifulSoup
+
+from shared.options import ParserOptions
+from shared.streaming import StreamingRowExtractor, extract_rows
+from shared.text import get_node_text
+from dost_tv import DostTvParser
+
+DOST_TV_HTML = """
+<table><tbody>
+    <tr>
+        <td class="extvs-table1-time"><span>06:30</span></td>
+        <td><figure>
+            <h3>Sabah &amp; Haber</h3>
+            <div class="extvs-collap-ct">
+            <p>Line one</p>
+            <p>Line two</p>
+        </div>
+        </figure></td>
+    </tr>
+    <tr><td class="extvs-table1-time"><span>07:00</span></td><td><figure><h3>Belgesel</h3></figure></td></tr>
+</tbody></table>
+"""
+
+def __create_random_row(random_source: random.Random, depth: int = 0) -> str:
+    parts = []
+    for _ in range(random_source.randint(0, 4)):
+        kind = random_source.random()
+        if (kind < 0.4):
+            parts.append(random_source.choice([" ", "\n", "\n    ", "\t", "  \r\n  ", "a", " b ", "c\nd", "&amp;", "x &lt; y"]))
+        elif (kind < 0.5):
+            parts.append(random_source.choice(["<br>", "<br/>", "<!-- note -->"]))
+        elif (depth < 3):
+            tag = random_source.choice(["p", "span", "div", "b", "pre"])
+            parts.append(f"<{tag}>{__create_random_row(random_source, depth + 1)}</{tag}>")
+    return "".join(parts)
+
+def __get_fields(program) -> tuple:
+    return (program.datetime_start, program.title, program.description)
+
+def test_dost_tv_streaming_rows_equal_dom():
+    parser = DostTvParser(ParserOptions())
+    day = datetime(2024, 11, 18, tzinfo=timezone.utc)
+    from_dom = parser._DostTvParser__parse_html(DOST_TV_HTML, day)
+    from_rows = parser._DostTvParser__parse_html_rows(DOST_TV_HTML, day)
+
+    assert [program.description for program in from_dom] == ["Line one\nLine two", None]
+    assert [__get_fields(program) for program in from_rows] == [__get_fields(program) for program in from_dom]
+
+def test_node_text_of_streamed_rows_equals_bs4():
+    random_source = random.Random(7)
+    for _ in range(500):
+        cells = "".join(f"<td>{__create_random_row(random_source)}</td>" for _ in range(random_source.randint(1, 3)))
+        html = f"<table><tbody>\n  <tr>{cells}</tr>\n</tbody></table>"
+
+        dom_rows = BeautifulSoup(html, "html.parser").find("tbody").find_all("tr")
+        stream_rows = extract_rows(html, "tbody")
+        assert [get_node_text(row) for row in stream_rows] == [get_node_text(row) for row in dom_rows], html
+        assert [row.text for row in stream_rows] == [row.text for row in dom_rows], html
+
+def test_text_split_across_chunks_is_joined():
+    html = "<table><tbody><tr><td>  \n</td><td>ab</td></tr></tbody></table>"
+    rows = []
+    extractor = StreamingRowExtractor(lambda row, _: rows.append(row), "tbody")
+    for char in html:
+        extractor.feed(char)
+    extractor.close()
+
+    dom_row = BeautifulSoup(html, "html.parser").find("tr")
+    assert rows[0].text == dom_row.text == "\nab"
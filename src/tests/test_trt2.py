@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from shared.http import HttpClient
+from shared.options import ParserOptions
+from shared.registry import create_parsers, select_parsers
+from trt2 import Trt2Parser
+
+MSK = timezone(timedelta(hours=3))
+
+def __create_card(title: str, programs: list[tuple[str, str]]) -> str:
+    rows = "".join(
+        f'<div><span class="livestream-time">{time}</span><span class="livestream-title">{name}</span></div>'
+        for time, name in programs
+    )
+    return f'<div><div><div><h2 class="card-texts">{title}</h2>{rows}</div></div></div>'
+
+PAGE = '<html><body><div class="stream-conteiner">%s</div></body></html>' % "".join([
+    __create_card("TRT 2 Yayın Akışı", [("06.00", "Belgesel"), ("21.00", "Sinema"), ("01.00", "Gece")]),
+    __create_card("TRT Türk Yayın Akışı", [("07.00", "Haber"), ("12.00", "Gündem")]),
+    __create_card("TRT Avaz Yayın Akışı", [("08.00", "Avaz Haber"), ("18.00", "Türkü")])
+])
+
+def test_bouquet_channels_share_one_fetch_and_one_parse(monkeypatch):
+    fetched = []
+    async def get_text_async(self, url, headers, cache_ttl, policy):
+        fetched.append(url)
+        await asyncio.sleep(0.01)
+        return PAGE
+    monkeypatch.setattr(HttpClient, "_HttpClient__get_text_async", get_text_async)
+
+    parsed = []
+    original_parse = Trt2Parser._Trt2Parser__parse_html
+    def counted_parse(self, html_input, current_day):
+        parsed.append(type(self).__name__)
+        return original_parse(self, html_input, current_day)
+    monkeypatch.setattr(Trt2Parser, "_Trt2Parser__parse_html", counted_parse)
+
+    options = ParserOptions(now=datetime(2026, 10, 18, 12, tzinfo=MSK))
+    http_client = HttpClient()
+    parsers = create_parsers(select_parsers(["trt2", "trt_turk", "trt_avaz"]), options, http_client)
+
+    async def parse_async():
+        async with http_client:
+            return await asyncio.gather(*[parser.parse_async() for parser in parsers.values()])
+    trt2, trt_turk, trt_avaz = asyncio.run(parse_async())
+
+    assert len(fetched) == 1
+    assert len(parsed) == 1
+    #remove_last: последняя программа без окончания отбрасывается
+    assert [(p.channel, p.title) for p in trt2] == [("trt 2", "Belgesel"), ("trt 2", "Sinema")]
+    assert trt2[1].datetime_finish == datetime(2026, 10, 19, 1, tzinfo=MSK)
+    assert [(p.channel, p.title) for p in trt_turk] == [("trt türk", "Haber")]
+    assert [(p.channel, p.title) for p in trt_avaz] == [("trt avaz", "Avaz Haber")]
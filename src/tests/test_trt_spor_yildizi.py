@@ -0,0 +1,90 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+import trt_spor_yildizi
+from shared.http import HttpClient
+from shared.options import ParserOptions
+from shared.registry import get_parser_info
+from trt_spor_yildizi import TrtSporParser, TrtSportYildiziParser
+
+def __program(title: str, start: str, finish: str) -> dict:
+    return {"title": title, "synopsis": "", "starttime": start, "endtime": finish}
+
+def __channel(id: int, title: str, name: str = None) -> dict:
+    channel = {
+        "id": id,
+        "past": [__program(title + " 1", "2026-10-18T06:00:00+03:00", "2026-10-18T07:00:00+03:00")],
+        "current": {},
+        "upcoming": [__program(title + " 2", "2026-10-18T07:00:00+03:00", "2026-10-18T08:00:00+03:00")]
+    }
+    if (name is not None):
+        channel["name"] = name
+    return channel
+
+def __create_page() -> str:
+    epg = [{"tvChannels": [
+        __channel(129463, "Spor"),
+        __channel(129464, "Yıldız"),
+        __channel(129465, "Olimpiyat", "TRT Spor Olimpiyat")
+    ]}]
+    rows = [{"type": "menu", "content": {}}] * 4 + [{"type": "detail-row", "content": {"epg": epg}}]
+    data = {"props": {"pageProps": {"data": {"rows": rows}}}}
+    return '<html><body><script id="__NEXT_DATA__" type="application/json">%s</script></body></html>' % json.dumps(data)
+
+PAGE = __create_page()
+
+class StaticHttpClient(HttpClient):
+    async def get_text(self, url, headers=None, cache_ttl=timedelta(0), policy=None) -> str:
+        return PAGE
+
+def __as_tuples(programs) -> list[tuple]:
+    return [(p.datetime_start, p.datetime_finish, p.channel, p.title, p.description) for p in programs]
+
+def test_one_parse_returns_every_channel_of_the_page():
+    parser = TrtSportYildiziParser(ParserOptions(), StaticHttpClient())
+    channels = asyncio.run(parser.parse_channels_async())
+
+    assert sorted(channels) == [129463, 129464, 129465]
+    assert [p.channel for p in channels[129463]] == ["trt spor"] * 2
+    assert [p.title for p in channels[129464]] == ["Yıldız 1", "Yıldız 2"]
+    #канал не из channel_names - название из данных страницы
+    assert channels[129465][0].channel == "trt spor olimpiyat"
+
+def test_sister_channels_share_one_fetch_and_parse(monkeypatch):
+    parsed = []
+    original_parse = TrtSportYildiziParser._TrtSportYildiziParser__parse_html
+    def counted_parse(self, html_input):
+        parsed.append(type(self).__name__)
+        return original_parse(self, html_input)
+    monkeypatch.setattr(TrtSportYildiziParser, "_TrtSportYildiziParser__parse_html", counted_parse)
+
+    http_client = StaticHttpClient()
+    options = ParserOptions()
+    yildiz = get_parser_info("trt_spor_yildizi").create_parser(options, http_client)
+    spor = get_parser_info("trt_spor").create_parser(options, http_client)
+    assert isinstance(spor, TrtSporParser)
+
+    async def parse_async():
+        return await asyncio.gather(yildiz.parse_async(), spor.parse_async())
+    yildiz_programs, spor_programs = asyncio.run(parse_async())
+
+    assert [p.title for p in yildiz_programs] == ["Yıldız 1", "Yıldız 2"]
+    assert [p.title for p in spor_programs] == ["Spor 1", "Spor 2"]
+    assert len(parsed) == 1
+
+def test_missing_channel_raises():
+    class UnknownChannelParser(TrtSportYildiziParser):
+        channel_id = 1
+
+    with pytest.raises(TypeError):
+        asyncio.run(UnknownChannelParser(ParserOptions(), StaticHttpClient()).parse_async())
+
+def test_full_parse_fallback_matches_targeted_extraction(monkeypatch):
+    targeted = asyncio.run(TrtSportYildiziParser(ParserOptions(), StaticHttpClient()).parse_channels_async())
+
+    monkeypatch.setattr(trt_spor_yildizi, "find_next_data", lambda html_text: None)
+    fallback = asyncio.run(TrtSportYildiziParser(ParserOptions(), StaticHttpClient()).parse_channels_async())
+    assert {id: __as_tuples(programs) for id, programs in fallback.items()} == {id: __as_tuples(programs) for id, programs in targeted.items()}
@@ -1,8 +1,6 @@
 import asyncio
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
@@ -11,40 +9,57 @@ from shared.utils import fill_finish_date_by_next_start_date, is_none_or_empty
 
 #Особенность, для определения временной зоны используется наивный алгоритм
 #Когда часы текущей передачи < предыдущей, значит наступил новый день
+#На странице trt.net.tr карточки всех каналов TRT: parse_channels_async разбирает их все за один запрос и один DOM,
+#parse_async возвращает программы channel_name.
+#Парсеры других каналов со страницы наследуются от Trt2Parser с другим channel_name:
+#в одном запуске страница загружается (HttpClient) и разбирается (parse_shared) один раз на все каналы
 class Trt2Parser(TvParser):
     __source_url = "https://www.trt.net.tr/yayin-akisi"
-    __channel_name = "trt 2"
+    #название канала - заголовок карточки без " Yayın Akışı" в нижнем регистре
+    channel_name = "trt 2"
+    __channel_title_suffix = "Yayın Akışı"
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        channels = await self.parse_channels_async()
+        if (self.channel_name not in channels):
+            raise TypeError(f"Channel {self.channel_name!r} not found")
+        return channels[self.channel_name]
 
-    def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
-        program_days = html.find_all("ul", {"class": "event-list"})
-        channel_programs = self.__select_target_channel_tag(html, "TRT 2 Yayın Akışı")
+    #Программы всех карточек страницы: название канала -> программы
+    async def parse_channels_async(self) -> dict[str, list[TvProgramData]]:
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = self.now(self.__response_time_zone)
+        return self.parse_shared(self.__source_url, html_text, self.__parse_html, current_day)
 
-        current_day = datetime.now(self.__response_time_zone)
-        parsed_programs = self.__parse_day_programs(channel_programs, current_day)
+    def __parse_html(self, html_input: str, current_day: datetime) -> dict[str, list[TvProgramData]]:
+        html = self.parse_html(html_input)
 
-        fill_finish_date_by_next_start_date(parsed_programs, self.__remove_last)        
-        return parsed_programs
-    
-    def __select_target_channel_tag(self, html, target_channel_name):
+        parsed_channels = {}
+        for channel_name, channel_programs in self.__iter_channel_cards(html):
+            parsed_programs = self.__parse_day_programs(channel_programs, current_day, channel_name)
+            fill_finish_date_by_next_start_date(parsed_programs, self.__remove_last)
+            parsed_channels[channel_name] = parsed_programs
+
+        return parsed_channels
+
+    def __iter_channel_cards(self, html):
         all_channels = html.find("div", {"class": "stream-conteiner"})
         channels_cards = all_channels.find_all("div", recursive=False)
         for card in channels_cards:
             card = card.div.div
-            channel_name = card.find("h2", {"class":"card-texts"}).next
-            if (target_channel_name in channel_name):
-                return card
+            channel_title = str(card.find("h2", {"class":"card-texts"}).next)
+            yield (self.__get_channel_name(channel_title), card)
 
-    def __parse_day_programs(self, current_day_programs, current_day):
+    def __get_channel_name(self, channel_title: str) -> str:
+        channel_title = channel_title.strip()
+        if (channel_title.endswith(self.__channel_title_suffix)):
+            channel_title = channel_title[:-len(self.__channel_title_suffix)]
+        return " ".join(channel_title.split()).lower()
+
+    def __parse_day_programs(self, current_day_programs, current_day, channel_name):
         parsed_programs = []
         last_hour = 0
         for program_info in current_day_programs.find_all("div", recursive=False):
@@ -63,7 +78,7 @@ class Trt2Parser(TvParser):
             parsed_programs.append(TvProgramData(
                 datetime_start,
                 None,
-                self.__channel_name,
+                channel_name,
                 show_name,
                 self.__channel_logo_url,
                 None,
@@ -82,6 +97,14 @@ class Trt2Parser(TvParser):
         )
 
 
+#Другие каналы со страницы trt.net.tr
+class TrtTurkParser(Trt2Parser):
+    channel_name = "trt türk"
+
+class TrtAvazParser(Trt2Parser):
+    channel_name = "trt avaz"
+
+
 if (__name__=="__main__"):
     options = read_command_line_options()
     parser = Trt2Parser(options.parser_options)
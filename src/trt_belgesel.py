@@ -1,7 +1,5 @@
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
@@ -16,15 +14,14 @@ class TrtBelgeselParser(TvParser):
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                current_day = datetime.now(self.__response_time_zone) 
-                result = self.parse_day_html(await resp.text(), current_day)
-                fill_finish_date_by_next_start_date(result, self.__remove_last)
-                return result
+        html_text = await self.fetch_text_async(self.__source_url)
+        current_day = self.now(self.__response_time_zone) 
+        result = self.parse_cached(self.__source_url, html_text, self.parse_day_html, current_day)
+        fill_finish_date_by_next_start_date(result, self.__remove_last)
+        return result
 
     def parse_day_html(self, html_text:str, current_day:datetime):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         parsed_programs = []
 
         programs = html.find("div", {"id":"epg"}).find_all("a")
@@ -1,12 +1,11 @@
 import asyncio
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
-from py_mini_racer import MiniRacer
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
 from shared.output import run_parser_out_to_csv
+from shared.js_pool import get_js_pool, is_js_pool_warm
+from shared.nuxt import NuxtDecodeError, decode_nuxt
 
 
 
@@ -16,19 +15,19 @@ class TrtCocukParser(TvParser):
     __channel_logo_url = None
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                result = self.parse_day_html(await resp.text())
-                return result
+        html_text = await self.fetch_text_async(self.__source_url)
+        if (self.options.parse_workers > 0):
+            return await self.parse_cached_async(self.__source_url, html_text, self.parse_day_html)
+
+        #разбор не блокирует event loop; если понадобится V8, он исполняется в прогретом контексте
+        return await asyncio.to_thread(self.parse_cached, self.__source_url, html_text, self.parse_day_html)
 
     def parse_day_html(self, html_text:str):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         parsed_programs = []
         
         programs = html.body.find("script", recursive=False)
-
-        js_interop = MiniRacer()
-        obj = js_interop.eval(programs.next.replace("window.__NUXT__=", "result=")+" result")
+        obj = self.decode_nuxt_state(str(programs.next))
 
         program_days = obj["data"][0]["data"]["week"]
         for day in program_days:
@@ -36,10 +35,25 @@ class TrtCocukParser(TvParser):
                 parsed_programs.append(
                     self.parse_program(program)
                 )
-        
-        js_interop.close()
+
         return parsed_programs
     
+    #Прогретый контекст V8 (режим daemon) исполняет скрипт быстрее декодера на python (benchmarks/nuxt_decode.py),
+    #а запуск V8 ради одного разбора дороже его, поэтому без прогретого пула состояние разбирается
+    #без V8 (shared/nuxt.py), и только скрипт с неподдерживаемыми конструкциями исполняется в V8
+    @staticmethod
+    def decode_nuxt_state(script: str):
+        if (not is_js_pool_warm()):
+            try:
+                return decode_nuxt(script)
+            except NuxtDecodeError:
+                pass
+
+        #скрипт выполняется в своей области видимости, чтобы не оставлять глобальных переменных в контексте пула
+        return get_js_pool().eval_json(
+            "(function(){var window={};" + script + ";return JSON.stringify(window.__NUXT__)})()"
+        )
+
     def parse_program(self, program):
         return TvProgramData(
             self.parse_time(program["startTime"]),
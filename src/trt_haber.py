@@ -1,14 +1,13 @@
 
 import asyncio
 from typing import Tuple
-import aiohttp
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.options import SaveOptions, read_command_line_options
 from shared.models import TvParser, TvProgramData
+from shared.fetch_policy import FetchPolicy
 from shared.output import run_parser_out_to_csv
-from shared.utils import fill_finish_date_by_next_start_date
+from shared.fanout import fan_out_days_async
 
 class TrtHaberParser(TvParser):
     __source_url = "https://www.trthaber.com/yayin-akisi.html" 
@@ -16,38 +15,37 @@ class TrtHaberParser(TvParser):
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
     __remove_last = True
+    #страницы семи дней грузятся одновременно, медленный ответ по одной из них задерживает весь канал.
+    #В разовом запуске замеров по хосту мало, поэтому дубль уходит через постоянные 3 секунды,
+    #в режиме daemon - через 90-й перцентиль времени ответа
+    fetch_policy = FetchPolicy(hedge_percentile=90, hedge_initial_delay=3)
+
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            http_urls:list[str]
-
-            async with session.get(self.__source_url) as resp:
-                http_urls = self.get_day_urls(await resp.text())    
-
-            parsed_days_result = await asyncio.gather(*[
-                self.parse_day_async(session, url) for url in http_urls 
-            ])
-
-            sorted_by_dates = sorted(parsed_days_result, key=lambda x: x[0])
-            
-            result = [ 
-                program 
-                for day in sorted_by_dates 
-                    for program in day[1]
-            ]            
-        
-            fill_finish_date_by_next_start_date(result, self.__remove_last)
-            
-            return result
+        http_urls = self.get_day_urls(
+            await self.fetch_text_async(self.__source_url)
+        )    
+
+        #ссылки на дни отдает сам источник, порядок результата - по дате из ссылки
+        return await fan_out_days_async(
+            self.options,
+            sorted(http_urls, key=self.get_url_day),
+            self.parse_day_async,
+            self.__remove_last
+        )
 
-    async def parse_day_async(self, session, http_url) -> Tuple[datetime, list[TvProgramData]]:
-        date_from_url = http_url.split("/")[-1]
-        current_day = datetime.strptime(date_from_url, "%d-%m-%Y").replace(tzinfo=self.__response_time_zone)
+    async def parse_day_async(self, http_url) -> list[TvProgramData]:
+        current_day = self.get_url_day(http_url)
+
+        html_text = await self.fetch_text_async(http_url)
+        _, programs = await self.parse_cached_async(http_url, html_text, self.parse_day_html, current_day)
+        return programs
 
-        async with session.get(http_url) as resp: 
-            return self.parse_day_html(await resp.text(), current_day)
+    def get_url_day(self, http_url: str) -> datetime:
+        date_from_url = http_url.split("/")[-1]
+        return datetime.strptime(date_from_url, "%d-%m-%Y").replace(tzinfo=self.__response_time_zone)
         
     def parse_day_html(self, html_text:str, current_day:datetime):
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         parsed_programs = []
 
         programs = html.find("ul", {"class":"epg-list"}).find_all("li", recursive=False)
@@ -100,7 +98,7 @@ class TrtHaberParser(TvParser):
 
     
     def get_day_urls(self, html_text) -> list[str]:
-        html = BeautifulSoup(html_text, 'html.parser')
+        html = self.parse_html(html_text)
         days_list = html.find("ul", {"class": "days-list"})
         a_tags = days_list.find_all("a")
 
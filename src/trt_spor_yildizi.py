@@ -1,88 +1,118 @@
 import asyncio
 import json
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
 from shared.output import run_parser_out_to_csv
+from shared.next_data import find_next_data, iter_json_values
 from shared.utils import fill_finish_date_by_next_start_date, is_none_or_empty
 
 #Особенность, для определения временной зоны используется наивный алгоритм
 #Когда часы текущей передачи < предыдущей, значит наступил новый день
+#На странице расписание (epg) всех каналов TRT Spor: parse_channels_async разбирает их все за один запрос,
+#parse_async возвращает программы channel_id.
+#Парсеры других каналов страницы наследуются от TrtSportYildiziParser с другим channel_id:
+#в одном запуске страница загружается (HttpClient) и разбирается (parse_shared) один раз на все каналы
 class TrtSportYildiziParser(TvParser):
     __source_url = "https://www.trtspor.com.tr/yayin-akisi/trt-spor-yildiz"
-    __channel_name = "trt spor yıldız"
-    __channel_id = 129464
+    #id канала в epg страницы
+    channel_id = 129464
+    #названия каналов по id; каналы, которых здесь нет, называются по данным страницы
+    channel_names = {
+        129463: "trt spor",
+        129464: "trt spor yıldız"
+    }
     __channel_logo_url = None
     __response_time_zone = timezone(timedelta(hours=3))
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        channels = await self.parse_channels_async()
+        if (self.channel_id not in channels):
+            raise TypeError(f"Channel {self.channel_id} not found")
+        return channels[self.channel_id]
 
-    def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
-        data_script = html.find("script", {"id": "__NEXT_DATA__"})
+    #Программы всех каналов страницы: id канала -> программы
+    async def parse_channels_async(self) -> dict[int, list[TvProgramData]]:
+        html_text = await self.fetch_text_async(self.__source_url)
+        return self.parse_shared(self.__source_url, html_text, self.__parse_html)
 
-        parsed_programs = self.__parse_json(json.loads(data_script.text))
-        return parsed_programs
-
-    def __parse_json(self, data):
-        parsed_programs = []
-        stream_index = 0
-        programs = self.__prepare_channel_programs(data)
-
-        for program_info in programs:
-            datetime_start = self.__parse_time(program_info["starttime"])
-            datetime_finish = self.__parse_time(program_info["endtime"])
-                                               
-            show_name = program_info["title"]
-            show_description = program_info["synopsis"].replace("''", "\"").replace("\n", " ")
-            
-            if (is_none_or_empty(show_description)):
-                show_description = None
-
-            parsed_programs.append(TvProgramData(
-                datetime_start,
-                datetime_finish,
-                self.__channel_name,
-                show_name,
-                self.__channel_logo_url,
-                show_description,
-                    False
-            ))
-            stream_index += 1
-
-        return parsed_programs
-    
-    def __prepare_channel_programs(self, data) -> dict[str, any]:
-        rows = data["props"]["pageProps"]["data"]["rows"]
-        epg = self.__find_epg(rows)
-        result = []
+    def __parse_html(self, html_input: str) -> dict[int, list[TvProgramData]]:
+        epg = self.__extract_epg(html_input)
 
+        parsed_channels = {}
         for day in epg:
-            programs = self.__select_channel_programs(day, self.__channel_id)
-            if (programs is None):
-                continue    
-            result.extend(programs)
-        return result 
-    
+            for channel in day["tvChannels"]:
+                parsed_programs = parsed_channels.setdefault(channel["id"], [])
+                channel_name = self.__get_channel_name(channel)
+                for program_info in self.__get_channel_programs(channel):
+                    parsed_programs.append(self.__parse_program(program_info, channel_name))
+
+        return parsed_channels
+
+    def __parse_program(self, program_info, channel_name: str) -> TvProgramData:
+        datetime_start = self.__parse_time(program_info["starttime"])
+        datetime_finish = self.__parse_time(program_info["endtime"])
+
+        show_name = program_info["title"]
+        show_description = program_info["synopsis"].replace("''", "\"").replace("\n", " ")
+
+        if (is_none_or_empty(show_description)):
+            show_description = None
+
+        return TvProgramData(
+            datetime_start,
+            datetime_finish,
+            channel_name,
+            show_name,
+            self.__channel_logo_url,
+            show_description,
+                False
+        )
+
+    #Из __NEXT_DATA__ разбирается только epg из detail-row, остальная страница (десятки килобайт
+    #рекомендаций, новостей и меню) пропускается без построения DOM и без json.loads всего скрипта.
+    #Если разметка страницы поменялась - полный разбор, как раньше
+    def __extract_epg(self, html_input: str):
+        data_text = find_next_data(html_input)
+        if (data_text is not None):
+            for value in iter_json_values(data_text, "epg"):
+                if (self.__is_epg(value)):
+                    return value
+
+        html = self.parse_html(html_input)
+        data_script = html.find("script", {"id": "__NEXT_DATA__"})
+        data = json.loads(data_script.text)
+        return self.__find_epg(data["props"]["pageProps"]["data"]["rows"])
+
     @staticmethod
-    def __select_channel_programs(epg_day, channel_id):
-        for channel in epg_day["tvChannels"]:
-            if (channel["id"] == channel_id):
-                current = []
-                if channel["current"] != {}:
-                    current = [channel["current"]]
-                return channel["past"] + current + channel["upcoming"]
-        
+    def __is_epg(value) -> bool:
+        return (
+            isinstance(value, list)
+            and len(value) > 0
+            and all(isinstance(day, dict) and "tvChannels" in day for day in value)
+        )
+
+    @staticmethod
+    def __get_channel_programs(channel):
+        current = []
+        if channel["current"] != {}:
+            current = [channel["current"]]
+        return channel["past"] + current + channel["upcoming"]
+
+    def __get_channel_name(self, channel) -> str:
+        channel_id = channel["id"]
+        if (channel_id in self.channel_names):
+            return self.channel_names[channel_id]
+
+        for key in ("name", "title"):
+            if (not is_none_or_empty(channel.get(key))):
+                return channel[key].lower()
+        return str(channel_id)
+
     def __find_epg(self, rows):
-        if (rows[4]["type"] == "detail-row"):
+        if (len(rows) > 4 and rows[4]["type"] == "detail-row"):
             return rows[4]["content"]["epg"]
         
         for row in rows:
@@ -94,6 +124,10 @@ class TrtSportYildiziParser(TvParser):
     def __parse_time(self, time) -> datetime:
         return datetime.fromisoformat(time)
 
+#Основной канал TRT Spor, расписание с той же страницы
+class TrtSporParser(TrtSportYildiziParser):
+    channel_id = 129463
+
 if (__name__=="__main__"):
     options = read_command_line_options()
     parser = TrtSportYildiziParser(options.parser_options)
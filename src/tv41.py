@@ -1,8 +1,6 @@
 import asyncio
-import aiohttp
 from typing import Union
 from datetime import datetime, UTC, timedelta, timezone
-from bs4 import BeautifulSoup
 
 from shared.models import TvParser, TvProgramData
 from shared.options import SaveOptions, read_command_line_options
@@ -17,13 +15,11 @@ class Tv41Parser(TvParser):
     __remove_last = True
 
     async def parse_async(self) -> list[TvProgramData]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.__source_url) as resp:
-                html_text = await resp.text()
-                return self.__parse_html(html_text)
+        html_text = await self.fetch_text_async(self.__source_url)
+        return self.parse_cached(self.__source_url, html_text, self.__parse_html)
 
     def __parse_html(self, html_input: str):
-        html = BeautifulSoup(html_input, 'html.parser')
+        html = self.parse_html(html_input)
         day_info = html.find("div", {"class": "entry-content-inner"}).find_all("p")
 
         date = day_info[0].text